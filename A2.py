@@ -1,4 +1,7 @@
 import re
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 
 """
 Custom Error class for checking if abilities or types are valid.
@@ -15,6 +18,11 @@ Base Pokemon class with all attributes, getters, setters, and display/file metho
 the other subclasses will inherit from this class.
 """
 class BasePokemon:
+    #fixed attribute layout instead of a per-instance __dict__, keeps big dexes small in memory
+    __slots__ = ("__types", "__number", "__name", "__total", "__hp", "__attack", "__defense",
+                 "__spAttack", "__spDefense", "__speed", "__species", "__height", "__weight",
+                 "__abilities", "_owner", "_row")
+
     def __init__(self, types=None, number="", name="", total="", hp="", attack="",
                  defense="", spAttack="", spDefense="", speed="",
                  species="", height="", weight="", abilities=None,):
@@ -32,6 +40,9 @@ class BasePokemon:
         self.__height = height
         self.__weight = weight
         self.__abilities = abilities if abilities is not None else []
+        #the pokedex that holds this pokemon (and its row there) so it can keep its indexes in sync
+        self._owner = None
+        self._row = None
 
     #getter methods to access the private attributes
     def getTypes(self): 
@@ -81,17 +92,23 @@ class BasePokemon:
     def setTypes(self, types):
         if not (1 <= len(types) <= 2):
             raise PokemonInputError("*-* Pokemon can only have 1 or 2 types.")
+        old = self.__types
         self.__types = types
+        self._notify("types", old)
     #for checking if abilities are valid or not
     def setAbilities(self, Abilities):
         if not (1 <= len(Abilities) <= 4):
             raise PokemonInputError("^_^ Pokemon can only have 1 to 4 moves!")
         self.__abilities = Abilities
     def setName(self, newName): 
+        old = self.__name
         self.__name = newName
+        self._notify("name", old)
 
     def setNumber(self, newNumber): 
+        old = self.__number
         self.__number = newNumber
+        self._notify("number", old)
 
     def setSpecies(self, newSpecies): 
         self.__species = newSpecies
@@ -103,25 +120,52 @@ class BasePokemon:
         self.__weight = newWeight
 
     def setHP(self, newhp): 
+        old = self.__hp
         self.__hp = newhp
+        self._notify("hp", old)
 
     def setAttack(self, newAtk): 
+        old = self.__attack
         self.__attack = newAtk
+        self._notify("attack", old)
 
     def setDefense(self, newDef): 
+        old = self.__defense
         self.__defense = newDef
+        self._notify("defense", old)
 
     def setSpAttack(self, newSpA): 
+        old = self.__spAttack
         self.__spAttack = newSpA
+        self._notify("spAttack", old)
 
     def setSpDefense(self, newSpD): 
+        old = self.__spDefense
         self.__spDefense = newSpD
+        self._notify("spDefense", old)
 
     def setSpeed(self, newSpd): 
+        old = self.__speed
         self.__speed = newSpd
+        self._notify("speed", old)
 
     def setTotal(self, newTotal): 
+        old = self.__total
         self.__total = newTotal
+        self._notify("total", old)
+
+    #tells the owning pokedex that a field it indexes on has changed
+    def _notify(self, field, old):
+        if self._owner is not None:
+            self._owner._pokemonChanged(self, field, old)
+
+    #type information for display, counted from the pokedex this pokemon is in (info is the fallback without one)
+    def _typeInfo(self, typeName, info):
+        agg = self._owner.typeStats(typeName) if self._owner is not None else None
+        if not agg:
+            return info
+        return {"Total": agg["count"], "Single Type": agg["single"], "Dual Type": agg["dual"],
+                "Average Stats": formatStats(agg["stats"])}
 
     #the main display method that other classes will use with polymorphismm
     def displayStats(self):
@@ -159,45 +203,42 @@ class BasePokemon:
         return "\n".join(finalParts)
 
 """
-The fire subclass that inherits from BasePokemon, it has its own description and info also average stats that it passes to the base class
-uses *args and **kwargs to pass stuff properly
+The fire subclass that inherits from BasePokemon, it has its own description and type info,
+the type numbers shown come from the pokedex the pokemon is in
 """
 class FireType(BasePokemon):
-    def __init__(self, **kwargs):
-        avg = {"hp": "71.3", "attack": "84.8", "defense": "71.4",
-               "spAttack": "88.8", "spDefense": "73.3", "speed": "76.0", "total": "465"}
-        merged = {**avg, **kwargs}
-        super().__init__(**merged)
-        self.__desc = "Fire is one of the three basic elemental types along with Water and Grass, which constitute the three starter Pokémon."
-        self.__info = {"Total": 97, "Single Type": 37, "Dual Type": 60, "Moves": 49}
+    __slots__ = ()
+    #shared by every fire pokemon so it lives once on the class, not per instance
+    __desc = "Fire is one of the three basic elemental types along with Water and Grass, which constitute the three starter Pokémon."
+    __info = {"Total": 97, "Single Type": 37, "Dual Type": 60, "Moves": 49}
+
     #the display method that overrides the base class method using polymorphism
     def displayStats(self):
         super().displayStats()
         print(self.__desc)
         print("Type Information:")
-        for key, value in self.__info.items(): print(f"{key}: {value}")
+        for key, value in self._typeInfo("Fire", self.__info).items(): print(f"{key}: {value}")
 """
-The grass subclass that inherits from BasePokemon, it has its own description and info also average stats that it passes to the base class
+The grass subclass that inherits from BasePokemon, it has its own description and type info like the fire one
 """
 class GrassType(BasePokemon):
-    def __init__(self, **kwargs):
-        avg = {"hp": "66.8", "attack": "77.0", "defense": "73.8",
-               "spAttack": "72.7", "spDefense": "73.1", "speed": "63.0", "total": "427"}
-        merged = {**avg, **kwargs}
-        super().__init__(**merged)
-        self.__desc = "Grass is one of the three basic elemental types along with Fire and Water, which constitute the three starter Pokémon."
-        self.__info = {"Total": 146, "Single Type": 47, "Dual Type": 99, "Moves": 62}
+    __slots__ = ()
+    #type info is the same for every grass pokemon, kept on the class
+    __desc = "Grass is one of the three basic elemental types along with Fire and Water, which constitute the three starter Pokémon."
+    __info = {"Total": 146, "Single Type": 47, "Dual Type": 99, "Moves": 62}
+
     #the other display method for the grass class
     def displayStats(self):
         super().displayStats()
         print(self.__desc)
         print("Type Information:")
-        for key, value in self.__info.items(): print(f"  {key}: {value}")
+        for key, value in self._typeInfo("Grass", self.__info).items(): print(f"  {key}: {value}")
 
 """
 Concrete subclasses that inherits from FireType, has its own stats and display method (polymorphism)
 """
 class Charmander(FireType):
+    __slots__ = ()
     def __init__(self, **kwargs):
         #default info for the charmander class
         defaults = {
@@ -218,6 +259,7 @@ class Charmander(FireType):
         print(f"Abilities: {', '.join(self.getAbilities())}")
 
 class Vulpix(FireType):
+    __slots__ = ()
     #default data for the Vulpix class
     def __init__(self, **kwargs):
         defaults = {
@@ -238,6 +280,7 @@ class Vulpix(FireType):
 Concrete subclasses that inherits from GrassType, has its own stats and display method (polymorphism)
 """
 class Bulbasaur(GrassType):
+    __slots__ = ()
     #default data for the Bulbasaur class
     def __init__(self, **kwargs):
         defaults = {
@@ -257,6 +300,7 @@ class Bulbasaur(GrassType):
        
 
 class Oddish(GrassType):
+    __slots__ = ()
     #default info for the Oddish class
     def __init__(self, **kwargs):
         defaults = {
@@ -274,14 +318,141 @@ class Oddish(GrassType):
         print(f"Species: {self.getSpecies()} | Height: {self.getHeight()} | Weight: {self.getWeight()}")
         print(f"Abilities: {', '.join(self.getAbilities())}")
 
+#splits "Grass/Poison" and "Blaze, Solar Power" style values, dropping the blanks
+def splitTypes(value):
+    return [t.strip() for t in value.split("/") if t.strip()]
+
+def splitAbilities(value):
+    return [a.strip() for a in value.split(",") if a.strip()]
+
+#lookup table for the pokemon.txt format: key in the file -> (constructor argument, how to read the value),
+#None means the stripped text is used as is
+TXT_FIELDS = {
+    "Name": ("name", None),
+    "National Number": ("number", None),
+    "Type": ("types", splitTypes),
+    "Species": ("species", None),
+    "Height": ("height", None),
+    "Weight": ("weight", None),
+    "Abilities": ("abilities", splitAbilities),
+    "Total": ("total", None),
+    "HP": ("hp", None),
+    "Attack": ("attack", None),
+    "Defence": ("defense", None),
+    "Special Attack": ("spAttack", None),
+    "Special Defense": ("spDefense", None),
+    "Speed": ("speed", None),
+}
+
+#streaming parser for the pokemon.txt format, takes any iterable of lines (an open file works)
+#and yields one dict of constructor arguments per pokemon without holding the whole file
+def parseDex(lines):
+    record = {}
+    for line in lines:
+        line = line.strip()
+        #a blank line ends the current pokemon
+        if not line:
+            if record:
+                yield record
+                record = {}
+            continue
+        key, sep, value = line.partition(":")
+        field = TXT_FIELDS.get(key.strip()) if sep else None
+        if field is not None:
+            name, read = field
+            value = value.strip()
+            record[name] = value if read is None else read(value)
+    # This handles the very last Pokemon in the file, which might not have a blank line after it
+    if record:
+        yield record
+
+#opens a pokemon.txt style file and streams its records, usable without a Pokedex
+def readDex(filename):
+    with open(filename, "r", encoding="utf-8") as f:
+        yield from parseDex(f)
+
+#the first line of a saved pokemon.txt, the last journal entry already folded into the file.
+#parseDex skips it like any line it doesnt know
+CHECKPOINT_KEY = "Journal Checkpoint"
+
+#the checkpoint a pokemon.txt starts with, 0 when it has none
+def readCheckpoint(filename):
+    with open(filename, "r", encoding="utf-8") as f:
+        key, sep, value = f.readline().partition(":")
+    return int(value) if sep and key.strip() == CHECKPOINT_KEY and value.strip().isdigit() else 0
+
+#setter to call for each field when an update is replayed from the journal
+FIELD_SETTERS = {
+    "types": "setTypes", "number": "setNumber", "name": "setName", "total": "setTotal",
+    "hp": "setHP", "attack": "setAttack", "defense": "setDefense", "spAttack": "setSpAttack",
+    "spDefense": "setSpDefense", "speed": "setSpeed", "species": "setSpecies",
+    "height": "setHeight", "weight": "setWeight", "abilities": "setAbilities",
+}
+
+#the numeric stats, in the order reports list them
+STAT_FIELDS = ("total", "hp", "attack", "defense", "spAttack", "spDefense", "speed")
+#percentiles worked out per type and stat by Pokedex.typeStats
+PERCENTILES = (25, 50, 75, 90)
+#short stat names for report headers and type info
+STAT_LABELS = {"total": "Total", "hp": "HP", "attack": "Atk", "defense": "Def",
+               "spAttack": "SpAtk", "spDefense": "SpDef", "speed": "Speed"}
+
+#a stat as a number, None when its blank or not a number
+def statNumber(val):
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return None
+
+#the q-th percentile of an already sorted list, interpolating between neighbours the way numpy does
+def percentile(values, q):
+    pos = (len(values) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (pos - lo)
+
+#one line like "HP 71.3, Atk 84.8, ..." of a typeStats entry, what is "mean", "min", "p50" and so on
+def formatStats(stats, what="mean"):
+    return ", ".join(f"{STAT_LABELS[field]} {stats[field][what]:.1f}" for field in STAT_FIELDS[1:]
+                     if stats[field]["count"])
+
+#the journal is compacted once it holds more entries than the dex has pokemon (but never below this),
+#that way the full rewrite is paid once per O(n) edits and edit cost stays flat as the dex grows
+JOURNAL_MIN_ENTRIES = 1000
+
+#normalizes a National Number so "4", "0004" and "No. 0004" all land on the same index key,
+#anything that doesnt look like a number is kept as the stripped string
+def numberKey(number):
+    match = re.fullmatch(r"\s*(?:No\.?\s*)?(\d+)\s*", str(number))
+    if match:
+        return int(match.group(1))
+    return str(number).strip()
+
 """
 The pokedex class which acts as a manager for the pokemons and also handles the file input and output stuff,
 utilizes a menu method to call the functions, the class initializes by loading the data from the file to perform the necessary functions
 """
 class Pokedex:
-    def __init__(self, filename="pokemon.txt"):
-        self.__pokemons = []
+    def __init__(self, filename="pokemon.txt", journal=True):
+        #pokemons keyed by a row id so removing one doesnt have to shift a list, dicts keep insertion order
+        self.__pokemons = {}
+        self.__nextRow = 0
+        #lookup indexes: casefolded name / normalized number -> row ids in insertion order
+        self.__byName = {}
+        self.__byNumber = {}
+        #inverted type index: casefolded type -> {row: None}, a dict so removal is O(1)
+        self.__byType = {}
+        #per type aggregates from typeStats, None until asked for and again after any change
+        self.__aggregates = None
         self.__filename = filename
+        #with the journal on, edits are appended to <filename>.journal and folded into the file now and then
+        self.__journal = journal
+        self.__journalFile = filename + ".journal"
+        self.__journalEntries = 0
+        #journal entries are numbered: __seq is the last number handed out or replayed and __checkpoint the last
+        #one the loaded file already holds, so replaying after a crash mid compaction skips those
+        self.__seq = 0
+        self.__checkpoint = 0
         self.__class_map = {"Charmander": Charmander, "Vulpix": Vulpix,
                             "Bulbasaur": Bulbasaur, "Oddish": Oddish}
         self.load()
@@ -296,76 +467,239 @@ class Pokedex:
             "7": self.exportTypeReport
         }
 
+    #adds a pokemon to the dex and to every index, returns its row id
+    def _insert(self, p):
+        row = self.__nextRow
+        self.__nextRow += 1
+        self.__pokemons[row] = p
+        p._owner = self
+        p._row = row
+        self.__indexKey(self.__byName, p.getName().casefold(), row)
+        self.__indexKey(self.__byNumber, numberKey(p.getNumber()), row)
+        self.__indexTypes(p.getTypes(), row)
+        self.__aggregates = None
+        return row
+
+    #takes a pokemon out of the dex and out of every index
+    def _delete(self, row):
+        p = self.__pokemons.pop(row)
+        self.__unindexKey(self.__byName, p.getName().casefold(), row)
+        self.__unindexKey(self.__byNumber, numberKey(p.getNumber()), row)
+        self.__unindexTypes(p.getTypes(), row)
+        self.__aggregates = None
+        p._owner = None
+        p._row = None
+        return p
+
+    #finds a pokemon by name or National Number in O(1), names win over numbers like the old scan did
+    def _find(self, key):
+        rows = self.__byName.get(key.strip().casefold()) or self.__byNumber.get(numberKey(key))
+        if not rows:
+            return None
+        return self.__pokemons[rows[0]]
+
+    #called by BasePokemon setters so a rename, renumber or stat change keeps the indexes right
+    def _pokemonChanged(self, p, field, old):
+        if field == "types" or field in STAT_LABELS:
+            self.__aggregates = None
+        if field == "name":
+            self.__unindexKey(self.__byName, old.casefold(), p._row)
+            self.__indexKey(self.__byName, p.getName().casefold(), p._row)
+        elif field == "number":
+            self.__unindexKey(self.__byNumber, numberKey(old), p._row)
+            self.__indexKey(self.__byNumber, numberKey(p.getNumber()), p._row)
+        elif field == "types":
+            self.__unindexTypes(old, p._row)
+            self.__indexTypes(p.getTypes(), p._row)
+
+    @staticmethod
+    def __indexKey(index, key, row):
+        index.setdefault(key, []).append(row)
+
+    @staticmethod
+    def __unindexKey(index, key, row):
+        rows = index.get(key)
+        if rows and row in rows:
+            rows.remove(row)
+            if not rows:
+                del index[key]
+
+    def __indexTypes(self, types, row):
+        for t in types:
+            self.__byType.setdefault(t.strip().casefold(), {})[row] = None
+
+    def __unindexTypes(self, types, row):
+        for t in types:
+            key = t.strip().casefold()
+            rows = self.__byType.get(key)
+            if rows is not None:
+                rows.pop(row, None)
+                if not rows:
+                    del self.__byType[key]
+
+    #every pokemon of a type in pokedex order, costs the size of the result not the whole dex
+    def _ofType(self, typeVal):
+        rows = self.__byType.get(typeVal.strip().casefold(), {})
+        return [self.__pokemons[row] for row in sorted(rows)]
+
+    #how many pokemon carry each type, dual types count towards both
+    def typeCounts(self):
+        return {t: len(rows) for t, rows in self.__byType.items()}
+
+    #count, single/dual split and count/mean/min/max/percentiles of every stat for each type (or just typeVal),
+    #gathered in one pass over the dex and cached until it changes. blank stats are left out
+    def typeStats(self, typeVal=None):
+        if self.__aggregates is None:
+            self.__aggregates = self.__aggregate()
+        if typeVal is None:
+            return self.__aggregates
+        return self.__aggregates.get(typeVal.strip().casefold())
+
+    def __aggregate(self):
+        counts = {}
+        values = {}
+        for p in self.__pokemons.values():
+            types = {t.strip().casefold() for t in p.getTypes()}
+            stats = [statNumber(v) for v in (p.getTotal(), p.getHP(), p.getAttack(), p.getDefense(),
+                                             p.getSpAttack(), p.getSpDefense(), p.getSpeed())]
+            for t in types:
+                count = counts.setdefault(t, [0, 0])
+                count[0 if len(types) == 1 else 1] += 1
+                lists = values.setdefault(t, [[] for _ in STAT_FIELDS])
+                for i, v in enumerate(stats):
+                    if v is not None:
+                        lists[i].append(v)
+        result = {}
+        for t, (single, dual) in counts.items():
+            stats = {}
+            for field, vals in zip(STAT_FIELDS, values[t]):
+                if not vals:
+                    stats[field] = {"count": 0}
+                    continue
+                vals.sort()
+                stats[field] = {"count": len(vals), "mean": sum(vals) / len(vals), "min": vals[0], "max": vals[-1]}
+                for q in PERCENTILES:
+                    stats[field][f"p{q}"] = percentile(vals, q)
+            result[t] = {"count": single + dual, "single": single, "dual": dual, "stats": stats}
+        return result
+
+    # Decide which class to use based on the name, if not in the dictionary uses basePokemon
+    def _build(self, data):
+        item_class = self.__class_map.get(data.get("name"), BasePokemon)
+        return item_class(**data)
+
     #This is called immediately after initialization to load the data from the file
     def load(self):
-        self.__pokemons = [] 
+        for p in self.__pokemons.values():
+            p._owner = None
+        self.__pokemons = {}
+        self.__byName = {}
+        self.__byNumber = {}
+        self.__byType = {}
+        self.__aggregates = None
+        self.__journalEntries = 0
+        self.__checkpoint = 0
         try:
-            with open(self.__filename, "r", encoding="utf-8") as f:
-                #converts file data into a list of data
-                lines = f.readlines()
+            self.__checkpoint = readCheckpoint(self.__filename)
+            for data in readDex(self.__filename):
+                self._insert(self._build(data))
         #called when file doesn't exist
         except FileNotFoundError:
-            return 
-        current_pokemon_data = {}
-        for line in lines:
-            line = line.strip()
-            if not line:
-                if current_pokemon_data: 
-                    # Decide which class to use based on the name, if not in the dictionary uses basePokemon
-                    item_class = self.__class_map.get(current_pokemon_data.get("name"), BasePokemon)
-                    # Create the object by passing all collected data to the constructor
-                    p = item_class(**current_pokemon_data)
-                    self.__pokemons.append(p)
-                current_pokemon_data = {}
-                continue
-
-            # Split the line into a key and value
-            if ":" in line:
-                key, value = line.split(":", 1)
-                key = key.strip()
-                value = value.strip()
-
-                # Assign data to our dictionary based on the key
-                if key == "Name":
-                    current_pokemon_data["name"] = value
-                elif key == "National Number":
-                    current_pokemon_data["number"] = value
-                elif key == "Type":
-                    current_pokemon_data["types"] = [t.strip() for t in value.split("/") if t.strip()]
-                elif key == "Species":
-                    current_pokemon_data["species"] = value
-                elif key == "Height":
-                    current_pokemon_data["height"] = value
-                elif key == "Weight":
-                    current_pokemon_data["weight"] = value
-                elif key == "Abilities":
-                    current_pokemon_data["abilities"] = [a.strip() for a in value.split(",") if a.strip()]
-                elif key == "Total":
-                    current_pokemon_data["total"] = value
-                elif key == "HP":
-                    current_pokemon_data["hp"] = value
-                elif key == "Attack":
-                    current_pokemon_data["attack"] = value
-                elif key == "Defence": 
-                    current_pokemon_data["defense"] = value
-                elif key == "Special Attack":
-                    current_pokemon_data["spAttack"] = value
-                elif key == "Special Defense":
-                    current_pokemon_data["spDefense"] = value
-                elif key == "Speed":
-                    current_pokemon_data["speed"] = value
-        
-        # This handles the very last Pokemon in the file, which might not have a blank line after it
-        if current_pokemon_data:
-            item_class = self.__class_map.get(current_pokemon_data.get("name"), BasePokemon)
-            p = item_class(**current_pokemon_data)
-            self.__pokemons.append(p)
+            pass
+        self.__replay()
+
+    #every field of a pokemon as plain strings and lists, the same shape the constructors take
+    @staticmethod
+    def _fields(p):
+        return {
+            "types": list(p.getTypes()), "number": p.getNumber(), "name": p.getName(),
+            "total": p.getTotal(), "hp": p.getHP(), "attack": p.getAttack(), "defense": p.getDefense(),
+            "spAttack": p.getSpAttack(), "spDefense": p.getSpDefense(), "speed": p.getSpeed(),
+            "species": p.getSpecies(), "height": p.getHeight(), "weight": p.getWeight(),
+            "abilities": list(p.getAbilities())
+        }
+
+    #applies one journal entry, removes and updates find their pokemon by its name and number at the time
+    def _apply(self, entry):
+        op = entry["op"]
+        if op == "add":
+            data = entry["data"]
+            if data["name"].strip().casefold() not in self.__byName and numberKey(data["number"]) not in self.__byNumber:
+                self._insert(self._build(data))
+            return
+        p = self.__journalTarget(entry)
+        if p is None:
+            return
+        if op == "remove":
+            self._delete(p._row)
+        elif op == "update":
+            for field, value in entry["fields"].items():
+                getattr(p, FIELD_SETTERS[field])(value)
+
+    #the pokemon a remove/update entry was written for by its name and number at the time, None if its not there.
+    #journals from before entries carried name and number only have the key that was typed in
+    def __journalTarget(self, entry):
+        if "key" in entry:
+            return self._find(entry["key"])
+        rows = self.__byName.get(entry["name"].strip().casefold())
+        if not rows:
+            return None
+        p = self.__pokemons[rows[0]]
+        return p if numberKey(p.getNumber()) == numberKey(entry["number"]) else None
+
+    #replays the journal on top of whatever load() just read. entries numbered at or below the files
+    #checkpoint are already in it (a crash between saving and deleting the journal leaves those behind)
+    def __replay(self):
+        self.__seq = self.__checkpoint
+        try:
+            f = open(self.__journalFile, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    #a half written last line from a crash, everything before it is still good
+                    break
+                self.__journalEntries += 1
+                seq = entry.get("seq")
+                if seq is not None:
+                    if seq <= self.__checkpoint:
+                        continue
+                    self.__seq = max(self.__seq, seq)
+                self._apply(entry)
+
+    #records one edit, appending a line to the journal instead of rewriting the whole dex
+    def _log(self, entry):
+        self.__seq += 1
+        entry["seq"] = self.__seq
+        if not self.__journal:
+            self.save()
+            return
+        with open(self.__journalFile, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.__journalEntries += 1
+        print(":] Changes saved.")
+        if self.__journalEntries > max(JOURNAL_MIN_ENTRIES, len(self.__pokemons)):
+            self.compact()
+
+    #folds the journal into the main file(s) and starts a fresh one
+    def compact(self):
+        self.save()
+        if os.path.exists(self.__journalFile):
+            os.remove(self.__journalFile)
+        self.__journalEntries = 0
 
     #called whenever a change is made the data
     def save(self):
-        with open(self.__filename,"w",encoding="utf-8") as f:
+        #written next to the real file and swapped in, so a crash never leaves half a dex behind
+        with open(self.__filename + ".tmp","w",encoding="utf-8") as f:
+            if self.__seq:
+                f.write(f"{CHECKPOINT_KEY}: {self.__seq}\n\n")
             #extra space between pokemon like its done in the pokemon.txt file
-            f.write("\n\n".join(p.to_file_format() for p in self.__pokemons))
+            f.write("\n\n".join(p.to_file_format() for p in self.__pokemons.values()))
+        os.replace(self.__filename + ".tmp", self.__filename)
         print(":] Changes saved.")
 
     #method to display all the info of pokemon in the pokemon list, if empty it just returns back to menu
@@ -373,7 +707,7 @@ class Pokedex:
         if not self.__pokemons: 
             print("No Pokémon.")
             return
-        for p in self.__pokemons:
+        for p in self.__pokemons.values():
             p.displayStats()
     
     def searchPokemon(self):
@@ -383,18 +717,12 @@ class Pokedex:
             return
         
         pokemonNameNo = input("Enter name/number: ")
-        found_pokemon = False
-        
-        # Loop through all pokemons to find a match
-        for pokemon in self.__pokemons:
-            if pokemon.getName().lower() == pokemonNameNo.lower() or pokemon.getNumber() == pokemonNameNo:
-                # If found, display its stats
-                pokemon.displayStats()
-                found_pokemon = True
-                break      
+        pokemon = self._find(pokemonNameNo)
         #if not found
-        if not found_pokemon:
+        if pokemon is None:
             print("ERROR: not present in the pokedex currently!!")
+            return
+        pokemon.displayStats()
 
     #method to add pokemon, after asking input from user and if confirmed its not in the list already, creates new pokemon. To add the data into
     #the file as well it calls the save method
@@ -406,12 +734,8 @@ class Pokedex:
                 raise PokemonInputError("National Number must be a number!")
             name=input("Name: ")
 
-            pokeExists=False
-            for p in self.__pokemons:
-                #checking if pokemon is already present in pokedex or not using name/number
-                if (p.getName().lower()==name.lower() or p.getNumber()==number):
-                        pokeExists=True
-                        break
+            #checking if pokemon is already present in pokedex or not using name/number
+            pokeExists = name.strip().casefold() in self.__byName or numberKey(number) in self.__byNumber
             if pokeExists:
                 print(";-; This pokemon is already present in the pokedex!") 
                 return
@@ -472,8 +796,8 @@ class Pokedex:
                 newP = BasePokemon(**pokemon_data)
             
             #appends the new pokemon!
-            self.__pokemons.append(newP)
-            self.save()
+            self._insert(newP)
+            self._log({"op": "add", "data": pokemon_data})
             print(f":D Added {name}.")
         except PokemonInputError as e:
             print(":( ERROR:",e)
@@ -483,108 +807,124 @@ class Pokedex:
     #method to remove pokemon, checks with either name or number, and if removed calls save function to update the file
     def removePokemon(self):
         key=input("Enter name/number: ")
-        for p in self.__pokemons:
-            if p.getName().lower()==key.lower() or p.getNumber()==key:
-                self.__pokemons.remove(p)
-                print("$-$ Removed.")
-                self.save()
-                return
-        print("!-! Not found.")
+        p = self._find(key)
+        if p is None:
+            print("!-! Not found.")
+            return
+        self._delete(p._row)
+        print("$-$ Removed.")
+        self._log({"op": "remove", "name": p.getName(), "number": p.getNumber()})
     
     #method to update pokemon data, first checks using name/number then if exists uses setter functions
     def updatePokemon(self):
         key=input("Enter name/number: ")
-        for p in self.__pokemons:
-            if p.getName().lower()==key.lower() or p.getNumber()==key:
-                #not gonna edit the name or number cause that is fixed.
-                #separates the abilities added by comma
-                newAbility=input(f"Moves [{', '.join(p.getAbilities())}]: ")
-                if newAbility:
-                    #after removing uncessary whitespace or commas then add it
-                    ab=[a.strip() for a in newAbility.split(",") if a.strip()]
-                    try: 
-                        p.setAbilities(ab)
-                    except PokemonInputError as e: 
-                        print("Moves not updated:",e)
-                #if user wants to update additional attrbitutes other than abilities
-                userUpdate=input("Do you want to update pokemon attributes as well? answer y or Y for yes/n or No for no: ")
-                if userUpdate.lower()=="y":
-                    newHP=input("enter new HP: ")
-                    if not newHP.isdigit():
-                        raise PokemonInputError("HP must be a number!")
-                    p.setHP(newHP)
-                    newAtk=input("enter new Attack: ")
-                    if not newAtk.isdigit():
-                        raise PokemonInputError("Attack must be a number!")
-                    p.setAttack(newAtk)
-                    newDef=input("enter new Defense: ")
-                    if not newDef.isdigit():
-                        raise PokemonInputError("Defense must be a number!")
-                    p.setDefense(newDef)
-                    newSpAtk=input("enter new Sp. Atk: ")
-                    if not newSpAtk.isdigit():
-                        raise PokemonInputError("sp. Atk must be a number!")
-                    p.setSpAttack(newSpAtk)
-                    newSpDef=input("enter new Sp. Def: ")
-                    if not newSpDef.isdigit():
-                        raise PokemonInputError("sp. Def must be a number!")
-                    p.setSpDefense(newSpDef)
-                    newSpeed=input("Enter new speed: ")
-                    if not newSpeed.isdigit():
-                        raise PokemonInputError("speed must be a number!")
-                    p.setSpeed(newSpeed)
-                    newTotal=int(newHP)+int(newAtk)+int(newDef)+int(newSpAtk)+int(newSpDef)+int(newSpeed)
-                    p.setTotal(str(newTotal))
-                else:
-                    print("Ok!")
-                print(" Updated.")
-                #calling save to update the data in files!
-                self.save()
-                return
-        print("\\~/ Not found.")
+        p = self._find(key)
+        if p is None:
+            print("\\~/ Not found.")
+            return
+        before = self._fields(p)
+        #not gonna edit the name or number cause that is fixed.
+        #separates the abilities added by comma
+        newAbility=input(f"Moves [{', '.join(p.getAbilities())}]: ")
+        if newAbility:
+            #after removing uncessary whitespace or commas then add it
+            ab=[a.strip() for a in newAbility.split(",") if a.strip()]
+            try: 
+                p.setAbilities(ab)
+            except PokemonInputError as e: 
+                print("Moves not updated:",e)
+        #if user wants to update additional attrbitutes other than abilities
+        userUpdate=input("Do you want to update pokemon attributes as well? answer y or Y for yes/n or No for no: ")
+        if userUpdate.lower()=="y":
+            newHP=input("enter new HP: ")
+            if not newHP.isdigit():
+                raise PokemonInputError("HP must be a number!")
+            p.setHP(newHP)
+            newAtk=input("enter new Attack: ")
+            if not newAtk.isdigit():
+                raise PokemonInputError("Attack must be a number!")
+            p.setAttack(newAtk)
+            newDef=input("enter new Defense: ")
+            if not newDef.isdigit():
+                raise PokemonInputError("Defense must be a number!")
+            p.setDefense(newDef)
+            newSpAtk=input("enter new Sp. Atk: ")
+            if not newSpAtk.isdigit():
+                raise PokemonInputError("sp. Atk must be a number!")
+            p.setSpAttack(newSpAtk)
+            newSpDef=input("enter new Sp. Def: ")
+            if not newSpDef.isdigit():
+                raise PokemonInputError("sp. Def must be a number!")
+            p.setSpDefense(newSpDef)
+            newSpeed=input("Enter new speed: ")
+            if not newSpeed.isdigit():
+                raise PokemonInputError("speed must be a number!")
+            p.setSpeed(newSpeed)
+            newTotal=int(newHP)+int(newAtk)+int(newDef)+int(newSpAtk)+int(newSpDef)+int(newSpeed)
+            p.setTotal(str(newTotal))
+        else:
+            print("Ok!")
+        print(" Updated.")
+        #journaling just the fields that changed
+        after = self._fields(p)
+        changed = {field: value for field, value in after.items() if before[field] != value}
+        self._log({"op": "update", "name": before["name"], "number": before["number"], "fields": changed})
 
     #searching the pokemon data by type
     def searchByType(self):
         typeVal = input("Enter type: ").lower()
-        # Create an empty list to store the results
-        found = []
-        for pokemon in self.__pokemons:
-            for t in pokemon.getTypes():
-                if t.lower() == typeVal:
-                    found.append(pokemon)
-                    break
+        found = self._ofType(typeVal)
         if not found:
             print("/-\\ No matches.")
             return
         for poke in found:
             poke.displayStats()
 
-    #exporting the the data of the file that are of a particular type,
+    #exporting the the data of the file that are of a particular type, or every type at once when asked for "all"
     def exportTypeReport(self,exportName=None):
         if exportName is None:
-            typeVal=input("Enter type to export: ").lower()
+            typeVal=input("Enter type to export (or all for every type): ").lower()
+            if typeVal.strip()=="all":
+                return self.exportAllTypeReports()
         else: 
             typeVal = exportName.lower()
-        found = []
-        for pokemon in self.__pokemons:
-            for t in pokemon.getTypes():
-                if t.lower() == typeVal:
-                    found.append(pokemon)
-                    break
+        found = self._ofType(typeVal)
         if not found:
             print("No matches.")
             return
-        #using the new file it enters this data and saves it!
+        filename=self.__writeTypeReport(typeVal, found, self.typeStats(typeVal))
+        print(f"|-| Saved {filename}")
+        return filename
+
+    #exports <type>.txt for every type in the dex. one pass over the dex sorts the pokemon into their types (a dual
+    #type goes into both) and then the files are written side by side on a thread pool, since thats mostly disk time
+    def exportAllTypeReports(self, workers=None):
+        groups = {}
+        for p in self.__pokemons.values():
+            for t in dict.fromkeys(t.strip().casefold() for t in p.getTypes()):
+                if t:
+                    groups.setdefault(t, []).append(p)
+        aggs = self.typeStats()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            filenames = list(pool.map(lambda t: self.__writeTypeReport(t, groups[t], aggs[t]), sorted(groups)))
+        print(f"|-| Saved {len(filenames)} type reports")
+        return filenames
+
+    #using the new file it enters this data and saves it! the pokemon are written one at a time
+    #instead of being joined into one big string first
+    def __writeTypeReport(self, typeVal, found, agg):
         filename=f"{typeVal}.txt"
+        #the header is worked out from the dex itself, so it fits any type and stays right after edits
         with open(filename,"w",encoding="utf-8") as f:
-            if typeVal=="fire":
-                f.write("Fire Type!\nTotal: 97 | Single: 37 | Dual: 60 | Moves: 49\n")
-                f.write("Average Stats: HP 71.3, Atk 84.8, Def 71.4, SpAtk 88.8, SpDef 73.3, Speed 76.0\n\n")
-            elif typeVal=="grass":
-                f.write("Grass Type!\nTotal: 146 | Single: 47 | Dual: 99 | Moves: 62\n")
-                f.write("Average Stats: HP 66.8, Atk 77.0, Def 73.8, SpAtk 72.7, SpDef 73.1, Speed 63.0\n\n")
-            f.write("\n\n".join(p.to_file_format() for p in found))
-        print(f"|-| Saved {filename}")
+            f.write(f"{typeVal.strip().capitalize()} Type!\nTotal: {agg['count']} | Single: {agg['single']} | Dual: {agg['dual']}\n")
+            f.write(f"Average Stats: {formatStats(agg['stats'])}\n")
+            f.write(f"Median Stats: {formatStats(agg['stats'], 'p50')}\n")
+            f.write(f"Min Stats: {formatStats(agg['stats'], 'min')}\n")
+            f.write(f"Max Stats: {formatStats(agg['stats'], 'max')}\n\n")
+            for i, p in enumerate(found):
+                if i:
+                    f.write("\n\n")
+                f.write(p.to_file_format())
         return filename
 
     #the run function starts the menu with all the options, the options are in a dictionary, if an option thats not in it is picked it says invalid
@@ -605,7 +945,7 @@ class Pokedex:
                       """)
                 choice=input()
                 if choice.lower()=="n":
-                    self.save(); print(" %^^% Thank you for using the pokedex system today!")
+                    self.compact(); print(" %^^% Thank you for using the pokedex system today!")
                     self.__running=False
                 elif choice in self.__choices:
                     self.__choices[choice]()
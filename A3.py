@@ -1,35 +1,415 @@
-import matplotlib.pyplot as plt
+#matplotlib isnt imported here: it takes longer to load than everything else put together and only the charts
+#use it, so showChart and renderChart import it the first time a chart is drawn. numpy stays, the stat table
+#behind every dex is made of numpy arrays
 import numpy as np
 import re
 import json
+import os
+import mmap
+import struct
+import csv
+import contextlib
+import collections
+import bisect
+import glob
+import sys
+import hashlib
+import shutil
+#tab completion in the menu, readline isnt there on every platform
+try:
+    import readline
+except ImportError:
+    readline = None
 
 
-class PokemonInputError(BaseException):
+#an Exception like A2's, so callers of the Pokedex API can catch it with everything else that goes wrong
+class PokemonInputError(Exception):
     def __init__(self,message):
+        super().__init__(message)
         self._message=message
     
     def __str__(self):
         return self._message
 
+#raised by the Pokedex API when no pokemon matches a name/number
+class PokemonNotFoundError(PokemonInputError):
+    pass
+
+
+#the numeric stats kept in the columnar StatTable, in the order the table stores them
+STAT_FIELDS = ("total", "hp", "attack", "defense", "spAttack", "spDefense", "speed")
+STAT_COLUMN = {field: col for col, field in enumerate(STAT_FIELDS)}
+#what the table stores for a stat that was left blank
+MISSING_STAT = -1
+#the biggest stat the int32 columns of the stat table can hold
+MAX_STAT = int(np.iinfo(np.int32).max)
+#percentiles worked out per type and stat by Pokedex.typeStats
+PERCENTILES = (25, 50, 75, 90)
+#short stat names for report headers and type info
+STAT_LABELS = {"total": "Total", "hp": "HP", "attack": "Atk", "defense": "Def",
+               "spAttack": "SpAtk", "spDefense": "SpDef", "speed": "Speed"}
+
+#one line like "HP 71.3, Atk 84.8, ..." of a typeStats entry, what is "mean", "min", "p50" and so on
+def formatStats(stats, what="mean"):
+    return ", ".join(f"{STAT_LABELS[field]} {stats[field][what]:.1f}" for field in STAT_FIELDS[1:]
+                     if stats[field]["count"])
+
+#turns a stat like "45" into the int the stat table stores. the table only holds whole numbers that fit in
+#an int32 so a decimal like "71.3" or a huge number is refused rather than quietly rounded or overflowing,
+#garbage raises ValueError like int() did before
+def parseStat(val):
+    if isinstance(val, (int, np.integer)):
+        stat = int(val)
+    else:
+        val = str(val).strip()
+        if val == "":
+            return MISSING_STAT
+        try:
+            stat = int(val)
+        except ValueError:
+            raise ValueError(f"stat {val!r} is not a whole number") from None
+    if abs(stat) > MAX_STAT:
+        raise ValueError(f"stat {val!r} is too big, stats go up to {MAX_STAT}")
+    return stat
+
+#the string form the getters hand back, blank for a missing stat like before
+def statText(val):
+    return "" if val == MISSING_STAT else str(val)
+
+"""
+Columnar store for the stats of every pokemon in a pokedex, one contiguous int array per stat.
+Whole-dex aggregates, sorting and charting read straight from these arrays with numpy instead of
+calling getters and parsing strings one pokemon at a time. Rows are only ever appended so row order
+is pokedex order, removed rows are just marked dead.
+"""
+class StatTable:
+    def __init__(self, capacity=64):
+        self.__cols = [np.full(capacity, MISSING_STAT, dtype=np.int32) for _ in STAT_FIELDS]
+        self.__live = np.zeros(capacity, dtype=bool)
+        self.__size = 0
+        self.__count = 0
+
+    def __len__(self):
+        return self.__count
+
+    #doubles every column when we run out of rows
+    def __grow(self):
+        capacity = max(64, 2 * len(self.__live))
+        for i, col in enumerate(self.__cols):
+            newCol = np.full(capacity, MISSING_STAT, dtype=np.int32)
+            newCol[:self.__size] = col[:self.__size]
+            self.__cols[i] = newCol
+        live = np.zeros(capacity, dtype=bool)
+        live[:self.__size] = self.__live[:self.__size]
+        self.__live = live
+
+    #hands out a new row filled with values (one per STAT_FIELDS entry)
+    def alloc(self, values):
+        if self.__size == len(self.__live):
+            self.__grow()
+        row = self.__size
+        for col, val in zip(self.__cols, values):
+            col[row] = val
+        self.__live[row] = True
+        self.__size += 1
+        self.__count += 1
+        return row
+
+    #appends many rows at once from one array per stat, returns the new row numbers
+    def extend(self, columns):
+        count = len(columns[0]) if columns else 0
+        while self.__size + count > len(self.__live):
+            self.__grow()
+        start = self.__size
+        for col, values in zip(self.__cols, columns):
+            col[start:start + count] = values
+        self.__live[start:start + count] = True
+        self.__size += count
+        self.__count += count
+        return range(start, start + count)
+
+    #marks a row dead, it keeps its slot so the rows after it dont move
+    def free(self, row):
+        if self.__live[row]:
+            self.__live[row] = False
+            self.__count -= 1
+        for col in self.__cols:
+            col[row] = MISSING_STAT
+
+    def get(self, col, row):
+        return int(self.__cols[col][row])
+
+    def set(self, col, row, val):
+        self.__cols[col][row] = val
+
+    #all stats of one row as a list in STAT_FIELDS order
+    def rowValues(self, row):
+        return [int(col[row]) for col in self.__cols]
+
+    #the raw array for a stat, dead rows included, use liveRows() to pick out the real ones
+    def column(self, field):
+        return self.__cols[STAT_COLUMN[field]][:self.__size]
+
+    #row numbers of every live row in pokedex order
+    def liveRows(self):
+        return np.flatnonzero(self.__live[:self.__size])
+
+#one stat kept sorted as (value, row) pairs so the rows in a range are two binary searches away,
+#rows with the same value stay in pokedex order
+class StatIndex:
+    def __init__(self, values, rows):
+        order = np.lexsort((rows, values))
+        #int64 so searching with a plain int doesnt convert the whole array on every lookup
+        self.__values = values[order].astype(np.int64)
+        self.__rows = rows[order]
+
+    def __len__(self):
+        return len(self.__rows)
+
+    #where (value, row) sits or would go
+    def __position(self, value, row):
+        lo = int(np.searchsorted(self.__values, value, "left"))
+        hi = int(np.searchsorted(self.__values, value, "right"))
+        return lo + int(np.searchsorted(self.__rows[lo:hi], row))
+
+    def add(self, value, row):
+        i = self.__position(value, row)
+        self.__values = np.insert(self.__values, i, value)
+        self.__rows = np.insert(self.__rows, i, row)
+
+    def remove(self, value, row):
+        i = self.__position(value, row)
+        if i < len(self.__rows) and self.__rows[i] == row:
+            self.__values = np.delete(self.__values, i)
+            self.__rows = np.delete(self.__rows, i)
+
+    #positions (start, stop) of every value with low <= value <= high, None leaves that side open
+    def span(self, low=None, high=None):
+        start = 0 if low is None else int(np.searchsorted(self.__values, low, "left"))
+        stop = len(self.__values) if high is None else int(np.searchsorted(self.__values, high, "right"))
+        return start, max(start, stop)
+
+    def rows(self, start, stop):
+        return self.__rows[start:stop]
+
+    def values(self, start, stop):
+        return self.__values[start:stop]
+
+#distinct strings kept sorted by their casefolded form so every completion of a prefix sits in one run that
+#bisect finds. each string counts how many pokemon use it, a shared species only goes once nobody has it
+class PrefixIndex:
+    def __init__(self, texts=()):
+        #casefolded text -> [text as first seen, how many use it]
+        self.__entries = {}
+        for text in texts:
+            if text:
+                self.__count(text)
+        self.__keys = sorted(self.__entries)
+
+    def __count(self, text):
+        entry = self.__entries.get(text.casefold())
+        if entry is None:
+            self.__entries[text.casefold()] = [text, 1]
+            return True
+        entry[1] += 1
+        return False
+
+    def add(self, text):
+        if text and self.__count(text):
+            bisect.insort(self.__keys, text.casefold())
+
+    def remove(self, text):
+        key = text.casefold() if text else None
+        entry = self.__entries.get(key)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if not entry[1]:
+            del self.__entries[key]
+            del self.__keys[bisect.bisect_left(self.__keys, key)]
+
+    #the first limit strings (alphabetically) that start with prefix, ignoring case
+    def complete(self, prefix, limit=10):
+        prefix = prefix.casefold()
+        out = []
+        for i in range(bisect.bisect_left(self.__keys, prefix), len(self.__keys)):
+            key = self.__keys[i]
+            if len(out) == limit or not key.startswith(prefix):
+                break
+            out.append(self.__entries[key][0])
+        return out
+
+#running totals per type, updated one pokemon at a time so counts, averages and spreads never need a pass over
+#the dex: how many pokemon have the type, how many have only that type, and for each stat how many have it filled
+#in, their sum and sum of squares. also how many pokemon share each pair of types. all plain ints so they stay exact
+class TypeTotals:
+    def __init__(self):
+        #type -> [count, single, [filled per stat], [sum per stat], [sum of squares per stat]]
+        self.__types = {}
+        #(type, type) in sorted order -> how many pokemon have both
+        self.__pairs = collections.Counter()
+
+    #the same keys the type index files a pokemon under
+    @staticmethod
+    def keys(types):
+        return sorted(dict.fromkeys(t.strip().casefold() for t in types))
+
+    #built in one go from the stat columns (STAT_FIELDS order, indexed by row) and a type -> rows index
+    @classmethod
+    def fromColumns(cls, columns, byType):
+        totals = cls()
+        columns = columns.astype(np.int64)
+        typeCount = np.zeros(columns.shape[1], dtype=np.int8)
+        members = {}
+        for t, bucket in byType.items():
+            rows = members[t] = np.fromiter(bucket, dtype=np.int64, count=len(bucket))
+            typeCount[rows] += 1
+        for t, rows in members.items():
+            block = columns[:, rows]
+            filled = block != MISSING_STAT
+            block = np.where(filled, block, 0)
+            totals.__types[t] = [len(rows), int(np.count_nonzero(typeCount[rows] == 1)), filled.sum(axis=1).tolist(),
+                                 block.sum(axis=1).tolist(), (block * block).sum(axis=1).tolist()]
+        names = sorted(members)
+        has = np.zeros(columns.shape[1], dtype=bool)
+        for i, a in enumerate(names):
+            has[members[a]] = True
+            for b in names[i + 1:]:
+                both = int(np.count_nonzero(has[members[b]]))
+                if both:
+                    totals.__pairs[a, b] = both
+            has[members[a]] = False
+        return totals
+
+    #counts a pokemon in (sign=-1 takes it back out), stats in STAT_FIELDS order
+    def add(self, types, stats, sign=1):
+        keys = self.keys(types)
+        for i, a in enumerate(keys):
+            for b in keys[i + 1:]:
+                self.__pairs[a, b] += sign
+                if not self.__pairs[a, b]:
+                    del self.__pairs[a, b]
+        for key in keys:
+            entry = self.__types.get(key)
+            if entry is None:
+                entry = self.__types[key] = [0, 0, [0] * len(STAT_FIELDS), [0] * len(STAT_FIELDS),
+                                             [0] * len(STAT_FIELDS)]
+            entry[0] += sign
+            if len(keys) == 1:
+                entry[1] += sign
+            for col, val in enumerate(stats):
+                self.__count(entry, col, val, sign)
+            if not entry[0]:
+                del self.__types[key]
+
+    def remove(self, types, stats):
+        self.add(types, stats, -1)
+
+    #one stat of a pokemon with these types went from old to new
+    def changeStat(self, types, col, old, new):
+        for key in self.keys(types):
+            entry = self.__types[key]
+            self.__count(entry, col, old, -1)
+            self.__count(entry, col, new, 1)
+
+    @staticmethod
+    def __count(entry, col, val, sign):
+        if val != MISSING_STAT:
+            entry[2][col] += sign
+            entry[3][col] += sign * val
+            entry[4][col] += sign * val * val
+
+    #how many pokemon have each type
+    def counts(self):
+        return {t: entry[0] for t, entry in self.__types.items()}
+
+    #how many pokemon have both types
+    def both(self, a, b):
+        return self.__pairs.get(tuple(self.keys((a, b))), 0)
+
+    #count, single/dual split and count/mean/standard deviation of every stat for a type, None if nobody has it
+    def summary(self, typeVal):
+        entry = self.__types.get(typeVal.strip().casefold())
+        if entry is None:
+            return None
+        count, single, filled, sums, squares = entry
+        stats = {}
+        for field, n, total, square in zip(STAT_FIELDS, filled, sums, squares):
+            if not n:
+                stats[field] = {"count": 0}
+                continue
+            #n*sum(x^2) - sum(x)^2 is exact in ints, so the spread doesnt suffer from cancellation
+            stats[field] = {"count": n, "mean": total / n, "std": (n * square - total * total) ** 0.5 / n}
+        return {"count": count, "single": single, "dual": count - single, "stats": stats}
+
+    #types (and "a/b" pairs) whose totals differ from other, empty when they match
+    def diff(self, other):
+        types = [t for t in self.__types.keys() | other.__types.keys()
+                 if self.__types.get(t) != other.__types.get(t)]
+        pairs = [f"{a}/{b}" for a, b in self.__pairs.keys() | other.__pairs.keys()
+                 if self.__pairs.get((a, b)) != other.__pairs.get((a, b))]
+        return sorted(types) + sorted(pairs)
+
+#reads a stat range like "500..600", "100.." (at least), "..80" (at most) or "90" (exactly) as (low, high)
+def parseBounds(text):
+    low, sep, high = text.strip().partition("..")
+    if not sep:
+        high = low
+    try:
+        return (int(low) if low.strip() else None), (int(high) if high.strip() else None)
+    except ValueError:
+        raise PokemonInputError(f"{text} is not a stat range, try 500..600, 100.. or ..80")
+
+#ways of measuring how alike two stat spreads are: straight line distance, or 1 - cosine of the angle between
+#them so only the shape of the spread counts and not how big the numbers are
+SIMILARITY_METRICS = ("euclidean", "cosine")
+
+def checkMetric(metric):
+    if metric not in SIMILARITY_METRICS:
+        raise PokemonInputError(f"metric has to be {' or '.join(SIMILARITY_METRICS)}, not {metric}")
+
+#distance from target to every row of matrix in one go, norms are the rows lengths (only cosine uses them).
+#a spread of all zeros has no direction so it sits at cosine distance 1 from everything
+def statDistances(matrix, norms, target, metric="euclidean"):
+    checkMetric(metric)
+    if metric == "euclidean":
+        return np.sqrt(((matrix - target) ** 2).sum(axis=1))
+    length = np.linalg.norm(target)
+    if not length:
+        return np.ones(len(matrix))
+    dots = matrix @ target
+    return 1 - np.divide(dots, norms * length, out=np.zeros_like(dots), where=norms > 0)
+
+#the k smallest distances as positions into dist, closest first and ties in row order
+def nearest(dist, rows, k):
+    if k < len(dist):
+        pick = np.argpartition(dist, k - 1)[:k]
+    else:
+        pick = np.arange(len(dist))
+    return pick[np.lexsort((rows[pick], dist[pick]))]
 
 class BasePokemon:
+    #fixed attribute layout instead of a per-instance __dict__, keeps big dexes small in memory
+    __slots__ = ("__types", "__number", "__name", "__stats", "__statTable", "__species",
+                 "__height", "__weight", "__abilities", "_owner", "_row")
+
     def __init__(self, types=None, number="", name="", total="", hp="", attack="",
                  defense="", spAttack="", spDefense="", speed="",
                  species="", height="", weight="", abilities=None,):
         self.__types = types if types is not None else []
         self.__number = number
         self.__name = name
-        self.__total = total
-        self.__hp = hp
-        self.__attack = attack
-        self.__defense = defense
-        self.__spAttack = spAttack
-        self.__spDefense = spDefense
-        self.__speed = speed
+        #stats are kept as ints in STAT_FIELDS order until the pokemon joins a pokedex,
+        #from then on they live in that pokedex's StatTable and this just views its row
+        self.__stats = [parseStat(v) for v in (total, hp, attack, defense, spAttack, spDefense, speed)]
+        self.__statTable = None
         self.__species = species
         self.__height = height
         self.__weight = weight
         self.__abilities = abilities if abilities is not None else []
+        #the pokedex that holds this pokemon (and its row there) so it can keep its indexes in sync
+        self._owner = None
+        self._row = None
 
     #getter methods to access the private attributes
     def getTypes(self): 
@@ -42,25 +422,25 @@ class BasePokemon:
         return self.__name
     
     def getTotal(self): 
-        return self.__total
+        return statText(self.__stat(0))
     
     def getHP(self): 
-        return self.__hp
+        return statText(self.__stat(1))
     
     def getAttack(self): 
-        return self.__attack
+        return statText(self.__stat(2))
     
     def getDefense(self): 
-        return self.__defense
+        return statText(self.__stat(3))
     
     def getSpAttack(self): 
-        return self.__spAttack
+        return statText(self.__stat(4))
     
     def getSpDefense(self): 
-        return self.__spDefense
+        return statText(self.__stat(5))
     
     def getSpeed(self): 
-        return self.__speed
+        return statText(self.__stat(6))
     
     def getSpecies(self): 
         return self.__species
@@ -79,20 +459,30 @@ class BasePokemon:
     def setTypes(self, types):
         if not (1 <= len(types) <= 2):
             raise PokemonInputError("*-* Pokemon can only have 1 or 2 types.")
+        old = self.__types
         self.__types = types
+        self._notify("types", old)
     #for checking if abilities are valid or not
     def setAbilities(self, Abilities):
         if not (1 <= len(Abilities) <= 4):
             raise PokemonInputError("^_^ Pokemon can only have 1 to 4 moves!")
+        old = self.__abilities
         self.__abilities = Abilities
+        self._notify("abilities", old)
     def setName(self, newName): 
+        old = self.__name
         self.__name = newName
+        self._notify("name", old)
 
     def setNumber(self, newNumber): 
+        old = self.__number
         self.__number = newNumber
+        self._notify("number", old)
 
     def setSpecies(self, newSpecies): 
+        old = self.__species
         self.__species = newSpecies
+        self._notify("species", old)
 
     def setHeight(self, newHeight): 
         self.__height = newHeight
@@ -101,25 +491,69 @@ class BasePokemon:
         self.__weight = newWeight
 
     def setHP(self, newhp): 
-        self.__hp = newhp
+        self.__setStat(1, newhp)
 
     def setAttack(self, newAtk): 
-        self.__attack = newAtk
+        self.__setStat(2, newAtk)
 
     def setDefense(self, newDef): 
-        self.__defense = newDef
+        self.__setStat(3, newDef)
 
     def setSpAttack(self, newSpA): 
-        self.__spAttack = newSpA
+        self.__setStat(4, newSpA)
 
     def setSpDefense(self, newSpD): 
-        self.__spDefense = newSpD
+        self.__setStat(5, newSpD)
 
     def setSpeed(self, newSpd): 
-        self.__speed = newSpd
+        self.__setStat(6, newSpd)
 
     def setTotal(self, newTotal): 
-        self.__total = newTotal
+        self.__setStat(0, newTotal)
+
+    def __stat(self, col):
+        if self.__statTable is not None:
+            return self.__statTable.get(col, self._row)
+        return self.__stats[col]
+
+    def __setStat(self, col, val):
+        val = parseStat(val)
+        if self.__statTable is not None:
+            old = self.__statTable.get(col, self._row)
+            self.__statTable.set(col, self._row, val)
+            self._notify(STAT_FIELDS[col], old)
+        else:
+            self.__stats[col] = val
+
+    #all stats as ints in STAT_FIELDS order, missing ones are MISSING_STAT
+    def statValues(self):
+        if self.__statTable is not None:
+            return self.__statTable.rowValues(self._row)
+        return list(self.__stats)
+
+    #moves the stats into a pokedex's table, _row has to be set already
+    def _attachStats(self, table):
+        self.__statTable = table
+        self.__stats = None
+
+    #copies the stats back out so the pokemon still works after leaving the pokedex
+    def _detachStats(self):
+        if self.__statTable is not None:
+            self.__stats = self.__statTable.rowValues(self._row)
+            self.__statTable = None
+
+    #tells the owning pokedex that a field it indexes on has changed
+    def _notify(self, field, old):
+        if self._owner is not None:
+            self._owner._pokemonChanged(self, field, old)
+
+    #type information for display, counted from the pokedex this pokemon is in (info is the fallback without one)
+    def _typeInfo(self, typeName, info):
+        agg = self._owner.typeTotals(typeName) if self._owner is not None else None
+        if not agg:
+            return info
+        return {"Total": agg["count"], "Single Type": agg["single"], "Dual Type": agg["dual"],
+                "Average Stats": formatStats(agg["stats"])}
     
 
     #the main display method that other classes will use with polymorphismm
@@ -142,13 +576,13 @@ class BasePokemon:
             f"Weight: {self.__weight}",
             f"Abilities: {', '.join(self.__abilities)}" if self.__abilities else "",
             "Stats:",
-            f"  Total: {self.__total}",
-            f"  HP: {self.__hp}",
-            f"  Attack: {self.__attack}",
-            f"  Defence: {self.__defense}",
-            f"  Special Attack: {self.__spAttack}",
-            f"  Special Defense: {self.__spDefense}",
-            f"  Speed: {self.__speed}"
+            f"  Total: {self.getTotal()}",
+            f"  HP: {self.getHP()}",
+            f"  Attack: {self.getAttack()}",
+            f"  Defence: {self.getDefense()}",
+            f"  Special Attack: {self.getSpAttack()}",
+            f"  Special Defense: {self.getSpDefense()}",
+            f"  Speed: {self.getSpeed()}"
         ]
         finalParts = []
         for p in parts:
@@ -158,6 +592,7 @@ class BasePokemon:
         return "\n".join(finalParts)
     
     def to_dict(self):
+        total, hp, attack, defense, spAttack, spDefense, speed = [max(v, 0) for v in self.statValues()]
         return {
             "name": self.__name,
             "number": self.__number,
@@ -166,34 +601,31 @@ class BasePokemon:
             "height": self.__height,
             "weight": self.__weight,
             "abilities": self.__abilities,
-            "total": self.__total,
-            "hp": int(self.__hp) if self.__hp != "" else 0,
-            "attack": int(self.__attack) if self.__attack != "" else 0,
-            "defense": int(self.__defense) if self.__defense != "" else 0,
-            "spAttack": int(self.__spAttack) if self.__spAttack != "" else 0,
-            "spDefense": int(self.__spDefense) if self.__spDefense != "" else 0,
-            "speed": int(self.__speed) if self.__speed != "" else 0
+            "total": self.getTotal(),
+            "hp": hp,
+            "attack": attack,
+            "defense": defense,
+            "spAttack": spAttack,
+            "spDefense": spDefense,
+            "speed": speed
         }
 
 class FireType(BasePokemon):
-    def __init__(self, **kwargs):
-        avg = {"hp": "71.3", "attack": "84.8", "defense": "71.4",
-               "spAttack": "88.8", "spDefense": "73.3", "speed": "76.0", "total": "465"}
-        merged = {**avg, **kwargs}
-        super().__init__(**merged)
-        self._desc = "Fire is one of the three basic elemental types along with Water and Grass, which constitute the three starter Pokémon."
-        self._info = {"Total": 97, "Single Type": 37, "Dual Type": 60, "Moves": 49}
+    __slots__ = ()
+    #shared by every fire pokemon so it lives once on the class, not per instance
+    _desc = "Fire is one of the three basic elemental types along with Water and Grass, which constitute the three starter Pokémon."
+    _info = {"Total": 97, "Single Type": 37, "Dual Type": 60, "Moves": 49}
+
 
 class GrassType(BasePokemon):
-    def __init__(self, **kwargs):
-        avg = {"hp": "66.8", "attack": "77.0", "defense": "73.8",
-               "spAttack": "72.7", "spDefense": "73.1", "speed": "63.0", "total": "427"}
-        merged = {**avg, **kwargs}
-        super().__init__(**merged)
-        self._desc = "Grass is one of the three basic elemental types along with Fire and Water, which constitute the three starter Pokémon."
-        self._info = {"Total": 146, "Single Type": 47, "Dual Type": 99, "Moves": 62}
+    __slots__ = ()
+    #type info is the same for every grass pokemon, kept on the class
+    _desc = "Grass is one of the three basic elemental types along with Fire and Water, which constitute the three starter Pokémon."
+    _info = {"Total": 146, "Single Type": 47, "Dual Type": 99, "Moves": 62}
+
 
 class Charmander(FireType):
+    __slots__ = ()
     def __init__(self, **kwargs):
         #default info for the charmander class
         defaults = {
@@ -212,9 +644,10 @@ class Charmander(FireType):
         super().displayStats()
         print(self._desc)
         print("Type Information:")
-        for key, value in self._info.items(): print(f"{key}: {value}")
+        for key, value in self._typeInfo("Fire", self._info).items(): print(f"{key}: {value}")
 
 class Vulpix(FireType):
+    __slots__ = ()
     #default data for the Vulpix class
     def __init__(self, **kwargs):
         defaults = {
@@ -231,9 +664,10 @@ class Vulpix(FireType):
         super().displayStats()
         print(self._desc)
         print("Type Information:")
-        for key, value in self._info.items(): print(f"{key}: {value}")
+        for key, value in self._typeInfo("Fire", self._info).items(): print(f"{key}: {value}")
 
 class Bulbasaur(GrassType):
+    __slots__ = ()
     #default data for the Bulbasaur class
     def __init__(self, **kwargs):
         defaults = {
@@ -250,9 +684,10 @@ class Bulbasaur(GrassType):
         super().displayStats()
         print(self._desc)
         print("Type Information:")
-        for key, value in self._info.items(): print(f"{key}: {value}")
+        for key, value in self._typeInfo("Grass", self._info).items(): print(f"{key}: {value}")
 
 class Oddish(GrassType):
+    __slots__ = ()
     #default info for the Oddish class
     def __init__(self, **kwargs):
         defaults = {
@@ -269,15 +704,573 @@ class Oddish(GrassType):
         super().displayStats()
         print(self._desc)
         print("Type Information:")
-        for key, value in self._info.items(): print(f"{key}: {value}")
+        for key, value in self._typeInfo("Grass", self._info).items(): print(f"{key}: {value}")
+
+#splits "Grass/Poison" and "Blaze, Solar Power" style values, dropping the blanks
+def splitTypes(value):
+    return [t.strip() for t in value.split("/") if t.strip()]
+
+def splitAbilities(value):
+    return [a.strip() for a in value.split(",") if a.strip()]
+
+#lookup table for the pokemon.txt format: key in the file -> (constructor argument, how to read the value),
+#None means the stripped text is used as is
+TXT_FIELDS = {
+    "Name": ("name", None),
+    "National Number": ("number", None),
+    "Type": ("types", splitTypes),
+    "Species": ("species", None),
+    "Height": ("height", None),
+    "Weight": ("weight", None),
+    "Abilities": ("abilities", splitAbilities),
+    "Total": ("total", None),
+    "HP": ("hp", None),
+    "Attack": ("attack", None),
+    "Defence": ("defense", None),
+    "Special Attack": ("spAttack", None),
+    "Special Defense": ("spDefense", None),
+    "Speed": ("speed", None),
+}
+
+#streaming parser for the pokemon.txt format, takes any iterable of lines (an open file works)
+#and yields one dict of constructor arguments per pokemon without holding the whole file
+def parseDex(lines):
+    record = {}
+    for line in lines:
+        line = line.strip()
+        #a blank line ends the current pokemon
+        if not line:
+            if record:
+                yield record
+                record = {}
+            continue
+        key, sep, value = line.partition(":")
+        field = TXT_FIELDS.get(key.strip()) if sep else None
+        if field is not None:
+            name, read = field
+            value = value.strip()
+            record[name] = value if read is None else read(value)
+    # This handles the very last Pokemon in the file, which might not have a blank line after it
+    if record:
+        yield record
+
+#opens a pokemon.txt style file and streams its records, usable without a Pokedex
+def readDex(filename):
+    with open(filename, "r", encoding="utf-8") as f:
+        yield from parseDex(f)
+
+#a sharded dex is a directory of pokemon.txt style files or a glob matching them
+def isShardSource(source):
+    return os.path.isdir(source) or glob.has_magic(source)
+
+#the shard files of a directory or glob in sorted path order, which is the order they are merged in
+def shardFiles(source):
+    if os.path.isdir(source):
+        source = os.path.join(source, "*.txt")
+    return sorted(path for path in glob.glob(source) if os.path.isfile(path))
+
+#roughly how much of a shard one worker parses at a time
+SHARD_CHUNK_BYTES = 4 << 20
+
+#splits a dex file into byte ranges of about chunkBytes that each start on a new pokemon,
+#so one big shard is spread over the pool as well instead of going to a single worker
+def shardRanges(path, chunkBytes=SHARD_CHUNK_BYTES):
+    size = os.path.getsize(path)
+    ranges = []
+    start = 0
+    with open(path, "rb") as f:
+        while start < size:
+            f.seek(min(start + chunkBytes, size))
+            #finish the line we landed in, then move on to the blank line that ends the pokemon
+            f.readline()
+            while True:
+                line = f.readline()
+                if not line or not line.strip():
+                    break
+            end = f.tell()
+            ranges.append((path, start, end))
+            start = end
+    return ranges
+
+#parses one byte range of a shard, runs in a worker process so it has to live at module level
+def parseShard(task):
+    path, start, end = task
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    return list(parseDex(text.splitlines()))
+
+#streams the elements of a top level JSON array one at a time, only a chunk of the file is in memory
+#at once (plus whatever element is being decoded) instead of the whole document
+def iterJson(f, chunkSize=1 << 16):
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+    started = False
+    while True:
+        #skip whitespace and the separators between elements, pulling in more text when we run dry
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos == len(buf) or not started:
+            if eof:
+                raise ValueError("JSON array was not closed")
+            chunk = f.read(chunkSize)
+            eof = not chunk
+            buf = buf[pos:] + chunk
+            pos = 0
+            if not started:
+                buf = buf.lstrip()
+                if not buf:
+                    if eof:
+                        raise ValueError("expected a JSON array")
+                    continue
+                if buf[0] != "[":
+                    raise ValueError("expected a JSON array")
+                started = True
+                pos = 1
+            continue
+        if buf[pos] == "]":
+            return
+        try:
+            obj, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            #the element runs past the end of the buffer
+            obj, end = None, len(buf)
+        if end == len(buf) and not eof:
+            chunk = f.read(chunkSize)
+            eof = not chunk
+            buf = buf[pos:] + chunk
+            pos = 0
+            continue
+        if obj is None:
+            raise ValueError(f"bad JSON near character {pos}")
+        yield obj
+        pos = end
+
+#writes records as a JSON array one at a time so no list of dicts or full document is built,
+#indent=None puts each record compactly on its own line, a number matches json.dump(..., indent=n)
+def writeJson(f, records, indent=None):
+    f.write("[")
+    first = True
+    for record in records:
+        f.write("\n" if first else ",\n")
+        first = False
+        if indent is None:
+            f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        else:
+            pad = " " * indent
+            f.write(pad + json.dumps(record, indent=indent).replace("\n", "\n" + pad))
+    f.write("]" if first else "\n]")
+
+#setter to call for each field when an update is replayed from the journal
+FIELD_SETTERS = {
+    "types": "setTypes", "number": "setNumber", "name": "setName", "total": "setTotal",
+    "hp": "setHP", "attack": "setAttack", "defense": "setDefense", "spAttack": "setSpAttack",
+    "spDefense": "setSpDefense", "speed": "setSpeed", "species": "setSpecies",
+    "height": "setHeight", "weight": "setWeight", "abilities": "setAbilities",
+}
+
+#the journal is compacted once it holds more entries than the dex has pokemon (but never below this),
+#that way the full rewrite is paid once per O(n) edits and edit cost stays flat as the dex grows
+JOURNAL_MIN_ENTRIES = 1000
+
+#normalizes a National Number so "4", "0004" and "No. 0004" all land on the same index key,
+#anything that doesnt look like a number is kept as the stripped string
+def numberKey(number):
+    match = re.fullmatch(r"\s*(?:No\.?\s*)?(\d+)\s*", str(number))
+    if match:
+        return int(match.group(1))
+    return str(number).strip()
+
+#padded 3 letter pieces of a name, one edit touches at most 3 of them which is what the fuzzy index relies on
+def trigrams(text):
+    padded = f"$${text}$$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+#levenshtein distance between a and b, or limit + 1 when its over limit. uses Myers bit-parallel algorithm:
+#a column of the DP table is a couple of python ints (one bit per letter of a), so each letter of b is a few
+#big int operations instead of a loop over a
+def editDistance(a, b, limit):
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if not a:
+        return min(len(b), limit + 1)
+    peq = {}
+    for i, ch in enumerate(a):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    full = (1 << len(a)) - 1
+    last = 1 << (len(a) - 1)
+    pv, mv, score = full, 0, len(a)
+    for ch in b:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = (ph << 1) | 1
+        mh <<= 1
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv
+    return min(score, limit + 1)
+
+#how many typos fuzzyFind forgives when not told, a longer name gets more
+def editBudget(text):
+    return 1 if len(text) <= 5 else 2
+
+#binary snapshot layout: header, then fixed width arrays, then the string table
+SNAPSHOT_MAGIC = b"PKDX"
+SNAPSHOT_VERSION = 2
+#magic, version, record count and the last journal entry the snapshot already holds (see Pokedex.__replay)
+SNAPSHOT_HEADER = struct.Struct("<4sIQQ")
+#version 1 files have no checkpoint, they still load and count as holding no journal entries
+SNAPSHOT_HEADER_V1 = struct.Struct("<4sIQ")
+#the text fields of a record in the order they sit in the string table
+SNAPSHOT_STRINGS = ("name", "number", "species", "height", "weight", "types", "abilities")
+#joins list fields inside the string table, cant clash with anything typed into a name or ability
+SNAPSHOT_LIST_SEP = "\x1f"
+
+"""
+Read-only view of a binary pokedex snapshot (pokemon.dex). The file is memory-mapped and nothing is
+decoded up front: stat columns are numpy views straight onto the mapping, strings are only decoded
+when a record is asked for, and name/number lookups binary search sorted key arrays stored in the file.
+Layout after the header (all little endian, every array 8 byte aligned):
+  numberSorted  int64[count]       numeric National Numbers sorted, -1 for ones that arent numbers
+  offsets       uint64[count*7+1]  where each string of the string table starts
+  stats         int32[7][count]    one column per STAT_FIELDS entry
+  numberOrder   uint32[count]      record ids matching numberSorted
+  nameOrder     uint32[count]      record ids sorted by casefolded name
+  strings       utf-8 bytes
+"""
+class DexSnapshot:
+    def __init__(self, filename):
+        with open(filename, "rb") as f:
+            self.__map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, count = SNAPSHOT_HEADER_V1.unpack_from(self.__map, 0)
+            header = SNAPSHOT_HEADER if version == SNAPSHOT_VERSION else SNAPSHOT_HEADER_V1
+            self.checkpoint = header.unpack_from(self.__map, 0)[3] if header is SNAPSHOT_HEADER else 0
+        except struct.error:
+            self.close()
+            raise ValueError(f"{filename} is not a pokedex snapshot")
+        if magic != SNAPSHOT_MAGIC or version not in (1, SNAPSHOT_VERSION):
+            self.close()
+            raise ValueError(f"{filename} is not a pokedex snapshot")
+        self.__count = count
+        pos = header.size
+        self.__numberSorted, pos = self.__array(np.int64, count, pos)
+        self.__offsets, pos = self.__array(np.uint64, count * len(SNAPSHOT_STRINGS) + 1, pos)
+        self.__stats = []
+        for _ in STAT_FIELDS:
+            col, pos = self.__array(np.int32, count, pos)
+            self.__stats.append(col)
+        self.__numberOrder, pos = self.__array(np.uint32, count, pos)
+        self.__nameOrder, pos = self.__array(np.uint32, count, pos)
+        self.__strings = pos
+
+    def __array(self, dtype, count, pos):
+        arr = np.frombuffer(self.__map, dtype=dtype, count=count, offset=pos)
+        return arr, pos + arr.nbytes
+
+    def __len__(self):
+        return self.__count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        #the numpy views have to go before the mapping can be closed
+        self.__numberSorted = self.__offsets = self.__numberOrder = self.__nameOrder = None
+        self.__stats = []
+        self.__map.close()
+
+    #one string field of record i, decoded straight from the mapping
+    def field(self, i, name):
+        k = i * len(SNAPSHOT_STRINGS) + SNAPSHOT_STRINGS.index(name)
+        start = self.__strings + int(self.__offsets[k])
+        end = self.__strings + int(self.__offsets[k + 1])
+        return self.__map[start:end].decode("utf-8")
+
+    #numpy view of one stat for every record, MISSING_STAT for blanks
+    def column(self, field):
+        return self.__stats[STAT_COLUMN[field]]
+
+    #record i as constructor arguments, stats come back as ints
+    def record(self, i):
+        data = {name: self.field(i, name) for name in SNAPSHOT_STRINGS}
+        data["types"] = [t for t in data["types"].split(SNAPSHOT_LIST_SEP) if t]
+        data["abilities"] = [a for a in data["abilities"].split(SNAPSHOT_LIST_SEP) if a]
+        for field, col in zip(STAT_FIELDS, self.__stats):
+            data[field] = int(col[i])
+        return data
+
+    #record id for a name or National Number without loading anything, names win like Pokedex._find
+    def find(self, key):
+        name = key.strip().casefold()
+        lo, hi = 0, self.__count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.field(int(self.__nameOrder[mid]), "name").casefold() < name:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.__count and self.field(int(self.__nameOrder[lo]), "name").casefold() == name:
+            return int(self.__nameOrder[lo])
+        number = numberKey(key)
+        if isinstance(number, int):
+            i = int(np.searchsorted(self.__numberSorted, number))
+            if i < self.__count and self.__numberSorted[i] == number:
+                return int(self.__numberOrder[i])
+        return None
+
+    #writes pokemons (anything with the getter API) to a snapshot file, swapped in atomically.
+    #checkpoint is the seq of the last journal entry already folded into pokemons
+    @staticmethod
+    def write(filename, pokemons, checkpoint=0):
+        names = []
+        numbers = []
+        stats = []
+        strings = bytearray()
+        offsets = [0]
+        for p in pokemons:
+            fields = (p.getName(), p.getNumber(), p.getSpecies(), p.getHeight(), p.getWeight(),
+                      SNAPSHOT_LIST_SEP.join(p.getTypes()), SNAPSHOT_LIST_SEP.join(p.getAbilities()))
+            for text in fields:
+                strings += text.encode("utf-8")
+                offsets.append(len(strings))
+            names.append(p.getName().casefold())
+            number = numberKey(p.getNumber())
+            numbers.append(number if isinstance(number, int) else -1)
+            stats.append(p.statValues())
+        count = len(names)
+        numbers = np.array(numbers, dtype=np.int64)
+        numberOrder = np.argsort(numbers, kind="stable").astype(np.uint32)
+        nameOrder = np.array(sorted(range(count), key=names.__getitem__), dtype=np.uint32)
+        statCols = np.array(stats, dtype=np.int32).reshape(count, len(STAT_FIELDS)).T
+        with open(filename + ".tmp", "wb") as f:
+            f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, count, checkpoint))
+            f.write(numbers[numberOrder].tobytes())
+            f.write(np.array(offsets, dtype=np.uint64).tobytes())
+            for col in statCols:
+                f.write(np.ascontiguousarray(col).tobytes())
+            f.write(numberOrder.tobytes())
+            f.write(nameOrder.tobytes())
+            f.write(strings)
+        os.replace(filename + ".tmp", filename)
+
+#the six stats the charts show, in order
+CHART_LABELS = ["hp","Attack","defense","spAttack","spDefense","Speed"]
+#file types charts can be saved as
+CHART_FORMATS = ("png", "svg")
+
+#one pokemons stats as bars, with the average of its type as a line on top when there is one
+def drawBar(ax, name, vals, average=None, averageLabel=None):
+    ax.bar(CHART_LABELS,vals,label=name)
+    if average is not None:
+        ax.plot(CHART_LABELS,average,'r',marker='o',label=averageLabel)
+        ax.legend()
+    ax.set_title("Pokemon Stats!")
+    ax.set_xlabel("Statistics")
+
+#two pokemons stats as lines in different colours
+def drawLine(ax, vals1, vals2, label1="pokemon1", label2="pokemon2"):
+    ax.plot(CHART_LABELS,vals1,'b',marker='o',label=label1)
+    ax.plot(CHART_LABELS,vals2,'r',marker='o',label=label2)
+    ax.set_xlabel("statistics")
+    ax.set_ylabel("values")
+    ax.legend()
+
+def drawPie(ax, values, labels):
+    ax.pie(values, labels=labels, shadow=True)
+    ax.set_title("Type-Pie")
+    ax.legend()
+
+CHART_DRAWERS = {"bar": drawBar, "line": drawLine, "pie": drawPie}
+
+#png or svg, going by the files extension
+def chartFormat(filename):
+    fmt = os.path.splitext(filename)[1].lstrip(".").lower()
+    if fmt not in CHART_FORMATS:
+        raise PokemonInputError(f"charts can be saved as {' or '.join(CHART_FORMATS)}, not {fmt or filename}")
+    return fmt
+
+#draws one chart straight into a file without pyplot: a bare Figure on the Agg canvas shares no state with any
+#other chart and never opens a window. the format comes from the extension. its at module level so a process
+#pool can run it, returns filename
+def renderChart(kind, filename, *args):
+    fmt = chartFormat(filename)
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    try:
+        CHART_DRAWERS[kind](fig.add_subplot(), *args)
+        fig.savefig(filename, format=fmt)
+    finally:
+        #pyplot never saw this figure so nothing else holds on to it, clearing drops its artists right away
+        fig.clear()
+    return filename
+
+#draws a chart in a pyplot window and waits for it to be closed
+def showChart(kind, *args):
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots()
+    try:
+        CHART_DRAWERS[kind](ax, *args)
+        plt.show()
+    finally:
+        #otherwise pyplot keeps every figure ever shown around
+        plt.close(fig)
+
+#renderChart for pool.map, which hands over a single argument
+def renderChartTask(task):
+    return renderChart(*task)
+
+#a pokemon made safe to use as a file name. the dex number goes in front so names that only differ in
+#punctuation or case, like "Mr. Mime" and "Mr Mime", dont end up on the same file
+def chartFileName(name, number=""):
+    safe = re.sub(r"[^\w.-]+", "_", name).strip("._") or "pokemon"
+    key = numberKey(number)
+    return f"{key:04d}_{safe}" if isinstance(key, int) else safe
+
+#goes into every chart cache key, bump it when the drawing code changes so old files stop matching
+CHART_CACHE_VERSION = 1
+
+#rendered charts kept on disk under a hash of the chart kind and the numbers drawn, so the same chart asked for
+#again is a file copy instead of a trip through matplotlib. a pokemon whose stats changed hashes to a new name and
+#gets drawn fresh, its old file is never served again and just ages out. once the files add up to more than
+#maxBytes the least recently used ones are deleted, file times keep that order between runs
+class ChartCache:
+    def __init__(self, directory, maxBytes=64 << 20):
+        self.__directory = directory
+        self.__maxBytes = maxBytes
+        #file name -> size, least recently used first
+        self.__entries = collections.OrderedDict()
+        self.__bytes = 0
+        self.__hits = 0
+        self.__misses = 0
+        os.makedirs(directory, exist_ok=True)
+        found = []
+        for entry in os.scandir(directory):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                info = entry.stat()
+                found.append((info.st_mtime, entry.name, info.st_size))
+        for _, name, size in sorted(found):
+            self.__entries[name] = size
+            self.__bytes += size
+        self.__evict()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    #the cache file name for a chart, args are what would be passed to renderChart after the filename
+    @staticmethod
+    def name(kind, fmt, args):
+        data = json.dumps([CHART_CACHE_VERSION, kind, list(args)], separators=(",", ":"))
+        return f"{hashlib.sha256(data.encode('utf-8')).hexdigest()}.{fmt}"
+
+    #copies a cached chart to filename and marks it used, False when it isnt cached
+    def fetch(self, name, filename):
+        if name not in self.__entries:
+            self.__misses += 1
+            return False
+        path = os.path.join(self.__directory, name)
+        try:
+            shutil.copyfile(path, filename)
+        except FileNotFoundError:
+            #deleted from under us
+            self.__bytes -= self.__entries.pop(name)
+            self.__misses += 1
+            return False
+        os.utime(path)
+        self.__entries.move_to_end(name)
+        self.__hits += 1
+        return True
+
+    #keeps a copy of a chart that was just rendered to filename
+    def store(self, name, filename):
+        path = os.path.join(self.__directory, name)
+        shutil.copyfile(filename, path + ".tmp")
+        os.replace(path + ".tmp", path)
+        size = os.path.getsize(path)
+        self.__bytes += size - self.__entries.pop(name, 0)
+        self.__entries[name] = size
+        self.__evict()
+
+    def __evict(self):
+        while self.__bytes > self.__maxBytes and self.__entries:
+            name, size = self.__entries.popitem(last=False)
+            self.__bytes -= size
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(os.path.join(self.__directory, name))
+
+    #entries, bytes on disk and how many fetches hit or missed since this cache was opened
+    def stats(self):
+        return {"entries": len(self.__entries), "bytes": self.__bytes, "hits": self.__hits, "misses": self.__misses}
 
 class Pokedex():
     txtFile="pokemon.txt"
     jsonFile="pokemon.json"
+    #None writes pokemon.json compactly (one record per line), set a number to pretty print it
+    jsonIndent=None
+    dexFile="pokemon.dex"
+    #saved charts are cached here (None turns that off), the oldest unused ones go once it passes chartCacheBytes
+    chartCacheDir=".chartcache"
+    chartCacheBytes=64 << 20
 
-    def __init__(self, filename=None):
-        self.__pokemons = []
-        self.__filename = filename if filename else self.txtFile
+    def __init__(self, filename=None, journal=True, lazy=False):
+        #pokemons keyed by a row id so removing one doesnt have to shift a list, dicts keep insertion order
+        self.__pokemons = {}
+        #stats of every pokemon as numpy columns, row ids come from here
+        self.__stats = StatTable()
+        #lookup indexes: casefolded name / normalized number -> row ids in insertion order
+        self.__byName = {}
+        self.__byNumber = {}
+        #inverted type index: casefolded type -> {row: None}, a dict so removal is O(1)
+        self.__byType = {}
+        #same for abilities: casefolded ability -> {row: None}
+        self.__byAbility = {}
+        #sorted stat indexes for range queries, each one is built the first time its stat is queried
+        self.__statIndexes = {}
+        #per type aggregates from typeStats, None until asked for and again after any change
+        self.__aggregates = None
+        #running per type counts, sums and sums of squares (TypeTotals), built on first use and then kept up to
+        #date on every add, remove, type change and stat change
+        self.__totals = None
+        #(rows, six battle stats as floats, their lengths) for similarity searches, None until asked for and
+        #again after a pokemon is added, removed or has a stat changed
+        self.__vectors = None
+        #trigram -> casefolded names containing it, built on the first fuzzy search and kept up to date after that
+        self.__grams = None
+        #"name" / "species" -> PrefixIndex for autocomplete, built when first asked and kept up to date after that
+        self.__prefixes = None
+        #the ChartCache behind saveChart and renderBarCharts, opened the first time a chart is saved
+        self.__chartCache = None
+        #a directory or glob of shards is merged into the usual files the first time its loaded (see load), from
+        #then on those files are the dex and the shards are only read again once pokemon.txt is deleted
+        self.__shards = filename if filename and isShardSource(filename) else None
+        self.__filename = filename if filename and not self.__shards else self.txtFile
+        #with the journal on, edits are appended to <filename>.journal and folded into the files now and then
+        self.__journal = journal
+        self.__journalFile = self.__filename + ".journal"
+        self.__journalEntries = 0
+        #journal entries are numbered: __seq is the last number handed out or replayed and __checkpoint the last
+        #one the loaded snapshot already holds, so replaying after a crash mid compaction skips those
+        self.__seq = 0
+        self.__checkpoint = 0
+        #edits made inside transaction() wait here and go to disk together when it ends
+        self.__txDepth = 0
+        self.__txEntries = []
+        #in lazy mode load() keeps raw records and only builds a pokemon object the first time its used
+        self.__lazy = lazy
+        self.__snapshot = None
         self.__running = True
         self.__choices = {
             "1": self.display,
@@ -286,112 +1279,1017 @@ class Pokedex():
             "4": self.removePokemon,
             "5": self.searchByType,
             "6": self.updatePokemon,
-            "7": self.visualize
+            "7": self.visualize,
+            "8": self.searchByStats,
+            "9": self.searchByAbility,
+            "10": self.searchSimilar
         }
         self.__class_map = {"Charmander": Charmander, "Vulpix": Vulpix,
                             "Bulbasaur": Bulbasaur, "Oddish": Oddish}
         self.load()
 
+    #adds a pokemon to the dex and to every index, returns its row id
+    def _insert(self, p):
+        row = self.__stats.alloc(p.statValues())
+        self.__pokemons[row] = p
+        p._owner = self
+        p._row = row
+        p._attachStats(self.__stats)
+        self.__indexRow(row, p.getName(), p.getNumber(), p.getTypes(), p.getAbilities())
+        return row
+
+    #adds a record without building its pokemon yet: the stats go straight into the table,
+    #the rest of the record waits in the row until something asks for the pokemon
+    def _insertRaw(self, data):
+        #a named class fills in its own defaults for any field thats missing (types and abilities too, which the
+        #indexes need straight away), so a record like that is built right away just like an eager load does
+        if data.get("name") in self.__class_map and any(field not in data for field in FIELD_SETTERS):
+            return self._insert(self._build(data))
+        stats = [parseStat(data[field]) if field in data else None for field in STAT_FIELDS]
+        row = self.__stats.alloc([MISSING_STAT if v is None else v for v in stats])
+        #a plain tuple in SNAPSHOT_STRINGS order is a lot smaller than keeping the dict, None marks a missing field
+        self.__pokemons[row] = tuple(data.get(field) for field in SNAPSHOT_STRINGS)
+        self.__indexRow(row, data.get("name", ""), data.get("number", ""), data.get("types", []),
+                        data.get("abilities", []))
+        return row
+
+    #adds a record the way the current mode wants it
+    def _load(self, data):
+        if self.__lazy:
+            return self._insertRaw(data)
+        return self._insert(self._build(data))
+
+    def __indexRow(self, row, name, number, types, abilities):
+        self.__dropSortedIndexes()
+        self.__indexKey(self.__byName, name.casefold(), row)
+        if self.__grams is not None:
+            self.__nameKeyChanged(name.casefold())
+        if self.__prefixes is not None:
+            self.__prefixes["name"].add(name)
+            self.__prefixes["species"].add(self.__speciesOf(row))
+        self.__indexKey(self.__byNumber, numberKey(number), row)
+        self.__indexTypes(types, row)
+        self.__indexMembers(self.__byAbility, abilities, row)
+        for field, index in self.__statIndexes.items():
+            index.add(self.__stats.get(STAT_COLUMN[field], row), row)
+        if self.__totals is not None:
+            self.__totals.add(types, self.__stats.rowValues(row))
+        self.__aggregates = None
+        self.__vectors = None
+
+    #a pokemon for a row, built from its raw record the first time its asked for
+    def __get(self, row):
+        entry = self.__pokemons[row]
+        if isinstance(entry, BasePokemon):
+            return entry
+        p = self._build(self.__rawFields(row))
+        self.__pokemons[row] = p
+        p._owner = self
+        p._row = row
+        p._attachStats(self.__stats)
+        return p
+
+    #same as __get but an unbuilt row isnt kept, for one-off passes over the whole dex like save
+    def __peek(self, row):
+        entry = self.__pokemons[row]
+        if isinstance(entry, BasePokemon):
+            return entry
+        return self._build(self.__rawFields(row))
+
+    #every pokemon in pokedex order, built ones as they are and the rest built just for the pass
+    def __each(self):
+        for row in self.__pokemons:
+            yield self.__peek(row)
+
+    #constructor arguments for a raw row, an int entry is a record id in the mapped snapshot
+    def __rawFields(self, row):
+        entry = self.__pokemons[row]
+        if isinstance(entry, int):
+            data = self.__snapshot.record(entry)
+        else:
+            data = {field: value for field, value in zip(SNAPSHOT_STRINGS, entry) if value is not None}
+        data.update(zip(STAT_FIELDS, self.__stats.rowValues(row)))
+        return data
+
+    #name, number, types and abilities of any row whether its pokemon has been built or not
+    def __keyFields(self, row):
+        entry = self.__pokemons[row]
+        if isinstance(entry, BasePokemon):
+            return entry.getName(), entry.getNumber(), entry.getTypes(), entry.getAbilities()
+        if isinstance(entry, int):
+            snap = self.__snapshot
+            types = [t for t in snap.field(entry, "types").split(SNAPSHOT_LIST_SEP) if t]
+            abilities = [a for a in snap.field(entry, "abilities").split(SNAPSHOT_LIST_SEP) if a]
+            return snap.field(entry, "name"), snap.field(entry, "number"), types, abilities
+        name, number, species, height, weight, types, abilities = entry
+        return name or "", number or "", types or [], abilities or []
+
+    #names of every pokemon in pokedex order, read from the raw records so nothing gets built
+    def names(self):
+        for row in self.__pokemons:
+            yield self.__keyFields(row)[0]
+
+    def __len__(self):
+        return len(self.__pokemons)
+
+    #how many rows have actually been turned into pokemon objects
+    def builtCount(self):
+        return sum(1 for entry in self.__pokemons.values() if isinstance(entry, BasePokemon))
+
+    #takes a pokemon out of the dex and out of every index
+    def _delete(self, row):
+        self.__dropSortedIndexes()
+        p = self.__get(row)
+        del self.__pokemons[row]
+        self.__unindexKey(self.__byName, p.getName().casefold(), row)
+        self.__nameKeyChanged(p.getName().casefold())
+        if self.__prefixes is not None:
+            self.__prefixes["name"].remove(p.getName())
+            self.__prefixes["species"].remove(p.getSpecies())
+        self.__unindexKey(self.__byNumber, numberKey(p.getNumber()), row)
+        self.__unindexTypes(p.getTypes(), row)
+        self.__unindexMembers(self.__byAbility, p.getAbilities(), row)
+        for field, index in self.__statIndexes.items():
+            index.remove(self.__stats.get(STAT_COLUMN[field], row), row)
+        if self.__totals is not None:
+            self.__totals.remove(p.getTypes(), self.__stats.rowValues(row))
+        self.__aggregates = None
+        self.__vectors = None
+        p._detachStats()
+        self.__stats.free(row)
+        p._owner = None
+        p._row = None
+        return p
+
+    #finds a pokemon by name or National Number in O(1), names win over numbers like the old scan did
+    def _find(self, key):
+        rows = self.__byName.get(key.strip().casefold()) or self.__byNumber.get(numberKey(key))
+        if not rows:
+            return None
+        return self.__get(rows[0])
+
+    #called by BasePokemon setters so a rename, renumber or stat change keeps the indexes right
+    def _pokemonChanged(self, p, field, old):
+        self.__dropSortedIndexes()
+        if field == "types" or field in STAT_COLUMN:
+            self.__aggregates = None
+        if field in STAT_COLUMN:
+            self.__vectors = None
+        if self.__totals is not None:
+            if field == "types":
+                stats = self.__stats.rowValues(p._row)
+                self.__totals.remove(old, stats)
+                self.__totals.add(p.getTypes(), stats)
+            elif field in STAT_COLUMN:
+                col = STAT_COLUMN[field]
+                self.__totals.changeStat(p.getTypes(), col, old, self.__stats.get(col, p._row))
+        if field in ("name", "species") and self.__prefixes is not None:
+            self.__prefixes[field].remove(old)
+            self.__prefixes[field].add(p.getName() if field == "name" else p.getSpecies())
+        if field == "name":
+            self.__unindexKey(self.__byName, old.casefold(), p._row)
+            self.__indexKey(self.__byName, p.getName().casefold(), p._row)
+            self.__nameKeyChanged(old.casefold())
+            self.__nameKeyChanged(p.getName().casefold())
+        elif field == "number":
+            self.__unindexKey(self.__byNumber, numberKey(old), p._row)
+            self.__indexKey(self.__byNumber, numberKey(p.getNumber()), p._row)
+        elif field == "types":
+            self.__unindexTypes(old, p._row)
+            self.__indexTypes(p.getTypes(), p._row)
+        elif field == "abilities":
+            self.__unindexMembers(self.__byAbility, old, p._row)
+            self.__indexMembers(self.__byAbility, p.getAbilities(), p._row)
+        elif field in self.__statIndexes:
+            index = self.__statIndexes[field]
+            index.remove(old, p._row)
+            index.add(self.__stats.get(STAT_COLUMN[field], p._row), p._row)
+
+    #the sorted indexes (stats and autocomplete) cost an O(n) insert per edit to keep up to date, which makes a bulk
+    #import quadratic. inside a transaction theyre dropped instead and the next query rebuilds them with one sort
+    def __dropSortedIndexes(self):
+        if self.__txDepth:
+            self.__statIndexes = {}
+            self.__prefixes = None
+
+    @staticmethod
+    def __indexKey(index, key, row):
+        index.setdefault(key, []).append(row)
+
+    @staticmethod
+    def __unindexKey(index, key, row):
+        rows = index.get(key)
+        if rows and row in rows:
+            rows.remove(row)
+            if not rows:
+                del index[key]
+
+    def __indexTypes(self, types, row):
+        self.__indexMembers(self.__byType, types, row)
+
+    def __unindexTypes(self, types, row):
+        self.__unindexMembers(self.__byType, types, row)
+
+    #adds a row under each of its values in an inverted index like __byType
+    @staticmethod
+    def __indexMembers(index, values, row):
+        for value in values:
+            index.setdefault(value.strip().casefold(), {})[row] = None
+
+    @staticmethod
+    def __unindexMembers(index, values, row):
+        for value in values:
+            key = value.strip().casefold()
+            rows = index.get(key)
+            if rows is not None:
+                rows.pop(row, None)
+                if not rows:
+                    del index[key]
+
+    #a name just got its first row or lost its last one, the trigram index only holds names that are in the dex
+    def __nameKeyChanged(self, key):
+        if self.__grams is None:
+            return
+        if key in self.__byName:
+            for gram in trigrams(key):
+                self.__grams.setdefault(gram, set()).add(key)
+            return
+        for gram in trigrams(key):
+            names = self.__grams.get(gram)
+            if names is not None:
+                names.discard(key)
+                if not names:
+                    del self.__grams[gram]
+
+    #pokemon whose name is close to name as (distance, pokemon), closest first then in pokedex order.
+    #with maxDistance every name within that many edits counts, otherwise it looks one edit away and only widens
+    #(up to editBudget's pick) when that found nothing, so the usual single typo stays cheap
+    def fuzzyFind(self, name, maxDistance=None, limit=10):
+        key = name.strip().casefold()
+        if not key:
+            return []
+        if self.__grams is None:
+            self.__grams = {}
+            for nameKey in self.__byName:
+                self.__nameKeyChanged(nameKey)
+        budgets = [maxDistance] if maxDistance is not None else range(1, editBudget(key) + 1)
+        for budget in budgets:
+            found = self.__fuzzyRows(key, budget)
+            if found:
+                break
+        return [(distance, self.__get(row)) for distance, row in found[:limit]]
+
+    #(distance, row) of every name within budget edits of key. a name within k edits still shares all but 3k of
+    #keys trigrams, so candidates come from the rarest few trigrams and only the ones sharing enough get a real
+    #edit distance. very short keys only find names that share at least one trigram with them
+    def __fuzzyRows(self, key, budget):
+        grams = sorted(trigrams(key), key=lambda gram: len(self.__grams.get(gram, ())))
+        need = max(1, len(grams) - 3 * budget)
+        #any match has at least one of these, the rest are only checked against names already found
+        rare = len(grams) - need + 1
+        counts = collections.Counter()
+        for gram in grams[:rare]:
+            counts.update(self.__grams.get(gram, ()))
+        candidates = set(counts)
+        for gram in grams[rare:]:
+            counts.update(candidates.intersection(self.__grams.get(gram, ())))
+        found = []
+        for cand, shared in counts.items():
+            #the same bound works the other way round too, from the candidates own trigrams
+            if shared >= need and abs(len(cand) - len(key)) <= budget and shared >= len(trigrams(cand)) - 3 * budget:
+                distance = editDistance(key, cand, budget)
+                if distance <= budget:
+                    found.append((distance, self.__byName[cand][0]))
+        #ties go to pokedex order
+        found.sort()
+        return found
+
+    #the menus way of finding a pokemon: exact name/number first, otherwise the closest name if theres a clear winner
+    def _lookup(self, key):
+        p = self._find(key)
+        if p is not None:
+            return p
+        matches = self.fuzzyFind(key, limit=2)
+        if matches and (len(matches) == 1 or matches[0][0] < matches[1][0]):
+            print(f"Using the closest match, {matches[0][1].getName()}")
+            return matches[0][1]
+        return None
+
+    #the species of a row, read from the raw record when the pokemon hasnt been built
+    def __speciesOf(self, row):
+        entry = self.__pokemons[row]
+        if isinstance(entry, BasePokemon):
+            return entry.getSpecies()
+        if isinstance(entry, int):
+            return self.__snapshot.field(entry, "species")
+        return entry[SNAPSHOT_STRINGS.index("species")] or ""
+
+    #up to limit names (field="name") or species (field="species") starting with prefix, alphabetically.
+    #one binary search into a sorted list and then limit steps, quick enough to run on every keystroke
+    def autocomplete(self, prefix, field="name", limit=10):
+        if field not in ("name", "species"):
+            raise PokemonInputError(f"can only autocomplete name or species, not {field}")
+        if self.__prefixes is None:
+            self.__prefixes = {"name": PrefixIndex(self.__keyFields(row)[0] for row in self.__pokemons),
+                               "species": PrefixIndex(self.__speciesOf(row) for row in self.__pokemons)}
+        return self.__prefixes[field].complete(prefix, limit)
+
+    #readline completer for the menu prompts, offers pokemon names
+    def __completeName(self, text, state):
+        if state == 0:
+            self.__completions = self.autocomplete(text, limit=50)
+        return self.__completions[state] if state < len(self.__completions) else None
+
+    #every pokemon of a type in pokedex order, costs the size of the result not the whole dex
+    def _ofType(self, typeVal):
+        rows = self.__byType.get(typeVal.strip().casefold(), {})
+        return [self.__get(row) for row in sorted(rows)]
+
+    #one stat for every pokemon as a numpy array in pokedex order, missing stats are MISSING_STAT
+    def statColumn(self, field):
+        return self.__stats.column(field)[self.__stats.liveRows()]
+
+    #pokemons ordered by a stat, highest first unless ascending is set
+    def sortedByStat(self, field, ascending=False):
+        return self.query(order=field, descending=not ascending)
+
+    #the sorted index for a stat, built from the table the first time its needed and kept up to date after that
+    def __statIndex(self, field):
+        if field not in STAT_COLUMN:
+            raise PokemonInputError(f"{field} is not a stat, pick one of {', '.join(STAT_FIELDS)}")
+        index = self.__statIndexes.get(field)
+        if index is None:
+            rows = self.__stats.liveRows()
+            index = self.__statIndexes[field] = StatIndex(self.__stats.column(field)[rows], rows)
+        return index
+
+    #pokemons whose stats fall in the given (low, high) ranges, e.g. query(speed=(100, None), total=(500, 600)).
+    #bounds are inclusive, None leaves a side open and a blank stat never matches a range.
+    #the narrowest range is read off its sorted index and the others are checked on just those rows, so the cost
+    #follows the size of that range rather than the dex. results are in pokedex order unless order names a stat
+    def query(self, order=None, descending=False, limit=None, **ranges):
+        if limit is not None and limit <= 0:
+            return []
+        if order is not None:
+            orderIndex = self.__statIndex(order)
+        spans = {}
+        for field, (low, high) in ranges.items():
+            ranges[field] = (0 if low is None else max(low, 0)), high
+            spans[field] = self.__statIndex(field).span(*ranges[field])
+        if spans:
+            drive = min(spans, key=lambda field: spans[field][1] - spans[field][0])
+            rows = self.__statIndexes[drive].rows(*spans[drive])
+            for field, (low, high) in ranges.items():
+                if field != drive:
+                    values = self.__stats.column(field)[rows]
+                    keep = values >= low
+                    if high is not None:
+                        keep &= values <= high
+                    rows = rows[keep]
+            if order is not None and order != drive:
+                rows = rows[np.lexsort((rows, self.__stats.column(order)[rows]))]
+            elif order is None:
+                rows = np.sort(rows)
+        elif order is not None:
+            start, stop = 0, len(orderIndex)
+            #highest first only needs the top of the index, widened so every tie at the cut makes it in
+            if descending and limit is not None and limit < stop:
+                start = orderIndex.span(low=orderIndex.values(stop - limit, stop - limit + 1)[0])[0]
+            rows = orderIndex.rows(start, stop)
+        else:
+            rows = self.__stats.liveRows()
+        if descending and order is not None:
+            #highest first, ties still in pokedex order
+            rows = rows[np.lexsort((rows, -self.__stats.column(order)[rows].astype(np.int64)))]
+        return [self.__get(int(row)) for row in rows[:limit]]
+
+    #the six battle stats of one pokemon for charting, blanks count as 0
+    def _chartStats(self, p):
+        return [max(v, 0) for v in self.__stats.rowValues(p._row)[1:]]
+
+    #how many pokemon carry each type, dual types count towards both
+    def typeCounts(self):
+        return {t: len(rows) for t, rows in self.__byType.items()}
+
+    #the running totals, counted from the stat table in one vectorised pass the first time theyre needed
+    def __typeTotals(self):
+        if self.__totals is None:
+            self.__totals = self.__countTotals()
+        return self.__totals
+
+    def __countTotals(self):
+        return TypeTotals.fromColumns(np.stack([self.__stats.column(field) for field in STAT_FIELDS]), self.__byType)
+
+    #count, single/dual split and the count/mean/standard deviation of every stat for a type (or every type).
+    #read straight off the running totals, so unlike typeStats it costs the same on any size of dex after any edit
+    def typeTotals(self, typeVal=None):
+        totals = self.__typeTotals()
+        if typeVal is not None:
+            return totals.summary(typeVal)
+        return {t: totals.summary(t) for t in totals.counts()}
+
+    #counts the totals again from scratch and compares, returns the types (and "a/b" type pairs) that had drifted
+    #and leaves the fresh ones in place. empty means the running totals were right
+    def verifyTypeTotals(self):
+        fresh = self.__countTotals()
+        drifted = fresh.diff(self.__totals) if self.__totals is not None else []
+        self.__totals = fresh
+        return drifted
+
+    #count, single/dual split and count/mean/min/max/percentiles of every stat for each type (or just typeVal),
+    #worked out from the stat table a whole type at a time and cached until the dex changes. blank stats are left out
+    def typeStats(self, typeVal=None):
+        if self.__aggregates is None:
+            self.__aggregates = self.__aggregate()
+        if typeVal is None:
+            return self.__aggregates
+        return self.__aggregates.get(typeVal.strip().casefold())
+
+    def __aggregate(self):
+        columns = np.stack([self.__stats.column(field) for field in STAT_FIELDS])
+        #how many types each row has, for the single/dual split
+        typeCount = np.zeros(columns.shape[1], dtype=np.int8)
+        rowsOf = {}
+        for t, bucket in self.__byType.items():
+            rows = rowsOf[t] = np.fromiter(bucket, dtype=np.int64, count=len(bucket))
+            typeCount[rows] += 1
+        result = {}
+        for t, rows in rowsOf.items():
+            #sorting each stat once gives min, max and every percentile, blanks sort to the front
+            block = np.sort(columns[:, rows], axis=1)
+            stats = {}
+            for field, values in zip(STAT_FIELDS, block):
+                values = values[np.searchsorted(values, MISSING_STAT, "right"):]
+                if not len(values):
+                    stats[field] = {"count": 0}
+                    continue
+                stats[field] = {"count": len(values), "mean": float(values.mean()),
+                                "min": int(values[0]), "max": int(values[-1])}
+                for q, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+                    stats[field][f"p{q}"] = float(value)
+            single = int(np.count_nonzero(typeCount[rows] == 1))
+            result[t] = {"count": len(rows), "single": single, "dual": len(rows) - single, "stats": stats}
+        return result
+
+    #live rows (or just typeVal's), their hp..speed as a float matrix with blanks as 0, and each rows length
+    def __statVectors(self, typeVal=None):
+        if self.__vectors is None:
+            rows = self.__stats.liveRows()
+            matrix = np.stack([self.__stats.column(field)[rows] for field in STAT_FIELDS[1:]], axis=1)
+            matrix = np.maximum(matrix, 0).astype(np.float64)
+            self.__vectors = rows, matrix, np.linalg.norm(matrix, axis=1)
+        rows, matrix, norms = self.__vectors
+        if typeVal is None:
+            return rows, matrix, norms
+        bucket = self.__byType.get(typeVal.strip().casefold(), {})
+        #live rows are sorted, so every row of the type is found with one binary search each
+        at = np.searchsorted(rows, np.sort(np.fromiter(bucket, dtype=np.int64, count=len(bucket))))
+        return rows[at], matrix[at], norms[at]
+
+    #the k pokemon whose stat spread is closest to target as (distance, pokemon), closest first.
+    #target is a name/National Number (that pokemon is left out of its own results) or six stats hp..speed.
+    #one vectorised pass over the cached stat matrix, so a query over a million pokemon takes a few tens of ms
+    def similar(self, target, k=10, metric="euclidean", typeVal=None):
+        checkMetric(metric)
+        own = None
+        if isinstance(target, str):
+            p = self.get(target)
+            own = p._row
+            target = self._chartStats(p)
+        target = np.asarray(target, dtype=np.float64)
+        if target.shape != (len(STAT_FIELDS) - 1,):
+            raise PokemonInputError("a stat spread needs hp, attack, defense, spAttack, spDefense and speed")
+        rows, matrix, norms = self.__statVectors(typeVal)
+        dist = statDistances(matrix, norms, target, metric)
+        if own is not None:
+            dist[rows == own] = np.inf
+        found = [(float(dist[i]), self.__get(int(rows[i]))) for i in nearest(dist, rows, k)]
+        return [(d, p) for d, p in found if d != np.inf]
+
+    #all-pairs mode for clustering reports: every pokemon (of typeVal if given) with its k nearest others, yielded
+    #as (name, [(distance, name), ...]) in pokedex order. distances are worked out a block of rows against the
+    #whole set at a time, sized so a block takes about blockBytes, so memory stays flat however big the dex is.
+    #its still n squared work, so on a whole big dex expect it to take a while
+    def similarPairs(self, k=5, metric="euclidean", typeVal=None, blockBytes=64 << 20):
+        checkMetric(metric)
+        rows, matrix, norms = self.__statVectors(typeVal)
+        n = len(rows)
+        k = min(k, n - 1)
+        if k <= 0:
+            return
+        names = [self.__keyFields(int(row))[0] for row in rows]
+        if metric == "cosine":
+            #on unit vectors the cosine is just a dot product, all zero spreads stay zero and end up at distance 1
+            matrix = matrix / np.where(norms > 0, norms, 1)[:, None]
+        squares = (matrix ** 2).sum(axis=1)
+        step = max(1, blockBytes // (8 * n))
+        for start in range(0, n, step):
+            stop = min(n, start + step)
+            dots = matrix[start:stop] @ matrix.T
+            if metric == "euclidean":
+                #|a - b|^2 = |a|^2 + |b|^2 - 2a.b, rounding can dip just under 0
+                dist = np.sqrt(np.maximum(squares[start:stop, None] + squares[None, :] - 2 * dots, 0))
+            else:
+                dist = 1 - dots
+            dist[np.arange(stop - start), np.arange(start, stop)] = np.inf
+            for i in range(stop - start):
+                near = nearest(dist[i], rows, k)
+                yield names[start + i], [(float(dist[i, j]), names[j]) for j in near]
+
+    #writes similarPairs to a csv, one row per pokemon: name then each neighbour and its distance
+    def writeSimilarityReport(self, filename, k=5, metric="euclidean", typeVal=None):
+        with open(filename, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            header = ["name"]
+            for i in range(1, k + 1):
+                header += [f"neighbour{i}", f"distance{i}"]
+            writer.writerow(header)
+            for name, neighbours in self.similarPairs(k, metric, typeVal):
+                line = [name]
+                for distance, other in neighbours:
+                    line += [other, f"{distance:.4f}"]
+                writer.writerow(line)
+        print(f"Similarity report written to {filename}")
+
+    # Decide which class to use based on the name, if not in the dictionary uses basePokemon
+    def _build(self, data):
+        item_class = self.__class_map.get(data.get("name"), BasePokemon)
+        return item_class(**data)
+
+    #empties the dex and every index before a (re)load
+    def __clear(self):
+        for p in self.__pokemons.values():
+            if isinstance(p, BasePokemon):
+                p._detachStats()
+                p._owner = None
+        self.__pokemons = {}
+        if self.__snapshot is not None:
+            self.__snapshot.close()
+            self.__snapshot = None
+        self.__stats = StatTable()
+        self.__byName = {}
+        self.__byNumber = {}
+        self.__byType = {}
+        self.__byAbility = {}
+        self.__statIndexes = {}
+        self.__aggregates = None
+        self.__totals = None
+        self.__vectors = None
+        self.__grams = None
+        self.__prefixes = None
+        self.__journalEntries = 0
+        self.__seq = 0
+        self.__checkpoint = 0
+
     #This is called immediately after initialization to load the data from the file
     def load(self):
-        self.__pokemons = [] 
+        self.__clear()
+        if self.__shards:
+            shards, self.__shards = self.__shards, None
+            if not os.path.exists(self.__filename):
+                self.loadShards(shards)
+                #saved straight away so edits have somewhere to go that the next start actually reads
+                if len(self):
+                    self.compact()
+                return
+            print(f"Using the merged {self.__filename}, delete it to merge {shards} again")
+        #the binary snapshot is the quickest to read so its tried first
+        try:
+            if self.__lazy:
+                #rows just point at records in the mapping, the stat block is copied over in one go
+                self.__snapshot = DexSnapshot(self.dexFile)
+                self.__checkpoint = self.__snapshot.checkpoint
+                rows = self.__stats.extend([self.__snapshot.column(field) for field in STAT_FIELDS])
+                for i, row in enumerate(rows):
+                    self.__pokemons[row] = i
+                    self.__indexRow(row, *self.__keyFields(row))
+            else:
+                with DexSnapshot(self.dexFile) as snap:
+                    self.__checkpoint = snap.checkpoint
+                    for i in range(len(snap)):
+                        self._insert(self._build(snap.record(i)))
+            print(f"Loaded data from {self.dexFile}")
+            self.__replay()
+            return
+        except FileNotFoundError:
+            pass
+        except ValueError as e:
+            print(f"Error: {e}")
+            self.__clear()
         try:
             with open(self.jsonFile, "r", encoding="utf-8") as jf:
-                data = json.load(jf)
-                for poke in data:
-                    item_class = self.__class_map.get(poke.get("name"), BasePokemon)
-                    p = item_class(**poke)
-                    self.__pokemons.append(p)
+                for poke in iterJson(jf):
+                    self._load(poke)
             print(f"Loaded data from {self.jsonFile}")
+            self.__replay()
             return
         except FileNotFoundError:
             pass
         except Exception as e:
-            print(f"Error: str(e)")
+            print(f"Error: {e}")
+            self.__clear()
 
         try:
-            with open(self.__filename, "r", encoding="utf-8") as f:
-                lines = f.readlines()
+            self.__loadRecords(readDex(self.__filename), self.__filename)
         #called when file doesn't exist
         except FileNotFoundError:
             pass
-        current_pokemon_data = {}
-        for line in lines:
-            line = line.strip()
-            if not line:
-                if current_pokemon_data: 
-                    # Decide which class to use based on the name, if not in the dictionary uses basePokemon
-                    item_class = self.__class_map.get(current_pokemon_data.get("name"), BasePokemon)
-                    p = item_class(**current_pokemon_data)
-                    self.__pokemons.append(p)
-                current_pokemon_data = {}
-                continue
+        self.__replay()
 
-            # Split the line into a key and value
-            if ":" in line:
-                key, value = line.split(":", 1)
-                key = key.strip()
-                value = value.strip()
-
-                # Assign data to our dictionary based on the key
-                if key == "Name":
-                    current_pokemon_data["name"] = value
-                elif key == "National Number":
-                    current_pokemon_data["number"] = value
-                elif key == "Type":
-                    current_pokemon_data["types"] = [t.strip() for t in value.split("/") if t.strip()]
-                elif key == "Species":
-                    current_pokemon_data["species"] = value
-                elif key == "Height":
-                    current_pokemon_data["height"] = value
-                elif key == "Weight":
-                    current_pokemon_data["weight"] = value
-                elif key == "Abilities":
-                    current_pokemon_data["abilities"] = [a.strip() for a in value.split(",") if a.strip()]
-                elif key == "Total":
-                    current_pokemon_data["total"] = value
-                elif key == "HP":
-                    current_pokemon_data["hp"] = value
-                elif key == "Attack":
-                    current_pokemon_data["attack"] = value
-                elif key == "Defence": 
-                    current_pokemon_data["defense"] = value
-                elif key == "Special Attack":
-                    current_pokemon_data["spAttack"] = value
-                elif key == "Special Defense":
-                    current_pokemon_data["spDefense"] = value
-                elif key == "Speed":
-                    current_pokemon_data["speed"] = value
-        
-        # This handles the very last Pokemon in the file, which might not have a blank line after it
-        if current_pokemon_data:
-            item_class = self.__class_map.get(current_pokemon_data.get("name"), BasePokemon)
-            p = item_class(**current_pokemon_data)
-            self.__pokemons.append(p)
+    #loads parsed records one by one, a record with a bad stat is reported and skipped instead of stopping the load
+    def __loadRecords(self, records, source):
+        for data in records:
+            try:
+                self._load(data)
+            except ValueError as e:
+                print(f"Skipped {data.get('name', '?')} ({data.get('number', '?')}) in {source}: {e}")
+
+    #parses a directory or glob of dex files in parallel and merges them in, shards in sorted path order and
+    #records in file order, so the result is the same however many processes there are. a pokemon whose name
+    #or number is already in the dex is skipped, returns those as (shard, name, number)
+    def loadShards(self, source, processes=None):
+        files = shardFiles(source)
+        if not files:
+            print(f"No dex files match {source}")
+            return []
+        tasks = [task for path in files for task in shardRanges(path)]
+        duplicates = []
+
+        def merge(chunks):
+            for (path, _, _), records in zip(tasks, chunks):
+                for data in records:
+                    name, number = data.get("name", ""), data.get("number", "")
+                    if self.exists(name, number):
+                        duplicates.append((path, name, number))
+                    else:
+                        self.__loadRecords((data,), path)
+
+        #one chunk isnt worth starting a pool for
+        if len(tasks) == 1 or processes == 1:
+            merge(map(parseShard, tasks))
+        else:
+            #only the pool needs this and its a noticeable part of the import time, so its loaded here
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                #map hands results back in task order while the workers run ahead
+                merge(pool.map(parseShard, tasks))
+        print(f"Loaded {len(self)} pokemon from {len(files)} shard(s)")
+        for path, name, number in duplicates:
+            print(f"Skipped duplicate {name} ({number}) in {path}")
+        return duplicates
+
+    #every field of a pokemon as plain strings and lists, the same shape the constructors take
+    @staticmethod
+    def _fields(p):
+        return {
+            "types": list(p.getTypes()), "number": p.getNumber(), "name": p.getName(),
+            "total": p.getTotal(), "hp": p.getHP(), "attack": p.getAttack(), "defense": p.getDefense(),
+            "spAttack": p.getSpAttack(), "spDefense": p.getSpDefense(), "speed": p.getSpeed(),
+            "species": p.getSpecies(), "height": p.getHeight(), "weight": p.getWeight(),
+            "abilities": list(p.getAbilities())
+        }
+
+    #applies one journal entry. removes and updates name the pokemon by its name and number as they were when the
+    #entry was written, so an entry that was already applied doesnt land on some other pokemon that took the
+    #number or name over since. the snapshot checkpoint covers the rest, see __replay
+    def _apply(self, entry):
+        op = entry["op"]
+        if op == "add":
+            data = entry["data"]
+            if data["name"].strip().casefold() not in self.__byName and numberKey(data["number"]) not in self.__byNumber:
+                self._load(data)
+            return
+        p = self.__journalTarget(entry)
+        if p is None:
+            return
+        if op == "remove":
+            self._delete(p._row)
+        elif op == "update":
+            for field, value in entry["fields"].items():
+                getattr(p, FIELD_SETTERS[field])(value)
+
+    #the pokemon a remove/update entry was written for, None if its not (or no longer) there.
+    #journals from before entries carried name and number only have the key that was typed in
+    def __journalTarget(self, entry):
+        if "key" in entry:
+            return self._find(entry["key"])
+        rows = self.__byName.get(entry["name"].strip().casefold())
+        if not rows:
+            return None
+        p = self.__get(rows[0])
+        return p if numberKey(p.getNumber()) == numberKey(entry["number"]) else None
+
+    #replays the journal on top of whatever load() just read. entries numbered at or below the snapshots
+    #checkpoint are already in it (a crash between saving and deleting the journal leaves those behind)
+    def __replay(self):
+        self.__seq = self.__checkpoint
+        try:
+            f = open(self.__journalFile, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    #a half written last line from a crash, everything before it is still good
+                    break
+                self.__journalEntries += 1
+                seq = entry.get("seq")
+                if seq is not None:
+                    if seq <= self.__checkpoint:
+                        continue
+                    self.__seq = max(self.__seq, seq)
+                self._apply(entry)
+
+    #records one edit, appending a line to the journal instead of rewriting the whole dex
+    def _log(self, entry):
+        self.__seq += 1
+        entry["seq"] = self.__seq
+        if self.__txDepth:
+            self.__txEntries.append(entry)
+            return
+        self.__flush([entry])
+
+    #writes edits out in one go, as journal lines or, when the journal would get too long, as a compaction
+    def __flush(self, entries):
+        if not entries:
+            return
+        if not self.__journal or self.__journalEntries + len(entries) > max(JOURNAL_MIN_ENTRIES, len(self.__pokemons)):
+            self.compact()
+            return
+        with open(self.__journalFile, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries))
+        self.__journalEntries += len(entries)
+
+    #groups edits so they share one write when the outermost transaction ends, if anything inside raises
+    #the unwritten edits are thrown away and the dex is read back from disk to undo them
+    @contextlib.contextmanager
+    def transaction(self):
+        self.__txDepth += 1
+        try:
+            yield self
+        except BaseException:
+            self.__txDepth -= 1
+            if self.__txDepth == 0:
+                self.__txEntries = []
+                self.load()
+            raise
+        self.__txDepth -= 1
+        if self.__txDepth == 0:
+            entries, self.__txEntries = self.__txEntries, []
+            self.__flush(entries)
+
+    #folds the journal into the main file(s) and starts a fresh one
+    def compact(self):
+        self.save()
+        if os.path.exists(self.__journalFile):
+            os.remove(self.__journalFile)
+        self.__journalEntries = 0
 
     #called whenever a change is made the data
     #therefore when user exists or change is made, can view the json immediately!
     def save(self):
         # write text file
-        with open(self.__filename, "w", encoding="utf-8") as f:
-            f.write("\n\n".join(p.to_file_format() for p in self.__pokemons))
+        #written next to the real files and swapped in, so a crash never leaves half a dex behind
+        with open(self.__filename + ".tmp", "w", encoding="utf-8") as f:
+            f.write("\n\n".join(p.to_file_format() for p in self.__each()))
             f.write("\n")
+        os.replace(self.__filename + ".tmp", self.__filename)
+        saved = ["TXT"]
         # write json
         try:
-            with open(self.jsonFile, "w", encoding="utf-8") as jf:
-                json.dump([p.to_dict() for p in self.__pokemons], jf, indent=4)
+            with open(self.jsonFile + ".tmp", "w", encoding="utf-8") as jf:
+                writeJson(jf, (p.to_dict() for p in self.__each()), indent=self.jsonIndent)
+            os.replace(self.jsonFile + ".tmp", self.jsonFile)
+            saved.append("JSON")
         except Exception as e:
-            print("Failed to save to json file =-=", e)
-        print(":] Changes saved to TXT and JSON.")
+            self.__dropStale(self.jsonFile, "json file", e)
+        # write the binary snapshot used for quick startup
+        try:
+            DexSnapshot.write(self.dexFile, self.__each(), self.__seq)
+            saved.append("snapshot")
+        except OSError as e:
+            self.__dropStale(self.dexFile, "snapshot", e)
+        print(f":] Changes saved to {', '.join(saved[:-1])} and {saved[-1]}." if len(saved) > 1
+              else f":] Changes saved to {saved[0]}.")
+
+    #load() reads pokemon.dex and pokemon.json before pokemon.txt, so one that couldnt be rewritten is deleted.
+    #left behind it would bring back the dex from before these edits once compact() has thrown the journal away
+    def __dropStale(self, filename, what, error):
+        print(f"Failed to save the {what} =-=", error)
+        if os.path.exists(filename):
+            os.remove(filename)
 
     #method to display all the info of pokemon in the pokemon list, if empty it just returns back to menu
     def display(self):
         if not self.__pokemons: 
             print("No Pokemon.")
             return
-        for p in self.__pokemons:
+        for p in self.__each():
             p.displayStats()
     
+    #regex checking for proper format of National Number, Height & Weight
+    @classmethod
+    def checkInput(cls,stat,val):
+        if stat=="National Number":
+            return re.match(r"^No\. \d{4}$",val)
+        if stat=="Height":
+            return re.match(r"^\d+\.\d m$",val)
+        if stat=="Weight":
+            return re.match(r"^\d+\.\d kg$",val)
+
+    #the messages the input checks raise, shared by the menu prompts and the API
+    __fieldErrors = {
+        "number": "The format for National Number is of format 'No. xxxx'!",
+        "height": "Pokemon height must of format 'xxx.x m!'",
+        "weight": "Pokemon weight must of format 'xxx.x kg!'",
+        "types": "*-* Pokemon can only have 1 or 2 types.",
+        "abilities": "^_^ Pokemon can only have 1 to 4 moves!",
+        "total": "Total must be a number!",
+        "hp": "HP must be a number!",
+        "attack": "Attack must be a number!",
+        "defense": "Defense must be a number!",
+        "spAttack": "sp. Atk must be a number!",
+        "spDefense": "sp. Def must be a number!",
+        "speed": "Speed must be a number!",
+    }
+    __formatChecks = {"number": "National Number", "height": "Height", "weight": "Weight"}
+
+    #checks one field and hands back its cleaned value, types/abilities can be a list or a "/" or "," string
+    @classmethod
+    def _checkField(cls, field, value):
+        if field not in FIELD_SETTERS:
+            raise PokemonInputError(f"Unknown field '{field}'")
+        if field == "types":
+            value = splitTypes(value) if isinstance(value, str) else [str(t).strip() for t in value if str(t).strip()]
+            if not (1 <= len(value) <= 2):
+                raise PokemonInputError(cls.__fieldErrors[field])
+        elif field == "abilities":
+            value = splitAbilities(value) if isinstance(value, str) else [str(a).strip() for a in value if str(a).strip()]
+            if not (1 <= len(value) <= 4):
+                raise PokemonInputError(cls.__fieldErrors[field])
+        elif field in STAT_COLUMN:
+            value = str(value).strip()
+            if not value.isdigit():
+                raise PokemonInputError(cls.__fieldErrors[field])
+            if int(value) > MAX_STAT:
+                raise PokemonInputError(f"{STAT_LABELS[field]} can be at most {MAX_STAT}!")
+        else:
+            value = str(value)
+            if field in cls.__formatChecks and not cls.checkInput(cls.__formatChecks[field], value):
+                raise PokemonInputError(cls.__fieldErrors[field])
+        return value
+
+    #validates a whole new record with the same rules as the menu, filling in total when its left out
+    @classmethod
+    def _checkRecord(cls, record):
+        required = ("number", "name", "types", "species", "height", "weight", "abilities",
+                    "hp", "attack", "defense", "spAttack", "spDefense", "speed")
+        missing = [field for field in required if field not in record]
+        if missing:
+            raise PokemonInputError(f"Missing fields: {', '.join(missing)}")
+        data = {field: cls._checkField(field, value) for field, value in record.items()}
+        if "total" not in data:
+            data["total"] = cls._checkField("total", sum(int(data[field]) for field in STAT_FIELDS[1:]))
+        return data
+
+    #is there already a pokemon with this name or number
+    def exists(self, name="", number=""):
+        return (name.strip().casefold() in self.__byName) or (number != "" and numberKey(number) in self.__byNumber)
+
+    #the pokemon with this name or National Number
+    def get(self, key):
+        p = self._find(key)
+        if p is None:
+            raise PokemonNotFoundError(f"{key} is not present in the pokedex")
+        return p
+
+    #every pokemon of a type in pokedex order
+    def find_by_type(self, typeVal):
+        return self._ofType(typeVal)
+
+    #pokemon with every one of the abilities (match="all") or at least one of them (match="any"), in pokedex order.
+    #"all" intersects starting from the rarest ability, so it costs about that ability's size and not the dex's
+    def find_by_ability(self, *abilities, match="all"):
+        if match not in ("all", "any"):
+            raise PokemonInputError(f"match has to be all or any, not {match}")
+        buckets = [self.__byAbility.get(a.strip().casefold(), {}) for a in abilities if a.strip()]
+        if not buckets:
+            return []
+        if match == "any":
+            rows = set().union(*buckets)
+        else:
+            buckets.sort(key=len)
+            rows = buckets[0].keys()
+            for bucket in buckets[1:]:
+                rows = rows & bucket.keys()
+        return [self.__get(row) for row in sorted(rows)]
+
+    #how many pokemon have each ability
+    def abilityCounts(self):
+        return {a: len(rows) for a, rows in self.__byAbility.items()}
+
+    #validates and adds a new pokemon, returns it
+    def add(self, record):
+        return self.__addChecked(self._checkRecord(record))
+
+    def __addChecked(self, data):
+        if self.exists(data["name"], data["number"]):
+            raise PokemonInputError(";-; This pokemon is already present in the pokedex!")
+        types = [t.lower() for t in data["types"]]
+        if "fire" in types:
+            newP = FireType(**data)
+        elif "grass" in types:
+            newP = GrassType(**data)
+        else:
+            newP = BasePokemon(**data)
+        self._insert(newP)
+        self._log({"op": "add", "data": data})
+        return newP
+
+    #removes the pokemon with this name or number, returns it
+    def remove(self, key):
+        p = self.get(key)
+        self._delete(p._row)
+        self._log({"op": "remove", "name": p.getName(), "number": p.getNumber()})
+        return p
+
+    #changes fields of a pokemon, everything is checked before anything is set. total is worked out again
+    #when a stat changes and no total is given. returns the pokemon
+    def update(self, key, **fields):
+        p = self.get(key)
+        data = {field: self._checkField(field, value) for field, value in fields.items()}
+        return self.__updateChecked(p, data)
+
+    def __updateChecked(self, p, data):
+        if "name" in data and data["name"].strip().casefold() != p.getName().casefold() and self.exists(name=data["name"]):
+            raise PokemonInputError(";-; This pokemon is already present in the pokedex!")
+        if "number" in data and numberKey(data["number"]) != numberKey(p.getNumber()) and self.exists(number=data["number"]):
+            raise PokemonInputError(";-; This pokemon is already present in the pokedex!")
+        before = self._fields(p)
+        #the new total is worked out and checked up front too, so nothing below can fail halfway on a bad value
+        if "total" not in data and any(field in STAT_COLUMN for field in data):
+            stats = (data.get(field, before[field]) for field in STAT_FIELDS[1:])
+            data = {**data, "total": self._checkField("total", sum(max(parseStat(v), 0) for v in stats))}
+        done = []
+        try:
+            for field, value in data.items():
+                getattr(p, FIELD_SETTERS[field])(value)
+                done.append(field)
+        except BaseException:
+            #a setter that still fails puts back whatever was already set, an update never half sticks
+            for field in reversed(done):
+                getattr(p, FIELD_SETTERS[field])(before[field])
+            raise
+        #journaling just the fields that changed
+        after = self._fields(p)
+        changed = {field: value for field, value in after.items() if before[field] != value}
+        if changed:
+            self._log({"op": "update", "name": before["name"], "number": before["number"], "fields": changed})
+        return p
+
+    #reads records for bulkImport from a .csv or .jsonl file, csv headers are the field names
+    #and types/abilities are written the way the menu takes them ("Fire/Flying", "Blaze, Solar Power")
+    @staticmethod
+    def readRecords(filename):
+        with open(filename, "r", encoding="utf-8", newline="") as f:
+            if filename.lower().endswith(".csv"):
+                for row in csv.DictReader(f):
+                    #a blank total is worked out from the stats
+                    yield {field: value for field, value in row.items() if not (field == "total" and not value)}
+            else:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    #adds or updates (matched by National Number) many pokemon at once. source is a .csv/.jsonl filename
+    #or any iterable of dicts. every record is checked first and nothing changes if one is bad,
+    #then the whole batch goes to disk in a single write. returns (added, updated)
+    def bulkImport(self, source):
+        records = self.readRecords(source) if isinstance(source, str) else source
+        checked = []
+        errors = []
+        for i, record in enumerate(records, 1):
+            try:
+                checked.append(self._checkRecord(record))
+            except PokemonInputError as e:
+                errors.append(f"record {i}: {e}")
+        if errors:
+            more = f" (and {len(errors) - 5} more)" if len(errors) > 5 else ""
+            raise PokemonInputError("Import failed, " + "; ".join(errors[:5]) + more)
+        added = updated = 0
+        with self.transaction():
+            for data in checked:
+                rows = self.__byNumber.get(numberKey(data["number"]))
+                if rows:
+                    self.__updateChecked(self.__get(rows[0]), data)
+                    updated += 1
+                else:
+                    self.__addChecked(data)
+                    added += 1
+        return added, updated
+
     def searchPokemon(self):
         #intital check to see if pokedex was even initialized properly
         if not self.__pokemons:
@@ -399,209 +2297,106 @@ class Pokedex():
             return
         
         pokemonNameNo = input("Enter name/number: ")
-        found_pokemon = False
-        
-        # Loop through all pokemons to find a match
-        for pokemon in self.__pokemons:
-            if pokemon.getName().lower() == pokemonNameNo.lower() or pokemon.getNumber() == pokemonNameNo:
-                # If found, display its stats
-                pokemon.displayStats()
-                found_pokemon = True
-                break      
+        try:
+            self.get(pokemonNameNo).displayStats()
         #if not found
-        if not found_pokemon:
+        except PokemonNotFoundError:
             print("ERROR: not present in the pokedex currently!!")
+            close = self.fuzzyFind(pokemonNameNo, limit=5)
+            if close:
+                print("Did you mean: " + ", ".join(p.getName() for _, p in close) + "?")
 
-    #regex checking for proper format of National Number, Height & Weight
-    @classmethod
-    def checkInput(cls,stat,val):
-        if stat=="National Number":
-            return re.match(r"^No\. \d{4}$",val)
-        if stat=="Height":
-            return re.match(r"^\d+\.\d m$",val)
-        if stat=="Weight":
-            return re.match(r"^\d+\.\d kg$",val)
+    #asks for one field and checks it straight away so the user hears about a mistake right when they make it
+    def __ask(self, field, prompt):
+        return self._checkField(field, input(prompt))
 
-    #method to add pokemon, after asking input from user and if confirmed its not in the list already, creates new pokemon. To add the data into
-    #the file as well it calls the save method
+    #method to add pokemon, after asking input from user and if confirmed its not in the list already, creates new pokemon
+    #through add() which also journals it
     def addPokemon(self):
         #surrounded by a try and except that catches value errors and if the stats entered in proper format according to regex it calls the custom error class
         try:
-            number=input("Number (No. xxxx): ")
-            if not Pokedex.checkInput("National Number",number):
-                raise PokemonInputError("The format for National Number is of format 'No. xxxx'!")
-            
+            number=self.__ask("number", "Number (No. xxxx): ")
             name=input("Name: ")
-            pokeExists=False
-            for p in self.__pokemons:
-                #checking if pokemon is already present in pokedex or not using name/number
-                if (p.getName().lower()==name.lower() or p.getNumber()==number):
-                        pokeExists=True
-                        break
-            if pokeExists:
+            #checking if pokemon is already present in pokedex or not using name/number
+            if self.exists(name, number):
                 print(";-; This pokemon is already present in the pokedex!") 
                 return
-            
-            types_input=input("Types (e.g. Fire or Grass (separate with /)): ").split("/")
-            types = [t.strip() for t in types_input if t.strip()]
-            if not (1 <= len(types) <= 2):
-                raise PokemonInputError("*-* Pokemon can only have 1 or 2 types.")
-            
-            species=input("Species: ")
-
-            height=input("Height (xxx.x m): ")
-            if not Pokedex.checkInput("Height",height):
-                raise PokemonInputError("Pokemon height must of format 'xxx.x m!'")
-            
-            weight=input("Weight (xxx.x kg): ")
-            if not Pokedex.checkInput("Weight",weight):
-                raise PokemonInputError("Pokemon weight must of format 'xxx.x kg!'")
-            
-            abilities_input=input("Moves: (separate with commas) 1–4): ").split(",")
-            abilities = [a.strip() for a in abilities_input if a.strip()]
-            if not (1 <= len(abilities) <= 4):
-                raise PokemonInputError("^_^ Pokemon can only have 1 to 4 moves!")
-            
-            hp=input("HP: ")
-            if not hp.isdigit():
-                raise PokemonInputError("HP must be a number!")
-            attack=input("Attack: ")
-            if not attack.isdigit():
-                raise PokemonInputError("Attack must be a number!")
-            defense=input("Defense: ")
-            if not defense.isdigit():
-                raise PokemonInputError("Defense must be a number!")
-            spA=input("Sp. Attack: ")
-            if not spA.isdigit():
-                raise PokemonInputError("sp. Atk must be a number!")
-            spD=input("Sp. Defense: ")
-            if not spD.isdigit():
-                raise PokemonInputError("sp. Def must be a number!")
-            speed=input("Speed: ")
-            if not speed.isdigit():
-                raise PokemonInputError("Speed must be a number!")
-            totalInt=(int(x) for x in [hp,attack,defense,spA,spD,speed])
-            totalSum=sum(totalInt)
-            total=str(totalSum)
-
-            # Create a dictionary of all the user-inputted data
-            pokemonData = {
-                "types": types, "number": number, "name": name, "total": total, "hp": hp,
-                "attack": attack, "defense": defense, "spAttack": spA, "spDefense": spD, "speed": speed,
-                "species": species, "height": height, "weight": weight, "abilities": abilities
-            }
-
-            newP = None
-            #check if the pokemon is fire or not
-            if "Fire" or "fire" in types:
-                newP = FireType(**pokemonData)
-            #if not fire checking if its grass
-            elif "Grass" or "grass" in types:
-                newP = GrassType(**pokemonData)
-            else:
-                #if not its just basepokemon, forwards the data to appropriate oarameters using **kwargs!
-                newP = BasePokemon(**pokemonData)
-            
-            #appends the new pokemon!
-            self.__pokemons.append(newP)
-            self.save()
+            record = {"number": number, "name": name}
+            record["types"]=self.__ask("types", "Types (e.g. Fire or Grass (separate with /)): ")
+            record["species"]=input("Species: ")
+            record["height"]=self.__ask("height", "Height (xxx.x m): ")
+            record["weight"]=self.__ask("weight", "Weight (xxx.x kg): ")
+            record["abilities"]=self.__ask("abilities", "Moves: (separate with commas) 1–4): ")
+            record["hp"]=self.__ask("hp", "HP: ")
+            record["attack"]=self.__ask("attack", "Attack: ")
+            record["defense"]=self.__ask("defense", "Defense: ")
+            record["spAttack"]=self.__ask("spAttack", "Sp. Attack: ")
+            record["spDefense"]=self.__ask("spDefense", "Sp. Defense: ")
+            record["speed"]=self.__ask("speed", "Speed: ")
+            self.add(record)
+            if self.__journal:
+                print(":] Changes saved to journal.")
             print(f":D Added {name}.")
         except PokemonInputError as e:
             print(":( ERROR:",e)
         except ValueError:
             print(":( ERROR: Stats like HP, Attack, etc., must be numbers.")
 
-    #method to remove pokemon, checks with either name or number, and if removed calls save function to update the file
+    #method to remove pokemon, checks with either name or number, remove() journals it
     def removePokemon(self):
         key=input("Enter name/number: ")
-        for p in self.__pokemons:
-            if p.getName().lower()==key.lower() or p.getNumber()==key:
-                self.__pokemons.remove(p)
-                print("$-$ Removed.")
-                self.save()
-                return
-        print("!-! Not found.")
+        try:
+            self.remove(key)
+        except PokemonNotFoundError:
+            print("!-! Not found.")
+            return
+        print("$-$ Removed.")
+        if self.__journal:
+            print(":] Changes saved to journal.")
     
-    #method to update pokemon data, first checks using name/number then if exists uses setter functions
+    #method to update pokemon data, first checks using name/number then collects the new values and hands them to update()
     def updatePokemon(self):
         key=input("Enter name/number: ")
-        pokeFound = None
-        for p in self.__pokemons:
-            if p.getName().lower()==key.lower() or p.getNumber()==key:
-                pokeFound = p
-                break
-        if not pokeFound:
+        try:
+            p = self.get(key)
+        except PokemonNotFoundError:
             print("\\~/ Not found.")
             return
-        p = pokeFound
+        fields = {}
         try:
             updateInput = input("Update Advanced Information (Number, Height, Weight)? (y/n): ").lower()
             if updateInput== 'y':
                 newNumber = input(f"Number [{p.getNumber()}]: ")
                 if newNumber:
-                    if not Pokedex.checkInput("National Number", newNumber):
-                        raise PokemonInputError("Invalid National Number format. Must be 'No. xxxx'.")
-                    p.setNumber(newNumber)
-
+                    fields["number"] = self._checkField("number", newNumber)
                 newHeight = input(f"Height [{p.getHeight()}]: ")
                 if newHeight:
-                    if not Pokedex.checkInput("Height", newHeight):
-                        raise PokemonInputError("Invalid Height format. Must be 'x.x m'.")
-                    p.setHeight(newHeight)
-                
+                    fields["height"] = self._checkField("height", newHeight)
                 newWeight = input(f"Weight [{p.getWeight()}]: ")
                 if newWeight:
-                    if not Pokedex.checkInput("Weight", newWeight):
-                        raise PokemonInputError("Invalid Weight format. Must be 'x.x kg'.")
-                    p.setWeight(newWeight)
+                    fields["weight"] = self._checkField("weight", newWeight)
 
             newAbility=input(f"Moves [{', '.join(p.getAbilities())}]: ")
             if newAbility:
-                ab=[a.strip() for a in newAbility.split(",") if a.strip()]
                 try: 
-                    p.setAbilities(ab)
+                    fields["abilities"] = self._checkField("abilities", newAbility)
                 except PokemonInputError as e: 
                     print("Moves not updated:",e)
             
             userUpdate=input("Do you want to update pokemon Stats (HP, Atk, etc.)? (y/n): ")
             if userUpdate.lower()=="y":
-                newHP=input(f"Enter new HP [{p.getHP()}]: ") or p.getHP()
-                if not newHP.isdigit(): 
-                    raise PokemonInputError("HP must be a number!")
-                p.setHP(newHP)
-
-                newAtk=input(f"Enter new Attack [{p.getAttack()}]: ") or p.getAttack()
-                if not newAtk.isdigit(): 
-                    raise PokemonInputError("Attack must be a number!")
-                p.setAttack(newAtk)
-
-                newDef=input(f"Enter new Defense [{p.getDefense()}]: ") or p.getDefense()
-                if not newDef.isdigit(): 
-                    raise PokemonInputError("Defense must be a number!")
-                p.setDefense(newDef)
-
-                newSpAtk=input(f"Enter new Sp. Atk [{p.getSpAttack()}]: ") or p.getSpAttack()
-                if not newSpAtk.isdigit(): 
-                    raise PokemonInputError("Sp. Atk must be a number!")
-                p.setSpAttack(newSpAtk)
-
-                newSpDef=input(f"Enter new Sp. Def [{p.getSpDefense()}]: ") or p.getSpDefense()
-                if not newSpDef.isdigit(): 
-                    raise PokemonInputError("Sp. Def must be a number!")
-                p.setSpDefense(newSpDef)
-
-                newSpeed=input(f"Enter new speed [{p.getSpeed()}]: ") or p.getSpeed()
-                if not newSpeed.isdigit(): 
-                    raise PokemonInputError("Speed must be a number!")
-                p.setSpeed(newSpeed)
-
-                # calculating total stats
-                newTotal=int(newHP)+int(newAtk)+int(newDef)+int(newSpAtk)+int(newSpDef)+int(newSpeed)
-                p.setTotal(str(newTotal))
+                #blank keeps the current value, update() works the total out again
+                fields["hp"]=self._checkField("hp", input(f"Enter new HP [{p.getHP()}]: ") or p.getHP())
+                fields["attack"]=self._checkField("attack", input(f"Enter new Attack [{p.getAttack()}]: ") or p.getAttack())
+                fields["defense"]=self._checkField("defense", input(f"Enter new Defense [{p.getDefense()}]: ") or p.getDefense())
+                fields["spAttack"]=self._checkField("spAttack", input(f"Enter new Sp. Atk [{p.getSpAttack()}]: ") or p.getSpAttack())
+                fields["spDefense"]=self._checkField("spDefense", input(f"Enter new Sp. Def [{p.getSpDefense()}]: ") or p.getSpDefense())
+                fields["speed"]=self._checkField("speed", input(f"Enter new speed [{p.getSpeed()}]: ") or p.getSpeed())
             
+            self.update(key, **fields)
             print(" Updated.")
-            #calling save to update the data in files!
-            self.save()
+            if self.__journal:
+                print(":] Changes saved to journal.")
         except PokemonInputError as e:
             print(f"Update failed: {e}")
         except ValueError:
@@ -610,21 +2405,68 @@ class Pokedex():
     #searching the pokemon data by type
     def searchByType(self):
         typeVal = input("Enter type: ").lower()
-        # Create an empty list to store the results
-        found = []
-        for pokemon in self.__pokemons:
-            for t in pokemon.getTypes():
-                if t.lower() == typeVal:
-                    found.append(pokemon)
-                    break
+        found = self.find_by_type(typeVal)
         if not found:
             print("/-\\ No matches.")
             return
         for poke in found:
             poke.displayStats()
 
+    #asks for abilities separated by commas and whether a pokemon needs all of them or just one
+    def searchByAbility(self):
+        abilities = splitAbilities(input("Enter abilities separated by commas: "))
+        match = "all"
+        if len(abilities) > 1:
+            match = input("Match all of them or any of them? (all/any): ").strip().lower() or "all"
+        found = self.find_by_ability(*abilities, match=match)
+        if not found:
+            print("/-\\ No matches.")
+            return
+        for poke in found:
+            poke.displayStats()
+
+    #asks for ranges like "speed=100.., total=500..600" and shows every pokemon that fits all of them
+    def searchByStats(self):
+        statNames = {field.casefold(): field for field in STAT_FIELDS}
+        ranges = {}
+        for part in input("Enter stat ranges (e.g. speed=100.., total=500..600, hp=..80): ").split(","):
+            if not part.strip():
+                continue
+            field, sep, bounds = part.partition("=")
+            if not sep:
+                raise PokemonInputError(f"{part.strip()} should look like stat=low..high")
+            ranges[statNames.get(field.strip().casefold(), field.strip())] = parseBounds(bounds)
+        order = input("Order by stat (blank for pokedex order): ").strip()
+        order = statNames.get(order.casefold(), order) or None
+        found = self.query(order=order, descending=True, **ranges)
+        if not found:
+            print("/-\\ No matches.")
+            return
+        for poke in found:
+            poke.displayStats()
+
+    #asks for a pokemon and lists the ones whose stat spread is closest to it, optionally only of one type
+    def searchSimilar(self):
+        p = self._lookup(input("Enter the pokemon to find similar ones to: ").strip())
+        if p is None:
+            print("Pokemon wasn't present in the list of pokemons!")
+            return
+        typeVal = input("Only of type (blank for any): ").strip() or None
+        metric = input("Compare by euclidean or cosine distance? (blank for euclidean): ").strip().lower() or "euclidean"
+        found = self.similar(p.getName(), metric=metric, typeVal=typeVal)
+        if not found:
+            print("/-\\ No matches.")
+            return
+        for distance, poke in found:
+            print(f"{distance:8.3f}  {poke.getName()} ({'/'.join(poke.getTypes())})")
+
     #the run function starts the menu with all the options, the options are in a dictionary, if an option thats not in it is picked it says invalid
     def run(self):
+        #tab completes pokemon names at any prompt where readline is available
+        if readline is not None:
+            readline.set_completer_delims("")
+            readline.set_completer(self.__completeName)
+            readline.parse_and_bind("tab: complete")
         while self.__running:
             try:
                 print("""
@@ -637,11 +2479,14 @@ class Pokedex():
             5.Search for pokemon by type
             6.Update pokemon stats
             7.Visualize Pokedex Data
+            8.Search by stat ranges
+            9.Search by ability
+            10.Find pokemon with similar stats
             exit or X to exit the system!
                       """)
                 choice=input()
                 if choice.lower().strip()=="exit" or choice.lower().strip()=="x":
-                    self.save(); print(" %^^% Thank you for using the pokedex system today!")
+                    self.compact(); print(" %^^% Thank you for using the pokedex system today!")
                     self.__running=False
                 elif choice in self.__choices:
                     self.__choices[choice]()
@@ -658,6 +2503,7 @@ class Pokedex():
         1. Bar chart (single Pokemon)
         2. Line chart (compare two Pokemon)
         3. Pie chart (type distribution)
+        4. Save a bar chart of every Pokemon
         q/Q. Exit!
         """)
         ch = input("Choice: ").strip()
@@ -669,32 +2515,141 @@ class Pokedex():
             self.lineGraph()
         elif ch == "3":
             self.pieChart()
+        elif ch == "4":
+            directory = input("Folder to save the charts in: ").strip() or "charts"
+            fmt = input("png or svg? (blank for png): ").strip().lower() or "png"
+            files = self.renderBarCharts(directory, fmt)
+            print(f"|-| Saved {len(files)} charts to {directory}")
         else:
             print("Invalid choice.")    
 
+    #what a bar chart of a row shows: name, its six stats and the average of its first type to compare against.
+    #saved cards leave the average out (average=False), it moves with every edit to any pokemon of that type and
+    #would make each such edit redraw the whole types cards instead of coming out of the chart cache
+    def __barArgs(self, row, average=True):
+        name, _, types, _ = self.__keyFields(row)
+        vals = [max(v, 0) for v in self.__stats.rowValues(row)[1:]]
+        agg = self.typeTotals(types[0]) if types and average else None
+        if not agg:
+            return name, vals
+        return name, vals, [agg["stats"][field].get("mean",0) for field in STAT_FIELDS[1:]], f"{types[0]} average"
+
+    #values and labels for the type pie, None when theres nothing to draw.
+    #fire wins over grass for a fire/grass pokemon so only grass pokemon that arent fire count as grass
+    def _pieArgs(self):
+        totals = self.__typeTotals()
+        counts = totals.counts()
+        fireCount = counts.get("fire", 0)
+        grassCount = counts.get("grass", 0) - totals.both("fire", "grass")
+        others = len(self.__pokemons) - fireCount - grassCount
+        total = fireCount + grassCount + others
+        if total == 0:
+            return None
+        labels = []
+        values = []
+        if fireCount > 0:
+            labels.append("Fire")
+            values.append(fireCount)
+        if grassCount > 0:
+            labels.append("Grass")
+            values.append(grassCount)
+        if others > 0:
+            labels.append("Other")
+            values.append(others)
+        return values, labels
+
+    #saves a chart to filename (png or svg, going by the extension) without opening a window.
+    #kind is "bar" for one pokemon, "line" to compare two or "pie" for the type split which takes no keys
+    def saveChart(self, kind, filename, *keys):
+        if kind == "bar" and len(keys) == 1:
+            args = self.__barArgs(self.get(keys[0])._row, average=False)
+        elif kind == "line" and len(keys) == 2:
+            p1, p2 = self.get(keys[0]), self.get(keys[1])
+            args = self._chartStats(p1), self._chartStats(p2), p1.getName(), p2.getName()
+        elif kind == "pie" and not keys:
+            args = self._pieArgs()
+            if args is None:
+                raise PokemonInputError("no Types present -_-")
+        else:
+            raise PokemonInputError(f"a {kind} chart cant be drawn for {len(keys)} pokemon")
+        return self.__renderCached(kind, filename, args)
+
+    def __charts(self):
+        if self.__chartCache is None and self.chartCacheDir:
+            self.__chartCache = ChartCache(self.chartCacheDir, self.chartCacheBytes)
+        return self.__chartCache
+
+    #renderChart, but a chart thats already been drawn with the same numbers is copied out of the cache instead
+    def __renderCached(self, kind, filename, args):
+        cache = self.__charts()
+        if cache is None:
+            return renderChart(kind, filename, *args)
+        name = ChartCache.name(kind, chartFormat(filename), args)
+        if not cache.fetch(name, filename):
+            renderChart(kind, filename, *args)
+            cache.store(name, filename)
+        return filename
+
+    #what the chart cache holds and how well its doing, None with caching off
+    def chartCacheStats(self):
+        cache = self.__charts()
+        return cache.stats() if cache is not None else None
+
+    #a bar chart card for every pokemon in the dex, saved into directory as <number>_<name>.<fmt>. cards whose numbers
+    #havent changed since they were last drawn come out of the chart cache, the rest are drawn across a process
+    #pool where each worker only gets the numbers for its charts and not the dex.
+    #processes=1 draws them here instead, returns the file names in pokedex order
+    def renderBarCharts(self, directory, fmt="png", processes=None, chunksize=32):
+        if fmt not in CHART_FORMATS:
+            raise PokemonInputError(f"charts can be saved as {' or '.join(CHART_FORMATS)}, not {fmt}")
+        os.makedirs(directory, exist_ok=True)
+        cache = self.__charts()
+        filenames = []
+        tasks = []
+        names = []
+        #a loaded file can still hold two pokemon with the same number, the second one gets a suffix.
+        #compared casefolded since windows and macos dont tell Foo.png and foo.png apart
+        taken = set()
+        for row in self.__pokemons:
+            args = self.__barArgs(row, average=False)
+            base = stem = chartFileName(args[0], self.__keyFields(row)[1])
+            n = 2
+            while stem.casefold() in taken:
+                stem = f"{base}_{n}"
+                n += 1
+            taken.add(stem.casefold())
+            filename = os.path.join(directory, f"{stem}.{fmt}")
+            filenames.append(filename)
+            name = ChartCache.name("bar", fmt, args) if cache is not None else None
+            if name is None or not cache.fetch(name, filename):
+                tasks.append(("bar", filename, *args))
+                names.append(name)
+        if processes == 1 or len(tasks) <= 1:
+            drawn = map(renderChartTask, tasks)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                drawn = list(pool.map(renderChartTask, tasks, chunksize=chunksize))
+        for name, filename in zip(names, drawn):
+            if name is not None:
+                cache.store(name, filename)
+        return filenames
+
     #method to display the statistics of a single pokemon using bar graphs
     def barGraph(self):
         try:
             pokeName=input("Enter pokemon's name to visualize its statistics! : ").strip().lower()
             if not pokeName.isalpha():
                 raise ValueError("Invalid pokemon name")
-            pokeFound=False
-            for poke in self.__pokemons:
-                if poke.getName().lower()==pokeName:
-                    newPoke=poke
-                    pokeFound=True
-            if pokeFound==False:
-                return("Pokemon wasn't present in the list of pokemons!")
+            newPoke=self._lookup(pokeName)
+            if newPoke is None:
+                print("Pokemon wasn't present in the list of pokemons!")
+                return
         except ValueError as e:
             print("Error"+str(e))
-        
-        pokeStats=newPoke.to_dict()
-        labels=["hp","Attack","defense","spAttack","spDefense","Speed"]
-        vals=[pokeStats["hp"],pokeStats["attack"],pokeStats["defense"],pokeStats["spAttack"],pokeStats["spDefense"],pokeStats["speed"]]
-        plt.bar(labels,vals)
-        plt.title("Pokemon Stats!")
-        plt.xlabel("Statistics")
-        plt.show()
+            return
+
+        showChart("bar", *self.__barArgs(newPoke._row))
 
     #method to display the stats of 2 pokemon and how they compare using line graphs with diff colours
     def lineGraph(self):
@@ -704,69 +2659,29 @@ class Pokedex():
 
             if not (pokeName1.isalpha() and pokeName2.isalpha()):
                 raise ValueError("Invalid pokemon name")
-            pokeFound=False
-            for poke in self.__pokemons:
-                if poke.getName().lower()==pokeName1:
-                    newPoke1=poke
-                elif poke.getName().lower()==pokeName2:
-                    newPoke2=poke
-                    pokeFound=True
-            if pokeFound==False:
+            newPoke1=self._lookup(pokeName1)
+            newPoke2=self._lookup(pokeName2)
+            if newPoke1 is None or newPoke2 is None:
                 print("Pokemon wasn't present in the list of pokemons!")
                 return
         except ValueError as e:
             print("Error"+str(e))
             return 
         
-        pokeStats1=newPoke1.to_dict()
-        pokeStats2=newPoke2.to_dict()
-        labels=["hp","Attack","defense","spAttack","spDefense","Speed"]
-        vals1=[pokeStats1["hp"],pokeStats1["attack"],pokeStats1["defense"],pokeStats1["spAttack"],pokeStats1["spDefense"],pokeStats1["speed"]]
-        vals2=[pokeStats2["hp"],pokeStats2["attack"],pokeStats2["defense"],pokeStats2["spAttack"],pokeStats2["spDefense"],pokeStats2["speed"]]
-        plt.plot(labels,vals1,'b',marker='o',label='pokemon1')
-        plt.plot(labels,vals2,'r',marker='o', label='pokemon2')
-        plt.xlabel("statistics")
-        plt.ylabel("values")
-        plt.legend()
-        plt.show()
+        showChart("line", self._chartStats(newPoke1), self._chartStats(newPoke2))
 
     #the method to display percentage of types using a pie chart!
     def pieChart(self):
-        fireCount = 0
-        grassCount = 0
-        others = 0
-
-        for p in self.__pokemons:
-            types = [t.lower() for t in p.getTypes()]
-            if "fire" in types:
-                fireCount += 1
-            elif "grass" in types:
-                grassCount += 1
-            else:
-                others += 1
-        total = fireCount + grassCount + others
-        if total == 0:
+        args = self._pieArgs()
+        if args is None:
             print("no Types present -_-")
             return
-        labels = []
-        values = []
-        if fireCount > 0:
-            labels.append("Fire")
-            values.append(fireCount)
-        if grassCount > 0:
-            labels.append("Grass")
-            values.append(grassCount)
-        if others > 0:
-            labels.append("Other")
-            values.append(others)
-        plt.pie(values, labels=labels, shadow=True)
-        plt.title("Type-Pie")
-        plt.legend()
-        plt.show()
+        showChart("pie", *args)
 
 
 if __name__=="__main__":
-    pokedex=Pokedex()
+    #optionally a dex file, or a directory / glob of shards to merge
+    pokedex=Pokedex(sys.argv[1] if len(sys.argv) > 1 else None)
     pokedex.run()
 
 
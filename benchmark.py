@@ -0,0 +1,257 @@
+"""
+Benchmark suite for the Pokedex engines in A2.py and A3.py.
+
+It writes synthetic dex files in exactly the formats the classes produce themselves (to_file_format for
+pokemon.txt, to_dict for pokemon.json) and then times load, save, name/number search, searchByType,
+exportTypeReport and chart data preparation. Every (variant, size) case runs in its own interpreter so
+timings and peak memory dont leak between cases.
+
+    python benchmark.py run --sizes 1000 10000 100000 --variants A2 A3 A3-lazy
+    python benchmark.py generate --count 1000000 --format json --out pokemon.json
+    python benchmark.py importtime --modules A2 A3 --budget 300
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+TYPES = ["Normal", "Fire", "Water", "Grass", "Electric", "Ice", "Fighting", "Poison", "Ground",
+         "Flying", "Psychic", "Bug", "Rock", "Ghost", "Dragon", "Dark", "Steel", "Fairy"]
+ABILITIES = ["Blaze", "Overgrow", "Torrent", "Static", "Levitate", "Intimidate", "Chlorophyll",
+             "Flash Fire", "Swift Swim", "Sturdy", "Keen Eye", "Run Away", "Synchronize", "Pressure"]
+SPECIES = ["Lizard", "Seed", "Tiny Turtle", "Mouse", "Fox", "Weed", "Bat", "Balloon", "Flame", "Sprout"]
+VARIANTS = ("A2", "A3", "A3-lazy")
+
+
+#one made up pokemon as constructor arguments, A2 writes bare numbers and A3 writes "No. xxxx"
+def syntheticRecord(i, rng, variant="A3"):
+    stats = [rng.randint(1, 255) for _ in range(6)]
+    types = rng.sample(TYPES, rng.choice((1, 1, 2)))
+    return {
+        "types": types,
+        "number": f"{i:04d}" if variant == "A2" else f"No. {i:04d}",
+        "name": f"Synth{i}",
+        "total": str(sum(stats)),
+        "hp": str(stats[0]), "attack": str(stats[1]), "defense": str(stats[2]),
+        "spAttack": str(stats[3]), "spDefense": str(stats[4]), "speed": str(stats[5]),
+        "species": f"{rng.choice(SPECIES)} Pokemon",
+        "height": f"{rng.randint(1, 200) / 10:.1f} m",
+        "weight": f"{rng.randint(1, 9999) / 10:.1f} kg",
+        "abilities": rng.sample(ABILITIES, rng.randint(1, 4)),
+    }
+
+
+#writes count synthetic pokemon to path as txt (A2 or A3 flavour) or json, going through the real classes
+#so the files are byte for byte what the program itself would save
+def generate(path, count, fmt="txt", variant="A3", seed=0):
+    rng = random.Random(seed)
+    module = __import__("A2" if variant == "A2" else "A3")
+    records = (module.BasePokemon(**syntheticRecord(i, rng, variant)) for i in range(1, count + 1))
+    with open(path, "w", encoding="utf-8") as f:
+        if fmt == "json":
+            module.writeJson(f, (p.to_dict() for p in records), indent=module.Pokedex.jsonIndent)
+            return
+        first = True
+        for p in records:
+            if not first:
+                f.write("\n\n")
+            f.write(p.to_file_format())
+            first = False
+        #A3 ends the file with a newline, A2 doesnt
+        if variant != "A2" and not first:
+            f.write("\n")
+
+
+#best wall time over repeat runs of fn
+def timed(fn, repeat=1):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        took = time.perf_counter() - start
+        best = took if best is None else min(best, took)
+    return best
+
+
+#runs every benchmark for one variant and size inside workdir, returns rows of (operation, calls, seconds)
+def runCase(variant, count, workdir, lookups=1000, repeat=1, seed=0):
+    module = __import__("A2" if variant == "A2" else "A3")
+    lazy = variant == "A3-lazy"
+    os.chdir(workdir)
+    quiet = contextlib.redirect_stdout(io.StringIO())
+    rows = []
+    generate("pokemon.txt", count, "txt", "A2" if variant == "A2" else "A3", seed)
+
+    def load():
+        with quiet:
+            return module.Pokedex("pokemon.txt") if variant == "A2" else module.Pokedex("pokemon.txt", lazy=lazy)
+
+    rows.append(("load txt", 1, timed(load, repeat)))
+    if variant != "A2":
+        generate("pokemon.json", count, "json", "A3", seed)
+        rows.append(("load json", 1, timed(load, repeat)))
+    dex = load()
+
+    def save():
+        with quiet:
+            dex.save()
+    rows.append(("save", 1, timed(save, repeat)))
+    #A3's save also wrote the binary snapshot, which load() now prefers
+    if variant != "A2":
+        rows.append(("load snapshot", 1, timed(load, repeat)))
+
+    rng = random.Random(seed + 1)
+    picks = [rng.randint(1, count) for _ in range(lookups)]
+    names = [f"synth{i}" for i in picks]
+    numbers = [str(i) for i in picks]
+    rows.append(("find by name", lookups, timed(lambda: [dex._find(n) for n in names], repeat)))
+    rows.append(("find by number", lookups, timed(lambda: [dex._find(n) for n in numbers], repeat)))
+    rows.append(("searchByType", len(TYPES), timed(lambda: [dex._ofType(t) for t in TYPES], repeat)))
+
+    if variant == "A2":
+        def export():
+            with quiet:
+                for t in TYPES:
+                    dex.exportTypeReport(t)
+        rows.append(("exportTypeReport", len(TYPES), timed(export, repeat)))
+    else:
+        found = [dex._find(n) for n in names]
+        rows.append(("bar chart data", lookups, timed(lambda: [dex._chartStats(p) for p in found], repeat)))
+        #the first call counts the running type totals, later ones just read them
+        rows.append(("pie chart data (first)", 1, timed(dex._pieArgs)))
+        rows.append(("pie chart data", 1, timed(dex._pieArgs, repeat)))
+        rows.append(("stat column mean", len(module.STAT_FIELDS),
+                     timed(lambda: [dex.statColumn(f).mean() for f in module.STAT_FIELDS], repeat)))
+    return rows
+
+
+#how long importing module takes in a fresh interpreter, from python -X importtime. returns the best of repeat
+#runs as (total ms, [(ms, name), ...] for everything it imports directly, heaviest first)
+def importTime(module, repeat=5):
+    best = None
+    for _ in range(repeat):
+        err = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True,
+                             text=True, cwd=HERE, check=True).stderr
+        total = None
+        direct = []
+        for line in err.splitlines():
+            parts = line.split("|")
+            if len(parts) != 3 or not parts[1].strip().isdigit():
+                continue
+            ms = int(parts[1]) / 1000
+            #nesting is shown by indenting the name two spaces a level
+            depth = (len(parts[2]) - len(parts[2].lstrip()) - 1) // 2
+            if depth == 0 and parts[2].strip() == module:
+                total = ms
+            elif depth == 1:
+                direct.append((ms, parts[2].strip()))
+        if best is None or total < best[0]:
+            best = (total, sorted(direct, reverse=True))
+    return best
+
+#peak resident memory of this process in MB, None where the platform cant tell us
+def peakMemory():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    #linux reports KB, macOS bytes
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def printReport(results):
+    print(f"{'variant':<8} {'records':>10}  {'operation':<18} {'calls':>6} {'total s':>10} {'per call us':>12}")
+    for case in results:
+        for op, calls, seconds in case["rows"]:
+            print(f"{case['variant']:<8} {case['count']:>10}  {op:<18} {calls:>6} {seconds:>10.4f} "
+                  f"{seconds / calls * 1e6:>12.1f}")
+        if case.get("peakMB") is not None:
+            print(f"{case['variant']:<8} {case['count']:>10}  {'peak RSS MB':<18} {'':>6} {case['peakMB']:>10.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pokedex benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="write a synthetic dex file")
+    gen.add_argument("--count", type=int, required=True)
+    gen.add_argument("--format", choices=("txt", "json"), default="txt")
+    gen.add_argument("--variant", choices=("A2", "A3"), default="A3")
+    gen.add_argument("--out", required=True)
+    gen.add_argument("--seed", type=int, default=0)
+
+    run = sub.add_parser("run", help="run the benchmarks and print a report")
+    run.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    run.add_argument("--variants", nargs="+", choices=VARIANTS, default=list(VARIANTS))
+    run.add_argument("--lookups", type=int, default=1000)
+    run.add_argument("--repeat", type=int, default=1)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--json", help="also write the raw results here")
+
+    case = sub.add_parser("case", help=argparse.SUPPRESS)
+    case.add_argument("--variant", choices=VARIANTS, required=True)
+    case.add_argument("--count", type=int, required=True)
+    case.add_argument("--lookups", type=int, default=1000)
+    case.add_argument("--repeat", type=int, default=1)
+    case.add_argument("--seed", type=int, default=0)
+
+    imports = sub.add_parser("importtime", help="check how long importing the modules takes")
+    imports.add_argument("--modules", nargs="+", default=["A2", "A3"])
+    imports.add_argument("--budget", type=float, default=300, help="ms each module may take, fails above it")
+    imports.add_argument("--repeat", type=int, default=5)
+
+    args = parser.parse_args(argv)
+    if args.command == "generate":
+        #A2 only has the txt format, it never reads or writes pokemon.json
+        if args.format == "json" and args.variant == "A2":
+            gen.error("--format json needs --variant A3, A2 has no json format")
+        generate(args.out, args.count, args.format, args.variant, args.seed)
+        return
+    if args.command == "importtime":
+        over = []
+        for module in args.modules:
+            total, direct = importTime(module, args.repeat)
+            print(f"{module:<8} {total:>8.1f} ms  (budget {args.budget:g} ms)")
+            for ms, name in direct[:5]:
+                print(f"{'':<8} {ms:>8.1f} ms  {name}")
+            if total > args.budget:
+                over.append(module)
+        if over:
+            sys.exit(f"over the import time budget: {', '.join(over)}")
+        return
+    if args.command == "case":
+        with tempfile.TemporaryDirectory() as workdir:
+            rows = runCase(args.variant, args.count, workdir, args.lookups, args.repeat, args.seed)
+            os.chdir(HERE)
+        print(json.dumps({"variant": args.variant, "count": args.count, "rows": rows, "peakMB": peakMemory()}))
+        return
+
+    results = []
+    env = dict(os.environ, MPLBACKEND="Agg")
+    for count in args.sizes:
+        for variant in args.variants:
+            cmd = [sys.executable, os.path.abspath(__file__), "case", "--variant", variant, "--count", str(count),
+                   "--lookups", str(args.lookups), "--repeat", str(args.repeat), "--seed", str(args.seed)]
+            out = subprocess.run(cmd, capture_output=True, text=True, env=env, check=True).stdout
+            results.append(json.loads(out.strip().splitlines()[-1]))
+    printReport(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""
+HTTP/JSON service for the A3 Pokedex, standard library only.
+
+The dex is loaded once and every read is answered straight from its in-memory indexes on the event loop.
+Writes are queued to a single writer task and applied one at a time, so a request never sees half an edit
+and the journal is only ever appended by one writer.
+
+    python server.py serve --port 8080 [pokemon.txt | shard dir] [--lazy]
+    python server.py loadtest --port 8080 --concurrency 50 --requests 20000
+
+    GET    /pokemon/<name or number>      one pokemon
+    GET    /names?limit=                  names in pokedex order
+    GET    /fuzzy/<name>?distance=&limit= closest names to a misspelt one
+    GET    /similar/<name>?metric=cosine&type=&limit=   pokemon with the closest stat spread
+    GET    /complete?prefix=&field=species&limit=   names (or species) starting with prefix
+    GET    /types                         how many pokemon carry each type
+    GET    /types/<type>?limit=           pokemon of a type
+    GET    /abilities                     how many pokemon have each ability
+    GET    /abilities/<a>,<b>?match=any   pokemon with all (or any) of the abilities
+    GET    /stats/<stat>                  count, mean, min and max of a stat
+    GET    /top/<stat>?limit=&order=asc   pokemon ordered by a stat, highest first by default
+    GET    /query?speed=100..&total=500..600&order=&desc=1&limit=   pokemon inside every stat range
+    POST   /pokemon                       add, the body is a record like bulkImport takes
+    PATCH  /pokemon/<name or number>      update, the body holds the fields to change
+    DELETE /pokemon/<name or number>      remove
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from A3 import MISSING_STAT, STAT_FIELDS, Pokedex, PokemonInputError, PokemonNotFoundError, parseBounds
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error"}
+
+
+class DexService:
+    def __init__(self, dex):
+        self.__dex = dex
+        self.__writes = asyncio.Queue()
+        self.__writer = None
+
+    #the single task that applies queued edits, one at a time and in arrival order
+    async def __applyWrites(self):
+        while True:
+            op, args, done = await self.__writes.get()
+            try:
+                done.set_result(self.__call(op, *args))
+            except Exception as e:
+                #a broken edit fails its own request, the writer keeps going
+                done.set_result((500, {"error": str(e)}))
+            finally:
+                self.__writes.task_done()
+
+    #runs one dex call and turns what it returns, or the error it raises, into (status, body)
+    def __call(self, fn, *args):
+        try:
+            return 200, fn(*args)
+        except PokemonNotFoundError as e:
+            return 404, {"error": str(e)}
+        except PokemonInputError as e:
+            return 400, {"error": str(e)}
+        except (KeyError, ValueError, TypeError) as e:
+            return 400, {"error": str(e)}
+
+    async def __write(self, fn, *args):
+        done = asyncio.get_running_loop().create_future()
+        await self.__writes.put((fn, args, done))
+        return await done
+
+    def __add(self, record):
+        return self.__dex.add(record).to_dict()
+
+    def __update(self, key, fields):
+        return self.__dex.update(key, **fields).to_dict()
+
+    def __remove(self, key):
+        return self.__dex.remove(key).to_dict()
+
+    def __statSummary(self, field):
+        col = self.__dex.statColumn(field)
+        col = col[col != MISSING_STAT]
+        if not len(col):
+            return {"stat": field, "count": 0}
+        return {"stat": field, "count": int(len(col)), "mean": float(col.mean()),
+                "min": int(col.min()), "max": int(col.max())}
+
+    def __top(self, field, limit, ascending):
+        return [p.to_dict() for p in self.__dex.query(order=field, descending=not ascending, limit=limit)]
+
+    def __fuzzy(self, name, distance, limit):
+        found = self.__dex.fuzzyFind(name, None if distance is None else int(distance), limit)
+        return [{"distance": d, **p.to_dict()} for d, p in found]
+
+    def __similar(self, key, metric, typeVal, limit):
+        found = self.__dex.similar(key, limit, metric, typeVal)
+        return [{"distance": d, **p.to_dict()} for d, p in found]
+
+    #?speed=100..&total=500..600&order=speed&desc=1&limit=20, the ranges use parseBounds' syntax
+    def __query(self, query, limit):
+        ranges = {field: parseBounds(value) for field, value in query.items() if field in STAT_FIELDS}
+        found = self.__dex.query(order=query.get("order"), descending=query.get("desc") == "1", limit=limit, **ranges)
+        return [p.to_dict() for p in found]
+
+    #routes one request, returns (status, body)
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip("/").split("/")]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            limit = int(query["limit"]) if "limit" in query else None
+        except ValueError:
+            return 400, {"error": "limit has to be a number"}
+        dex = self.__dex
+        route = parts[0]
+
+        if route == "pokemon" and len(parts) == 2:
+            if method == "GET":
+                return self.__call(lambda key: dex.get(key).to_dict(), parts[1])
+            if method == "PATCH":
+                fields = self.__body(body)
+                if not isinstance(fields, dict):
+                    return 400, {"error": "the body has to be a JSON object"}
+                return await self.__write(self.__update, parts[1], fields)
+            if method == "DELETE":
+                return await self.__write(self.__remove, parts[1])
+            return 405, {"error": f"{method} not allowed here"}
+        if route == "pokemon" and len(parts) == 1:
+            if method != "POST":
+                return 405, {"error": f"{method} not allowed here"}
+            record = self.__body(body)
+            if not isinstance(record, dict):
+                return 400, {"error": "the body has to be a JSON object"}
+            status, payload = await self.__write(self.__add, record)
+            return (201 if status == 200 else status), payload
+        if method != "GET":
+            return 405, {"error": f"{method} not allowed here"}
+        if route == "names" and len(parts) == 1:
+            return 200, [name for name, _ in zip(dex.names(), range(limit if limit is not None else len(dex)))]
+        if route == "types" and len(parts) == 1:
+            return 200, dex.typeCounts()
+        if route == "types" and len(parts) == 2:
+            return 200, [p.to_dict() for p in dex.find_by_type(parts[1])[:limit]]
+        if route == "stats" and len(parts) == 2:
+            if parts[1] not in STAT_FIELDS:
+                return 404, {"error": f"unknown stat {parts[1]}"}
+            return 200, self.__statSummary(parts[1])
+        if route == "abilities" and len(parts) == 1:
+            return 200, dex.abilityCounts()
+        if route == "abilities" and len(parts) == 2:
+            return self.__call(lambda names, match: [p.to_dict() for p in dex.find_by_ability(*names, match=match)][:limit],
+                               parts[1].split(","), query.get("match", "all"))
+        if route == "complete" and len(parts) == 1:
+            return self.__call(dex.autocomplete, query.get("prefix", ""), query.get("field", "name"),
+                               limit if limit is not None else 10)
+        if route == "fuzzy" and len(parts) == 2:
+            return self.__call(self.__fuzzy, parts[1], query.get("distance"), limit if limit is not None else 10)
+        if route == "similar" and len(parts) == 2:
+            return self.__call(self.__similar, parts[1], query.get("metric", "euclidean"), query.get("type"),
+                               limit if limit is not None else 10)
+        if route == "query" and len(parts) == 1:
+            return self.__call(self.__query, query, limit)
+        if route == "top" and len(parts) == 2:
+            return self.__call(self.__top, parts[1], limit if limit is not None else 10, query.get("order") == "asc")
+        return 404, {"error": f"no route for {url.path}"}
+
+    @staticmethod
+    def __body(body):
+        try:
+            return json.loads(body) if body else None
+        except json.JSONDecodeError:
+            return None
+
+    #one client connection, requests on it are answered in order until it closes (keep-alive)
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                method, target, version = line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = header.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0) or 0))
+                try:
+                    status, payload = await self.dispatch(method.upper(), target, body)
+                except Exception as e:
+                    status, payload = 500, {"error": str(e)}
+                data = json.dumps(payload).encode("utf-8")
+                keepAlive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write(f"{version} {status} {REASONS.get(status, '')}\r\n"
+                             f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                             f"Connection: {'keep-alive' if keepAlive else 'close'}\r\n\r\n".encode("latin-1") + data)
+                await writer.drain()
+                if not keepAlive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8080):
+        self.__writer = asyncio.create_task(self.__applyWrites())
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Serving {len(self.__dex)} pokemon on http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            #let queued edits land before the journal is folded in
+            await self.__writes.join()
+            self.__writer.cancel()
+            self.__dex.compact()
+
+
+#sends one request on an open connection and reads the reply, returns the status code
+async def request(reader, writer, method, path, body=None):
+    data = json.dumps(body).encode("utf-8") if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: dex\r\nContent-Length: {len(data)}\r\n\r\n".encode("latin-1") + data)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        header = await reader.readline()
+        if header in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = header.decode("latin-1").partition(":")
+        if key.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def fetchJson(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: dex\r\nConnection: close\r\n\r\n".encode("latin-1"))
+        await writer.drain()
+        raw = await reader.read()
+    finally:
+        writer.close()
+    return json.loads(raw.partition(b"\r\n\r\n")[2])
+
+
+#a read heavy mix of the query routes built from what the server has loaded
+async def requestMix(host, port, seed=0):
+    rng = random.Random(seed)
+    names = await fetchJson(host, port, "/names?limit=1000")
+    types = list(await fetchJson(host, port, "/types"))
+    paths = []
+    for _ in range(1000):
+        pick = rng.random()
+        if pick < 0.6 and names:
+            paths.append(f"/pokemon/{rng.choice(names)}")
+        elif pick < 0.8 and types:
+            paths.append(f"/types/{rng.choice(types)}?limit=20")
+        elif pick < 0.9:
+            paths.append(f"/stats/{rng.choice(STAT_FIELDS)}")
+        else:
+            paths.append(f"/top/{rng.choice(STAT_FIELDS)}?limit=10")
+    return paths
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100 * len(values)))] if values else 0.0
+
+
+#runs total requests over concurrency keep-alive connections and prints requests/s and latency
+async def loadTest(host="127.0.0.1", port=8080, concurrency=50, total=20000, seed=0):
+    paths = await requestMix(host, port, seed)
+    latencies = []
+    errors = 0
+    remaining = total
+
+    async def worker(i):
+        nonlocal remaining, errors
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            n = i
+            while remaining > 0:
+                remaining -= 1
+                path = paths[n % len(paths)]
+                n += concurrency
+                start = time.perf_counter()
+                status = await request(reader, writer, "GET", path)
+                latencies.append(time.perf_counter() - start)
+                if status >= 400:
+                    errors += 1
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    took = time.perf_counter() - start
+    print(f"{len(latencies)} requests over {concurrency} connections in {took:.2f} s")
+    print(f"requests/s {len(latencies) / took:.0f}")
+    print(f"latency ms  mean {sum(latencies) / len(latencies) * 1e3:.2f}  p50 {percentile(latencies, 50) * 1e3:.2f}  "
+          f"p99 {percentile(latencies, 99) * 1e3:.2f}  max {max(latencies) * 1e3:.2f}")
+    print(f"errors {errors}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pokedex HTTP/JSON service")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="load the dex once and serve it")
+    serve.add_argument("filename", nargs="?", help="dex file, or a directory / glob of shards")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument("--lazy", action="store_true", help="build pokemon on first access")
+
+    load = sub.add_parser("loadtest", help="hammer a running server and report requests/s and p99")
+    load.add_argument("--host", default="127.0.0.1")
+    load.add_argument("--port", type=int, default=8080)
+    load.add_argument("--concurrency", type=int, default=50)
+    load.add_argument("--requests", type=int, default=20000)
+    load.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args(argv)
+    if args.command == "loadtest":
+        asyncio.run(loadTest(args.host, args.port, args.concurrency, args.requests, args.seed))
+        return
+    service = DexService(Pokedex(args.filename, lazy=args.lazy))
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import os
+import sys
+
+import pytest
+
+#the modules live at the top of the repo, not in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+#charts are only ever saved in the tests, never shown
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import A3
+
+
+#every test gets its own empty folder as the working directory, the dex files are relative to it
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+#a full pokemon record, fields can be overridden
+def record(name, number, **fields):
+    data = {"name": name, "number": number, "types": ["Normal"], "species": "Test Pokemon",
+            "height": "1.0 m", "weight": "10.0 kg", "abilities": ["Run Away"],
+            "hp": "50", "attack": "50", "defense": "50", "spAttack": "50", "spDefense": "50", "speed": "50"}
+    data.update(fields)
+    return data
+
+
+#writes the records to pokemon.txt and loads a dex from it, the same way the menu starts up
+@pytest.fixture
+def makeDex():
+    def make(records, module=A3, **options):
+        with open("pokemon.txt", "w", encoding="utf-8") as f:
+            f.write("\n\n".join(module.BasePokemon(**r).to_file_format() for r in records))
+        return module.Pokedex(**options)
+    return make
+
+
+#answers the menu's input() prompts in order
+@pytest.fixture
+def answers(monkeypatch):
+    def feed(*replies):
+        replies = iter(replies)
+        monkeypatch.setattr("builtins.input", lambda prompt="": next(replies))
+    return feed
@@ -0,0 +1,35 @@
+import os
+
+import A2
+from conftest import record
+
+
+def test_edits_replay_when_nothing_has_been_saved_yet(makeDex, answers):
+    dex = makeDex([record("Foo", "No. 0001"), record("Bar", "No. 0002")], A2)
+    answers("1", "Blaze", "n")
+    dex.updatePokemon()
+    answers("Bar")
+    dex.removePokemon()
+    assert "Name: Bar" in open("pokemon.txt", encoding="utf-8").read()
+
+    again = A2.Pokedex()
+    assert again._find("Foo").getAbilities() == ["Blaze"]
+    assert again._find("Bar") is None
+    again.compact()
+    assert not os.path.exists("pokemon.txt.journal")
+    assert "Name: Bar" not in open("pokemon.txt", encoding="utf-8").read()
+
+
+def test_remove_then_re_add_survives_a_crash_mid_compaction(makeDex, answers):
+    dex = makeDex([record("Foo", "No. 0001", hp="10")], A2)
+    answers("Foo")
+    dex.removePokemon()
+    answers("1", "Foo", "Normal", "Test Pokemon", "1.0 m", "10.0 kg", "Run Away", "20", "50", "50", "50", "50", "50")
+    dex.addPokemon()
+    #the file is swapped in but the journal never gets deleted
+    dex.save()
+    assert os.path.exists("pokemon.txt.journal")
+
+    again = A2.Pokedex()
+    assert [p.getHP() for p in again._ofType("normal")] == ["20"]
+    assert A2.readCheckpoint("pokemon.txt") == 2
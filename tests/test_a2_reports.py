@@ -0,0 +1,27 @@
+import os
+
+import A2
+from conftest import record
+
+RECORDS = [record("Mon1", "No. 0001", types=["Fire"], speed="30"),
+           record("Mon2", "No. 0002", types=["Fire", "Grass"], speed="90"),
+           record("Mon3", "No. 0003", types=["Grass"], speed="60")]
+
+
+def test_every_type_gets_a_report(makeDex, answers):
+    dex = makeDex(RECORDS, A2, journal=False)
+    assert sorted(dex.exportAllTypeReports(workers=2)) == ["fire.txt", "grass.txt"]
+
+    with open("fire.txt", encoding="utf-8") as f:
+        fire = f.read()
+    assert fire.startswith("Fire Type!\nTotal: 2 | Single: 1 | Dual: 1\n")
+    assert "Speed 60.0" in fire.splitlines()[2]
+    assert fire.endswith(A2.BasePokemon(**RECORDS[1]).to_file_format())
+    assert fire.count("Name: ") == 2
+
+    #a single report through the menu is the same file
+    os.rename("grass.txt", "grass-all.txt")
+    answers("Grass")
+    assert dex.exportTypeReport() == "grass.txt"
+    with open("grass.txt", encoding="utf-8") as a, open("grass-all.txt", encoding="utf-8") as b:
+        assert a.read() == b.read()
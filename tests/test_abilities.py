@@ -0,0 +1,41 @@
+import pytest
+
+import A3
+from conftest import record
+
+
+@pytest.fixture
+def dex(makeDex):
+    return makeDex([record("Mon1", "No. 0001", abilities=["Blaze", "Solar Power"]),
+                    record("Mon2", "No. 0002", abilities=["Overgrow", "Chlorophyll"]),
+                    record("Mon3", "No. 0003", abilities=["Blaze", "Chlorophyll"])], journal=False)
+
+
+def names(found):
+    return [p.getName() for p in found]
+
+
+def test_all_and_any(dex):
+    assert names(dex.find_by_ability("blaze")) == ["Mon1", "Mon3"]
+    assert names(dex.find_by_ability("Blaze", "chlorophyll")) == ["Mon3"]
+    assert names(dex.find_by_ability("Solar Power", "Overgrow", match="any")) == ["Mon1", "Mon2"]
+    assert dex.find_by_ability("Levitate") == []
+    assert dex.find_by_ability(" ") == []
+    with pytest.raises(A3.PokemonInputError):
+        dex.find_by_ability("Blaze", match="most")
+
+
+def test_the_index_follows_edits(dex):
+    dex.update("Mon1", abilities=["Overgrow"])
+    dex.remove("Mon3")
+    assert dex.find_by_ability("Blaze") == []
+    assert names(dex.find_by_ability("overgrow")) == ["Mon1", "Mon2"]
+    assert dex.abilityCounts()["overgrow"] == 2
+
+
+def test_lazy_rows_are_indexed_without_being_built(dex):
+    dex.save()
+    lazy = A3.Pokedex(journal=False, lazy=True)
+    assert lazy.abilityCounts() == dex.abilityCounts()
+    assert lazy.builtCount() == 0
+    assert names(lazy.find_by_ability("blaze")) == ["Mon1", "Mon3"]
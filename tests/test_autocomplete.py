@@ -0,0 +1,36 @@
+import pytest
+
+import A3
+from conftest import record
+
+
+@pytest.fixture
+def dex(makeDex):
+    return makeDex([record("Charmander", "No. 0004", species="Lizard Pokemon"),
+                    record("Charmeleon", "No. 0005", species="Flame Pokemon"),
+                    record("Chansey", "No. 0113", species="Egg Pokemon"),
+                    record("Flabébé", "No. 0669", species="Single Bloom Pokemon")], journal=False)
+
+
+def test_names_in_sorted_order(dex):
+    assert dex.autocomplete("cha") == ["Chansey", "Charmander", "Charmeleon"]
+    assert dex.autocomplete("CHARM", limit=1) == ["Charmander"]
+    assert dex.autocomplete("flabé") == ["Flabébé"]
+    assert dex.autocomplete("z") == []
+
+
+def test_species(dex):
+    assert dex.autocomplete("fl", field="species") == ["Flame Pokemon"]
+    with pytest.raises(A3.PokemonInputError):
+        dex.autocomplete("fl", field="abilities")
+
+
+def test_a_shared_species_stays_until_nobody_has_it(dex):
+    dex.autocomplete("x", field="species")
+    dex.add(record("Charizard", "No. 0006", species="Flame Pokemon"))
+    dex.remove("Charmeleon")
+    assert dex.autocomplete("fla", field="species") == ["Flame Pokemon"]
+    dex.update("Charizard", species="Flame Thrower Pokemon", name="Zard")
+    assert dex.autocomplete("flame", field="species") == ["Flame Thrower Pokemon"]
+    assert dex.autocomplete("char") == ["Charmander"]
+    assert dex.autocomplete("za") == ["Zard"]
@@ -0,0 +1,41 @@
+import pytest
+
+import A2
+import A3
+import benchmark
+
+
+@pytest.mark.parametrize("variant, fmt, filename", [("A3", "txt", "pokemon.txt"), ("A3", "json", "pokemon.json"),
+                                                    ("A2", "txt", "pokemon.txt")])
+def test_generated_files_load(variant, fmt, filename):
+    benchmark.generate(filename, 50, fmt, variant, seed=1)
+    module = A2 if variant == "A2" else A3
+    dex = module.Pokedex(journal=False)
+    assert len(dex._Pokedex__pokemons) == 50
+    assert dex.typeCounts()
+
+
+def test_same_seed_same_file():
+    benchmark.generate("a.txt", 20, seed=3)
+    benchmark.generate("b.txt", 20, seed=3)
+    with open("a.txt", encoding="utf-8") as a, open("b.txt", encoding="utf-8") as b:
+        assert a.read() == b.read()
+
+
+def test_a2_json_is_refused(capsys):
+    with pytest.raises(SystemExit):
+        benchmark.main(["generate", "--count", "5", "--format", "json", "--variant", "A2", "--out", "x.json"])
+    assert "A2 has no json format" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("variant", benchmark.VARIANTS)
+def test_every_variant_runs_a_case(workdir, variant):
+    rows = {name: (calls, seconds) for name, calls, seconds in benchmark.runCase(variant, 30, str(workdir), lookups=10)}
+    assert {"load txt", "save", "find by name", "find by number", "searchByType"} <= rows.keys()
+    assert all(seconds >= 0 for _, seconds in rows.values())
+
+
+def test_a_case_times_the_real_chart_paths(workdir):
+    rows = {name: (calls, seconds) for name, calls, seconds in benchmark.runCase("A3", 30, str(workdir), lookups=10)}
+    assert {"pie chart data (first)", "pie chart data", "bar chart data"} <= rows.keys()
+    assert all(seconds >= 0 for _, seconds in rows.values())
@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+import A3
+from conftest import record
+
+
+@pytest.fixture
+def dex(makeDex):
+    return makeDex([record("Charmander", "No. 0004", types=["Fire"]), record("Oddish", "No. 0043", types=["Grass"]),
+                    record("Mr. Mime", "No. 0122", types=["Psychic", "Fairy"])], journal=False)
+
+
+def test_chart_file_names_carry_the_dex_number():
+    assert A3.chartFileName("Mr. Mime", "No. 0122") == "0122_Mr._Mime"
+    assert A3.chartFileName("Mr Mime", "No. 0866") == "0866_Mr_Mime"
+    assert A3.chartFileName("../..", "No. 0001") == "0001_pokemon"
+    assert A3.chartFileName("Porygon-Z") == "Porygon-Z"
+
+
+@pytest.mark.parametrize("kind, keys", [("bar", ["oddish"]), ("line", ["Charmander", "Mr. Mime"]), ("pie", [])])
+def test_charts_are_saved_without_a_window(dex, kind, keys):
+    assert dex.saveChart(kind, f"{kind}.svg", *keys) == f"{kind}.svg"
+    with open(f"{kind}.svg", encoding="utf-8") as f:
+        assert "<svg" in f.read()
+
+
+def test_a_chart_needs_the_right_pokemon(dex):
+    with pytest.raises(A3.PokemonInputError):
+        dex.saveChart("line", "line.svg", "Oddish")
+    with pytest.raises(A3.PokemonNotFoundError):
+        dex.saveChart("bar", "bar.svg", "Missingno")
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_every_pokemon_gets_a_card(dex, workdir, processes):
+    files = dex.renderBarCharts("cards", "png", processes=processes)
+    assert [os.path.basename(f) for f in files] == ["0004_Charmander.png", "0043_Oddish.png", "0122_Mr._Mime.png"]
+    assert sorted(os.listdir(workdir / "cards")) == ["0004_Charmander.png", "0043_Oddish.png", "0122_Mr._Mime.png"]
+    with pytest.raises(A3.PokemonInputError):
+        dex.renderBarCharts("cards", "gif")
+
+
+def test_names_that_only_differ_in_punctuation_get_their_own_card(makeDex, workdir):
+    dex = makeDex([record("Mr. Mime", "No. 0122"), record("Mr Mime", "No. 0866"), record("MR-MIME", "No. 0867")],
+                  journal=False)
+    dex.chartCacheDir = None
+    #a hand edited file can hold the same number twice
+    dex._load(record("mr mime", "No. 0866"))
+    files = dex.renderBarCharts("cards", "svg", processes=1)
+    assert [os.path.basename(f) for f in files] == [
+        "0122_Mr._Mime.svg", "0866_Mr_Mime.svg", "0867_MR-MIME.svg", "0866_mr_mime_2.svg"]
+    assert len({f.casefold() for f in os.listdir(workdir / "cards")}) == 4
+
+
+def test_an_unchanged_card_comes_out_of_the_cache(dex):
+    first = dex.renderBarCharts("cards", "svg", processes=1)
+    assert dex.chartCacheStats()["misses"] == 3
+    drawn = [open(f, encoding="utf-8").read() for f in first]
+    again = dex.renderBarCharts("copies", "svg", processes=1)
+    stats = dex.chartCacheStats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (3, 3, 3)
+    assert [open(f, encoding="utf-8").read() for f in again] == drawn
+
+
+def test_the_cache_drops_the_least_recently_used_chart(workdir):
+    for name in ("a", "b", "c"):
+        (workdir / name).write_bytes(b"x" * 10)
+    cache = A3.ChartCache("cache", maxBytes=20)
+    cache.store("a.png", "a")
+    cache.store("b.png", "b")
+    assert cache.fetch("a.png", "out.png")
+    cache.store("c.png", "c")
+    assert not cache.fetch("b.png", "out.png")
+    assert sorted(os.listdir("cache")) == ["a.png", "c.png"]
+    assert cache.stats() == {"entries": 2, "bytes": 20, "hits": 1, "misses": 1}
+
+
+def test_caching_can_be_turned_off(dex):
+    dex.chartCacheDir = None
+    dex.saveChart("pie", "pie.png")
+    assert dex.chartCacheStats() is None
+    assert not os.path.exists(A3.Pokedex.chartCacheDir)
+
+
+def test_an_edit_only_redraws_that_pokemons_card(makeDex):
+    dex = makeDex([record(f"Mon{i}", f"No. {i:04d}", speed=str(10 * i)) for i in range(1, 5)], journal=False)
+    dex.renderBarCharts("cards", "svg", processes=1)
+    assert dex.chartCacheStats()["misses"] == 4
+    dex.update("Mon2", speed="200")
+    dex.renderBarCharts("cards", "svg", processes=1)
+    dex.saveChart("bar", "mon1.svg", "Mon1")
+    stats = dex.chartCacheStats()
+    assert (stats["hits"], stats["misses"]) == (4, 5)
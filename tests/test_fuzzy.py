@@ -0,0 +1,48 @@
+import pytest
+
+import A3
+from conftest import record
+
+
+@pytest.fixture
+def dex(makeDex):
+    return makeDex([record(name, f"No. {i:04d}") for i, name in
+                    enumerate(["Charmander", "Charmeleon", "Bulbasaur", "Oddish", "Vulpix"], 1)], journal=False)
+
+
+def found(results):
+    return [(distance, p.getName()) for distance, p in results]
+
+
+@pytest.mark.parametrize("a, b, distance", [("", "", 0), ("abc", "", 3), ("kitten", "sitting", 3),
+                                            ("charmander", "charmandr", 1), ("oddish", "oddihs", 2)])
+def test_edit_distance(a, b, distance):
+    assert A3.editDistance(a, b, 5) == distance
+    assert A3.editDistance(b, a, 5) == distance
+
+
+def test_edit_distance_stops_at_the_limit():
+    assert A3.editDistance("kitten", "sitting", 2) == 3
+    assert A3.editDistance("charmander", "oddish", 1) == 2
+
+
+def test_one_typo_finds_the_name(dex):
+    assert found(dex.fuzzyFind("Bulbasuar")) == [(2, "Bulbasaur")]
+    assert found(dex.fuzzyFind("vulpx")) == [(1, "Vulpix")]
+    assert found(dex.fuzzyFind("Charmandr")) == [(1, "Charmander")]
+
+
+def test_wider_searches_rank_by_distance(dex):
+    assert found(dex.fuzzyFind("Charmelon", maxDistance=5)) == [(1, "Charmeleon"), (5, "Charmander")]
+    assert found(dex.fuzzyFind("Charmelon", maxDistance=5, limit=1)) == [(1, "Charmeleon")]
+    assert dex.fuzzyFind("Pikachu") == []
+    assert dex.fuzzyFind("   ") == []
+
+
+def test_the_trigram_index_follows_edits(dex):
+    dex.fuzzyFind("oddish")
+    dex.update("Oddish", name="Gloom")
+    dex.add(record("Vileplume", "No. 0045"))
+    assert dex.fuzzyFind("Odish") == []
+    assert found(dex.fuzzyFind("Glom")) == [(1, "Gloom")]
+    assert found(dex.fuzzyFind("Vileplum")) == [(1, "Vileplume")]
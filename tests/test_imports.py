@@ -0,0 +1,22 @@
+import subprocess
+import sys
+
+import pytest
+
+import benchmark
+
+
+#importing A3 (or the server on top of it) must not pull in matplotlib or the process pool, they load on first use
+@pytest.mark.parametrize("module", ["A3", "server"])
+def test_heavy_modules_load_on_first_use(module):
+    code = (f"import sys, {module}\n"
+            "print(sorted(m for m in ('matplotlib', 'concurrent.futures.process') if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=benchmark.HERE).stdout
+    assert out.strip() == "[]"
+
+
+def test_import_time_reports_the_module_and_its_imports():
+    total, direct = benchmark.importTime("A3", repeat=1)
+    assert total > 0
+    assert "numpy" in [name for _, name in direct]
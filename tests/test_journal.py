@@ -0,0 +1,142 @@
+import os
+
+import pytest
+
+import A3
+from conftest import record
+
+FOO = ("No. 0002", "Foo", "Normal", "Test Pokemon", "1.0 m", "10.0 kg", "Run Away", "10", "50", "50", "50", "50", "50")
+
+
+def crashMidCompaction(dex):
+    #save() has swapped the new files in but the process dies before the journal is deleted
+    dex.save()
+
+
+def test_edits_go_to_the_journal_and_replay_on_restart(makeDex, answers):
+    dex = makeDex([record("Mon1", "No. 0001")])
+    answers(*FOO)
+    dex.addPokemon()
+    answers("Foo", "n", "", "y", "99", "", "", "", "", "")
+    dex.updatePokemon()
+    answers("Mon1")
+    dex.removePokemon()
+    #nothing but the journal was written
+    assert os.path.exists("pokemon.txt.journal")
+    assert not os.path.exists(A3.Pokedex.jsonFile)
+    assert "Mon1" in open("pokemon.txt", encoding="utf-8").read()
+
+    again = A3.Pokedex()
+    assert again._find("Mon1") is None
+    assert again._find("Foo").getHP() == "99"
+
+
+def test_a_half_written_last_line_is_ignored(makeDex, answers):
+    dex = makeDex([])
+    answers(*FOO)
+    dex.addPokemon()
+    with open("pokemon.txt.journal", "a", encoding="utf-8") as f:
+        f.write('{"op": "remove", "ke')
+    assert A3.Pokedex()._find("Foo") is not None
+
+
+def test_compact_folds_the_journal_in(makeDex, answers):
+    dex = makeDex([])
+    answers(*FOO)
+    dex.addPokemon()
+    dex.compact()
+    assert not os.path.exists("pokemon.txt.journal")
+    assert "Name: Foo" in open("pokemon.txt", encoding="utf-8").read()
+    assert A3.Pokedex()._find("Foo").getHP() == "10"
+
+
+def test_replaying_twice_changes_nothing(makeDex, answers):
+    dex = makeDex([])
+    answers(*FOO)
+    dex.addPokemon()
+    crashMidCompaction(dex)
+    again = A3.Pokedex()
+    assert again.typeCounts() == {"normal": 1}
+
+
+def test_without_the_journal_every_edit_saves(makeDex, answers):
+    dex = makeDex([], journal=False)
+    answers(*FOO)
+    dex.addPokemon()
+    assert not os.path.exists("pokemon.txt.journal")
+    assert "Name: Foo" in open("pokemon.txt", encoding="utf-8").read()
+
+
+def test_replay_is_skipped_for_entries_the_snapshot_holds():
+    dex = A3.Pokedex()
+    dex.add(record("Foo", "No. 0001"))
+    dex.update("No. 0001", number="No. 0002")
+    dex.add(record("Bar", "No. 0001"))
+    crashMidCompaction(dex)
+    assert os.path.exists(dex.txtFile + ".journal")
+
+    again = A3.Pokedex()
+    assert again.get("Foo").getNumber() == "No. 0002"
+    assert again.get("Bar").getNumber() == "No. 0001"
+    assert len(again) == 2
+
+
+def test_replay_without_snapshot_matches_name_and_number():
+    dex = A3.Pokedex()
+    dex.add(record("Foo", "No. 0001"))
+    dex.update("No. 0001", number="No. 0002")
+    dex.add(record("Bar", "No. 0001"))
+    dex.remove("Bar")
+    dex.add(record("Baz", "No. 0001"))
+    crashMidCompaction(dex)
+    #only the json has no checkpoint, replay has to work out by itself what is already in there
+    os.remove(A3.Pokedex.dexFile)
+
+    again = A3.Pokedex()
+    assert sorted(again.names()) == ["Baz", "Foo"]
+    assert again.get("Foo").getNumber() == "No. 0002"
+    assert again.get("Baz").getNumber() == "No. 0001"
+
+
+def test_edits_after_a_crash_replay_on_top():
+    dex = A3.Pokedex()
+    dex.add(record("Foo", "No. 0001"))
+    crashMidCompaction(dex)
+    dex.update("Foo", hp="99")
+    dex.add(record("Bar", "No. 0002"))
+
+    again = A3.Pokedex()
+    assert again.get("Foo").getHP() == "99"
+    assert again.exists("Bar")
+
+
+def test_numbering_carries_on_after_compaction():
+    dex = A3.Pokedex()
+    dex.add(record("Foo", "No. 0001"))
+    dex.update("Foo", speed="120")
+    dex.compact()
+
+    again = A3.Pokedex()
+    assert again.get("Foo").getSpeed() == "120"
+    #numbering carries on after compaction, so a later crash still skips the right entries
+    again.remove("Foo")
+    crashMidCompaction(again)
+    assert len(A3.Pokedex()) == 0
+
+
+def test_old_journal_entries_keyed_by_what_was_typed_still_replay():
+    A3.Pokedex().add(record("Foo", "No. 0001"))
+    with open(A3.Pokedex.txtFile + ".journal", "a", encoding="utf-8") as f:
+        f.write('{"op": "update", "key": "foo", "fields": {"hp": "77"}}\n')
+    assert A3.Pokedex().get("Foo").getHP() == "77"
+
+
+@pytest.mark.parametrize("journal", [True, False])
+def test_the_menu_only_mentions_the_journal_when_there_is_one(makeDex, answers, capsys, journal):
+    dex = makeDex([record("Mon1", "No. 0001")], journal=journal)
+    capsys.readouterr()
+    answers("Mon1")
+    dex.removePokemon()
+    out = capsys.readouterr().out
+    assert ("saved to journal" in out) == journal
+    assert ("saved to TXT, JSON and snapshot" in out) == (not journal)
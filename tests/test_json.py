@@ -0,0 +1,40 @@
+import io
+import json
+
+import pytest
+
+import A3
+
+RECORDS = [{"name": "Mon1", "types": ["Fire"], "hp": "45"},
+           {"name": "Flabébé", "note": "a ] and a [ and \"quotes\", inside"},
+           {"name": "Nested", "extra": {"list": [1, 2, [3]], "empty": {}}}]
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_write_matches_json_and_reads_back(indent):
+    out = io.StringIO()
+    A3.writeJson(out, iter(RECORDS), indent=indent)
+    assert json.loads(out.getvalue()) == RECORDS
+    if indent is not None:
+        assert out.getvalue() == json.dumps(RECORDS, indent=indent)
+    assert list(A3.iterJson(io.StringIO(out.getvalue()))) == RECORDS
+
+
+#tiny chunks make every element straddle a chunk boundary
+@pytest.mark.parametrize("chunkSize", [1, 3, 7, 1 << 16])
+def test_records_split_across_chunks(chunkSize):
+    text = json.dumps(RECORDS, indent=1)
+    assert list(A3.iterJson(io.StringIO(text), chunkSize=chunkSize)) == RECORDS
+
+
+def test_empty_array():
+    out = io.StringIO()
+    A3.writeJson(out, [])
+    assert out.getvalue() == "[]"
+    assert list(A3.iterJson(io.StringIO("  [ ]  "))) == []
+
+
+@pytest.mark.parametrize("text", ["", '{"name": "Mon1"}', '[{"name": "Mon1"}', '[{"name": }]'])
+def test_bad_documents_raise(text):
+    with pytest.raises(ValueError):
+        list(A3.iterJson(io.StringIO(text), chunkSize=4))
@@ -0,0 +1,74 @@
+import os
+
+import pytest
+
+import A3
+from conftest import record
+
+RECORDS = [record(f"Mon{i}", f"No. {i:04d}", speed=str(10 * i), types=["Fire"] if i % 2 else ["Grass", "Poison"])
+           for i in range(1, 6)]
+
+
+def fields(dex):
+    return [A3.Pokedex._fields(dex._find(name)) for name in list(dex.names())]
+
+
+@pytest.fixture
+def saved(makeDex):
+    dex = makeDex(RECORDS, journal=False)
+    dex.save()
+    return fields(dex)
+
+
+#each start drops the faster file so the next one down gets read
+@pytest.mark.parametrize("missing", [(), ("pokemon.dex",), ("pokemon.dex", "pokemon.json")])
+def test_lazy_and_eager_loads_agree(saved, missing):
+    for filename in missing:
+        os.remove(filename)
+    assert fields(A3.Pokedex(journal=False, lazy=True)) == saved
+    assert fields(A3.Pokedex(journal=False)) == saved
+
+
+def test_rows_are_built_on_first_use(saved):
+    dex = A3.Pokedex(journal=False, lazy=True)
+    assert len(dex) == 5
+    assert dex.builtCount() == 0
+    assert dex._find("mon2").getSpeed() == "20"
+    assert dex.builtCount() == 1
+    assert list(dex.names()) == [f"Mon{i}" for i in range(1, 6)]
+    assert dex.builtCount() == 1
+
+
+def test_lazy_edits_survive_a_restart(saved, answers):
+    dex = A3.Pokedex(lazy=True)
+    answers("Mon2", "n", "", "y", "", "", "", "", "", "99")
+    dex.updatePokemon()
+    answers("No. 0003")
+    dex.removePokemon()
+    for lazy in (True, False):
+        again = A3.Pokedex(lazy=lazy)
+        assert list(again.names()) == ["Mon1", "Mon2", "Mon4", "Mon5"]
+        assert again._find("Mon2").getSpeed() == "99"
+
+
+def test_lazy_aggregates_read_the_stat_table(saved):
+    dex = A3.Pokedex(journal=False, lazy=True)
+    assert dex.typeCounts() == {"fire": 3, "grass": 2, "poison": 2}
+    assert list(dex.statColumn("speed")) == [10, 20, 30, 40, 50]
+    assert dex.builtCount() == 0
+    assert [p.getName() for p in dex.sortedByStat("speed")[:2]] == ["Mon5", "Mon4"]
+    assert [p.getName() for p in dex._ofType("grass")] == ["Mon2", "Mon4"]
+
+
+#a named pokemon with just its stats written out gets the rest (types, abilities, ...) from its class either way
+def test_class_defaults_apply_in_both_modes():
+    text = A3.BasePokemon(**record("Charmander", "No. 0004", speed="80")).to_file_format()
+    kept = [line for line in text.splitlines() if not line.startswith(("Type", "Abilities", "Species"))]
+    with open("pokemon.txt", "w", encoding="utf-8") as f:
+        f.write("\n".join(kept) + "\n")
+    eager, lazy = A3.Pokedex(journal=False), A3.Pokedex(journal=False, lazy=True)
+    assert eager.typeCounts() == lazy.typeCounts() == {"fire": 1}
+    assert [p.getName() for p in lazy.find_by_type("fire")] == ["Charmander"]
+    assert [p.getName() for p in lazy.find_by_ability("blaze")] == ["Charmander"]
+    assert fields(lazy) == fields(eager)
+    assert lazy.get("Charmander").getSpeed() == "80"
@@ -0,0 +1,91 @@
+import pytest
+
+import A2
+import A3
+from conftest import record
+
+RECORDS = [record("Charmander", "No. 0004"), record("Vulpix", "No. 0037"), record("Mr. Mime", "No. 0122")]
+
+
+@pytest.mark.parametrize("module", [A2, A3])
+@pytest.mark.parametrize("key", ["Vulpix", "  vulpix ", "VULPIX", "No. 0037", "0037", "37"])
+def test_find_by_name_or_number(makeDex, module, key):
+    assert makeDex(RECORDS, module)._find(key).getName() == "Vulpix"
+
+
+def test_unknown_keys_find_nothing(makeDex):
+    dex = makeDex(RECORDS)
+    assert dex._find("Missingno") is None
+    assert dex._find("No. 0038") is None
+
+
+def test_renames_and_renumbers_move_the_index(makeDex):
+    dex = makeDex(RECORDS)
+    p = dex._find("Vulpix")
+    p.setName("Ninetales")
+    p.setNumber("No. 0038")
+    assert dex._find("ninetales") is p
+    assert dex._find("38") is p
+    assert dex._find("Vulpix") is None
+    assert dex._find("37") is None
+
+
+def test_menu_remove_takes_it_out_of_the_index(makeDex, answers):
+    dex = makeDex(RECORDS)
+    answers("mr. mime")
+    dex.removePokemon()
+    assert dex._find("Mr. Mime") is None
+    assert dex._find("4").getName() == "Charmander"
+    #and the saved dex agrees
+    assert A3.Pokedex()._find("122") is None
+
+
+@pytest.mark.parametrize("key", ["Vulpix", "  vulpix ", "No. 0037", "37"])
+def test_get_by_name_or_number(makeDex, key):
+    assert makeDex(RECORDS).get(key).getName() == "Vulpix"
+
+
+def test_unknown_keys_raise(makeDex):
+    dex = makeDex(RECORDS)
+    with pytest.raises(A3.PokemonNotFoundError):
+        dex.get("Missingno")
+    with pytest.raises(A3.PokemonNotFoundError):
+        dex.remove("No. 0038")
+
+
+def test_the_api_keeps_the_index(makeDex):
+    dex = makeDex(RECORDS)
+    dex.update("Vulpix", name="Ninetales", number="No. 0038")
+    assert dex.get("ninetales").getNumber() == "No. 0038"
+    assert not dex.exists("Vulpix", "No. 0037")
+    dex.remove("Mr. Mime")
+    assert not dex.exists("mr. mime")
+    dex.add(record("Growlithe", "No. 0058", types=["Fire"]))
+    assert isinstance(dex.get("58"), A3.FireType)
+    assert [p.getName() for p in dex.find_by_type("fire")] == ["Growlithe"]
+
+
+def test_duplicates_and_bad_fields_are_refused(makeDex):
+    dex = makeDex(RECORDS)
+    with pytest.raises(A3.PokemonInputError):
+        dex.add(record("charmander", "No. 0999"))
+    with pytest.raises(A3.PokemonInputError):
+        dex.add(record("Growlithe", "No. 0004"))
+    with pytest.raises(A3.PokemonInputError):
+        dex.add(record("Growlithe", "No. 0058", types=["Fire", "Normal", "Dark"]))
+    with pytest.raises(A3.PokemonInputError):
+        dex.update("Vulpix", hp="lots")
+    assert dex.get("Vulpix").getHP() == "50"
+    assert not dex.exists("Growlithe")
+
+
+def test_api_errors_are_ordinary_exceptions(makeDex):
+    dex = makeDex(RECORDS)
+    assert issubclass(A3.PokemonInputError, Exception)
+    for bad in (lambda: dex.get("Missingno"), lambda: dex.add(record("Vulpix", "No. 0999"))):
+        try:
+            bad()
+        except Exception as e:
+            assert isinstance(e, A3.PokemonInputError)
+        else:
+            pytest.fail("no error raised")
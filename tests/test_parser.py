@@ -0,0 +1,26 @@
+import pytest
+
+import A2
+import A3
+from conftest import record
+
+
+@pytest.mark.parametrize("module", [A2, A3])
+def test_to_file_format_parses_back(module):
+    p = module.BasePokemon(**record("Mon1", "No. 0001", types=["Fire", "Flying"], abilities=["Blaze", "Solar Power"],
+                                    speed="77"))
+    [data] = module.parseDex(p.to_file_format().splitlines())
+    assert module.BasePokemon(**data).to_file_format() == p.to_file_format()
+
+
+def test_blank_lines_split_records_and_unknown_keys_are_ignored():
+    text = ["", "Name: Mon1", "Favourite Food: berries", "", "", "  Name: Mon2  ", "HP: 12", "not a field"]
+    assert list(A3.parseDex(text)) == [{"name": "Mon1"}, {"name": "Mon2", "hp": "12"}]
+    assert list(A3.parseDex([])) == []
+
+
+@pytest.mark.parametrize("module", [A2, A3])
+def test_a_dex_without_files_starts_empty(module):
+    dex = module.Pokedex()
+    assert dex._find("Mon1") is None
+    assert dex.typeCounts() == {}
@@ -0,0 +1,48 @@
+import pytest
+
+import A3
+from conftest import record
+
+
+@pytest.fixture
+def dex(makeDex):
+    speeds = [90, 120, 60, 120, 30]
+    records = [record(f"Mon{i}", f"No. {i:04d}", speed=str(speed), hp=str(10 * i)) for i, speed in enumerate(speeds, 1)]
+    return makeDex(records, journal=False)
+
+
+def names(found):
+    return [p.getName() for p in found]
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_non_positive_limit_is_empty(dex, limit):
+    assert dex.query(order="hp", descending=True, limit=limit) == []
+    assert dex.query(order="speed", limit=limit) == []
+    assert dex.query(speed=(50, None), limit=limit) == []
+
+
+def test_limit_larger_than_the_dex(dex):
+    assert len(dex.query(order="speed", descending=True, limit=50)) == 5
+
+
+def test_top_n_keeps_ties_in_pokedex_order(dex):
+    assert names(dex.query(order="speed", descending=True, limit=2)) == ["Mon2", "Mon4"]
+    assert names(dex.query(order="speed", descending=True, limit=3)) == ["Mon2", "Mon4", "Mon1"]
+    assert names(dex.query(order="speed")) == ["Mon5", "Mon3", "Mon1", "Mon2", "Mon4"]
+
+
+def test_ranges_are_inclusive_and_open_ended(dex):
+    assert names(dex.query(speed=(60, 90))) == ["Mon1", "Mon3"]
+    assert names(dex.query(speed=(100, None))) == ["Mon2", "Mon4"]
+    assert names(dex.query(speed=(None, 30))) == ["Mon5"]
+    assert names(dex.query(speed=(60, None), hp=(None, 30))) == ["Mon1", "Mon2", "Mon3"]
+    assert dex.query(speed=(200, None)) == []
+
+
+def test_indexes_follow_edits(dex):
+    dex.query(order="speed")
+    dex.update("Mon5", speed="150")
+    dex.remove("Mon2")
+    assert names(dex.query(order="speed", descending=True, limit=2)) == ["Mon5", "Mon4"]
+    assert names(dex.query(speed=(100, None))) == ["Mon4", "Mon5"]
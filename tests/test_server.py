@@ -0,0 +1,91 @@
+import asyncio
+import json
+import socket
+
+import pytest
+
+import A3
+import server
+from conftest import record
+
+
+def freePort():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def call(port, method, path, body=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = json.dumps(body).encode("utf-8") if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: dex\r\nConnection: close\r\nContent-Length: {len(data)}\r\n\r\n"
+                 .encode("latin-1") + data)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+#starts the server, runs steps(port) against it and shuts it down the way ctrl-c would
+def serving(dex, steps):
+    async def run():
+        port = freePort()
+        task = asyncio.create_task(server.DexService(dex).serve(port=port))
+        for _ in range(100):
+            try:
+                _, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.close()
+                break
+            except OSError:
+                await asyncio.sleep(0.01)
+        try:
+            return await steps(port)
+        finally:
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def dex(makeDex):
+    return makeDex([record("Mon1", "No. 0001", types=["Fire"], speed="90"),
+                    record("Mon2", "No. 0002", types=["Grass"], speed="120")])
+
+
+def test_reads(dex):
+    async def steps(port):
+        assert await call(port, "GET", "/pokemon/1") == (200, dex.get("Mon1").to_dict())
+        assert (await call(port, "GET", "/pokemon/Missingno"))[0] == 404
+        assert await call(port, "GET", "/types") == (200, {"fire": 1, "grass": 1})
+        status, top = await call(port, "GET", "/top/speed?limit=1")
+        assert (status, [p["name"] for p in top]) == (200, ["Mon2"])
+        assert await call(port, "GET", "/top/speed?limit=0") == (200, [])
+        assert (await call(port, "GET", "/top/speed?limit=x"))[0] == 400
+        status, fast = await call(port, "GET", "/query?speed=100..")
+        assert (status, [p["name"] for p in fast]) == (200, ["Mon2"])
+        assert (await call(port, "GET", "/query?speed=oops"))[0] == 400
+        status, close = await call(port, "GET", "/fuzzy/Mon2x")
+        assert (status, [(p["distance"], p["name"]) for p in close]) == (200, [(1, "Mon2")])
+        assert await call(port, "GET", "/complete?prefix=mo&limit=1") == (200, ["Mon1"])
+        assert await call(port, "GET", "/abilities") == (200, {"run away": 2})
+        status, near = await call(port, "GET", "/similar/Mon1?limit=1")
+        assert (status, [(p["distance"], p["name"]) for p in near]) == (200, [(30.0, "Mon2")])
+        assert (await call(port, "GET", "/nowhere"))[0] == 404
+    serving(dex, steps)
+
+
+def test_writes_are_applied_and_saved_on_shutdown(dex):
+    async def steps(port):
+        status, added = await call(port, "POST", "/pokemon", record("Mon3", "No. 0003", speed="10"))
+        assert (status, added["name"]) == (201, "Mon3")
+        assert (await call(port, "POST", "/pokemon", record("Mon3", "No. 0004")))[0] == 400
+        assert (await call(port, "PATCH", "/pokemon/Mon1", {"speed": "200"}))[1]["speed"] == 200
+        assert (await call(port, "DELETE", "/pokemon/Mon2"))[0] == 200
+        assert (await call(port, "DELETE", "/pokemon/Mon2"))[0] == 404
+        assert (await call(port, "PUT", "/pokemon/Mon1"))[0] == 405
+    serving(dex, steps)
+    again = A3.Pokedex()
+    assert [p.getName() for p in again.query()] == ["Mon1", "Mon3"]
+    assert again.get("Mon1").getSpeed() == "200"
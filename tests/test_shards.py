@@ -0,0 +1,58 @@
+import A3
+from conftest import record
+
+
+def writeShard(path, *pokemon):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n\n".join(A3.BasePokemon(**data).to_file_format() for data in pokemon) + "\n")
+
+
+def names(dex):
+    return list(dex.names())
+
+
+def test_shards_merge_in_path_order_skipping_duplicates(workdir):
+    (workdir / "regions").mkdir()
+    writeShard("regions/b.txt", record("Mon3", "No. 0003"), record("Mon1", "No. 0009"))
+    writeShard("regions/a.txt", record("Mon1", "No. 0001"), record("Mon2", "No. 0002"))
+    dex = A3.Pokedex("regions", journal=False)
+    assert names(dex) == ["Mon1", "Mon2", "Mon3"]
+
+
+def test_edits_after_a_sharded_load_survive_a_restart(workdir):
+    (workdir / "regions").mkdir()
+    writeShard("regions/a.txt", record("Mon1", "No. 0001"), record("Mon2", "No. 0002"))
+    dex = A3.Pokedex("regions")
+    dex.remove("Mon1")
+    dex.add(record("Mon3", "No. 0003"))
+    dex.update("Mon2", speed="99")
+    #the next start is pointed at the same shards again
+    again = A3.Pokedex("regions")
+    assert names(again) == ["Mon2", "Mon3"]
+    assert again.get("Mon2").getSpeed() == "99"
+
+
+def test_a_rolled_back_transaction_keeps_earlier_edits(workdir):
+    (workdir / "regions").mkdir()
+    writeShard("regions/a.txt", record("Mon1", "No. 0001"))
+    dex = A3.Pokedex("regions", journal=False)
+    dex.add(record("Mon2", "No. 0002"))
+    try:
+        with dex.transaction():
+            dex.remove("Mon1")
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert names(dex) == ["Mon1", "Mon2"]
+
+
+def test_shard_ranges_cover_the_file_on_record_boundaries():
+    pokemon = [A3.BasePokemon(**record(f"Mon{i}", f"No. {i:04d}")) for i in range(1, 41)]
+    with open("pokemon.txt", "w", encoding="utf-8") as f:
+        f.write("\n\n".join(p.to_file_format() for p in pokemon) + "\n")
+    ranges = A3.shardRanges("pokemon.txt", chunkBytes=500)
+    assert len(ranges) > 1
+    assert all(prev[2] == cur[1] for prev, cur in zip(ranges, ranges[1:]))
+    records = [data for task in ranges for data in A3.parseShard(task)]
+    assert records == list(A3.readDex("pokemon.txt"))
+    assert [data["name"] for data in records] == [f"Mon{i}" for i in range(1, 41)]
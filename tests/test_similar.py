@@ -0,0 +1,68 @@
+import csv
+
+import numpy as np
+import pytest
+
+import A3
+from conftest import record
+
+SPREADS = {"Mon1": (50, 50, 50, 50, 50, 50), "Mon2": (100, 100, 100, 100, 100, 100),
+           "Mon3": (55, 50, 50, 50, 50, 45), "Mon4": (10, 90, 10, 90, 10, 90), "Mon5": (52, 50, 50, 50, 50, 50)}
+
+
+@pytest.fixture
+def dex(makeDex):
+    return makeDex([record(name, f"No. {i:04d}", types=["Fire"] if i % 2 else ["Water"],
+                           **dict(zip(A3.STAT_FIELDS[1:], map(str, spread))))
+                    for i, (name, spread) in enumerate(SPREADS.items(), 1)], journal=False)
+
+
+def bruteForce(name, metric):
+    a = np.array(SPREADS[name], dtype=float)
+    out = []
+    for other, spread in SPREADS.items():
+        if other != name:
+            b = np.array(spread, dtype=float)
+            d = np.linalg.norm(a - b) if metric == "euclidean" else 1 - a @ b / (np.linalg.norm(a) * np.linalg.norm(b))
+            out.append((d, other))
+    return sorted(out)
+
+
+def found(results):
+    return [(pytest.approx(d), p.getName()) for d, p in results]
+
+
+@pytest.mark.parametrize("metric", A3.SIMILARITY_METRICS)
+def test_similar_matches_a_brute_force(dex, metric):
+    expected = bruteForce("Mon1", metric)
+    got = [(d, p.getName()) for d, p in dex.similar("Mon1", k=4, metric=metric)]
+    assert [d for d, _ in got] == pytest.approx([d for d, _ in expected])
+    assert {name for d, name in got if d > 1e-9} == {name for d, name in expected if d > 1e-9}
+
+
+def test_similar_to_a_spread_and_within_a_type(dex):
+    assert found(dex.similar([50, 50, 50, 50, 50, 49], k=2)) == [(1, "Mon1"), (pytest.approx(np.sqrt(5)), "Mon5")]
+    assert [p.getName() for _, p in dex.similar("Mon1", k=5, typeVal="Fire")] == ["Mon5", "Mon3"]
+    with pytest.raises(A3.PokemonInputError):
+        dex.similar([1, 2, 3])
+    with pytest.raises(A3.PokemonInputError):
+        dex.similar("Mon1", metric="manhattan")
+
+
+def test_stat_edits_are_seen(dex):
+    dex.similar("Mon1")
+    dex.update("Mon2", hp="50", attack="50", defense="50", spAttack="50", spDefense="50", speed="50")
+    assert found(dex.similar("Mon1", k=1)) == [(0, "Mon2")]
+
+
+def test_pairs_report_matches_similar(dex):
+    dex.writeSimilarityReport("report.csv", k=2)
+    with open("report.csv", newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["name", "neighbour1", "distance1", "neighbour2", "distance2"]
+    assert [row[0] for row in rows[1:]] == list(SPREADS)
+    for row in rows[1:]:
+        expected = [(f"{d:.4f}", p.getName()) for d, p in dex.similar(row[0], k=2)]
+        assert list(zip(row[2::2], row[1::2])) == expected
+    #tiny blocks give the same pairs as one big one
+    assert list(dex.similarPairs(k=3, blockBytes=1)) == list(dex.similarPairs(k=3))
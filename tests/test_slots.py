@@ -0,0 +1,20 @@
+import pytest
+
+import A2
+import A3
+
+
+@pytest.mark.parametrize("module", [A2, A3])
+def test_pokemon_have_no_instance_dict(module):
+    for cls in (module.BasePokemon, module.Charmander, module.Oddish):
+        p = cls()
+        assert not hasattr(p, "__dict__")
+        with pytest.raises(AttributeError):
+            p.nickname = "Sparky"
+
+
+def test_type_info_is_shared_by_the_class():
+    a, b = A3.Charmander(), A3.Vulpix()
+    assert a._desc is b._desc is A3.FireType._desc
+    assert a._info is A3.FireType._info
+    assert A3.Bulbasaur().getName() == "Bulbasaur"
@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+import A3
+from conftest import record
+
+
+@pytest.fixture
+def pokemon():
+    return [A3.BasePokemon(**record("Mon1", "No. 0001", types=["Fire", "Flying"], abilities=["Blaze", "Solar Power"])),
+            A3.BasePokemon(**record("Flabébé", "No. 0669", types=["Fairy"], hp="", speed="42")),
+            A3.BasePokemon(**record("Glitch", "No. ????"))]
+
+
+def test_records_come_back_as_written(pokemon):
+    A3.DexSnapshot.write("pokemon.dex", pokemon, checkpoint=7)
+    with A3.DexSnapshot("pokemon.dex") as snap:
+        assert len(snap) == 3
+        assert snap.checkpoint == 7
+        for i, p in enumerate(pokemon):
+            assert snap.record(i) == {**A3.Pokedex._fields(p), **dict(zip(A3.STAT_FIELDS, p.statValues()))}
+        assert list(snap.column("speed")) == [50, 42, 50]
+        assert snap.column("hp")[1] == A3.MISSING_STAT
+
+
+def test_find_by_name_or_number(pokemon):
+    A3.DexSnapshot.write("pokemon.dex", pokemon)
+    with A3.DexSnapshot("pokemon.dex") as snap:
+        assert snap.find("FLABÉBÉ") == 1
+        assert snap.find("669") == 1
+        assert snap.find("No. 0001") == 0
+        assert snap.find("glitch") == 2
+        assert snap.find("Missingno") is None
+        assert snap.find("No. 0002") is None
+
+
+def test_version_1_files_still_load_without_a_checkpoint(pokemon):
+    A3.DexSnapshot.write("pokemon.dex", pokemon, checkpoint=7)
+    with open("pokemon.dex", "rb") as f:
+        body = f.read()[A3.SNAPSHOT_HEADER.size:]
+    with open("pokemon.dex", "wb") as f:
+        f.write(A3.SNAPSHOT_HEADER_V1.pack(A3.SNAPSHOT_MAGIC, 1, len(pokemon)) + body)
+    with A3.DexSnapshot("pokemon.dex") as snap:
+        assert snap.checkpoint == 0
+        assert snap.record(1)["name"] == "Flabébé"
+
+
+def test_a_file_that_isnt_a_snapshot_is_refused():
+    with open("pokemon.dex", "wb") as f:
+        f.write(b"not a dex at all, just some bytes")
+    with pytest.raises(ValueError):
+        A3.DexSnapshot("pokemon.dex")
+
+
+def test_a_saved_dex_starts_from_the_snapshot(makeDex, capsys):
+    records = [record("Mon1", "No. 0001", types=["Fire", "Flying"]), record("Flabébé", "No. 0669", speed="42")]
+    makeDex(records, journal=False).save()
+    capsys.readouterr()
+    again = A3.Pokedex(journal=False)
+    assert "Loaded data from pokemon.dex" in capsys.readouterr().out
+    for r in records:
+        assert again._find(r["name"]).to_file_format() == A3.BasePokemon(**r).to_file_format()
+
+
+#a snapshot (or json file) that cant be rewritten mustnt outlive the journal and bring back the old dex
+@pytest.mark.parametrize("stuck", ["pokemon.dex", "pokemon.json"])
+def test_a_failed_write_doesnt_leave_a_stale_file_behind(stuck, capsys):
+    dex = A3.Pokedex()
+    dex.add(record("Foo", "No. 0001"))
+    dex.compact()
+    os.mkdir(stuck + ".tmp")
+    dex.add(record("Bar", "No. 0002"))
+    dex.compact()
+    assert "Failed to save" in capsys.readouterr().out
+    assert not os.path.exists(stuck)
+    assert [p.getName() for p in A3.Pokedex().query()] == ["Foo", "Bar"]
@@ -0,0 +1,74 @@
+import pytest
+
+import A3
+from conftest import record
+
+RECORDS = [record("Mon1", "No. 0001", speed="30"), record("Mon2", "No. 0002", speed="90"),
+           record("Mon3", "No. 0003", speed="60")]
+
+
+@pytest.mark.parametrize("val, expected", [("45", 45), (" 7 ", 7), (120, 120), ("", A3.MISSING_STAT)])
+def test_parse_stat(val, expected):
+    assert A3.parseStat(val) == expected
+
+
+@pytest.mark.parametrize("val", ["71.3", "76.0", "fast"])
+def test_decimals_and_garbage_are_refused(val):
+    with pytest.raises(ValueError):
+        A3.parseStat(val)
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_a_bad_stat_in_the_txt_file_skips_that_pokemon(capsys, lazy):
+    good = [A3.BasePokemon(**record(f"Mon{i}", f"No. {i:04d}")) for i in (1, 3)]
+    bad = A3.BasePokemon(**record("Mon2", "No. 0002")).to_file_format().replace("Speed: 50", "Speed: 71.3")
+    with open("pokemon.txt", "w", encoding="utf-8") as f:
+        f.write("\n\n".join([good[0].to_file_format(), bad, good[1].to_file_format()]) + "\n")
+    dex = A3.Pokedex(journal=False, lazy=lazy)
+    assert [p.getName() for p in dex.query()] == ["Mon1", "Mon3"]
+    assert "Skipped Mon2 (No. 0002) in pokemon.txt" in capsys.readouterr().out
+
+
+def test_stats_live_in_the_table(makeDex):
+    dex = makeDex(RECORDS)
+    assert list(dex.statColumn("speed")) == [30, 90, 60]
+    assert [p.getName() for p in dex.sortedByStat("speed")] == ["Mon2", "Mon3", "Mon1"]
+    assert [p.getName() for p in dex.sortedByStat("speed", ascending=True)] == ["Mon1", "Mon3", "Mon2"]
+    #a setter writes straight into the column
+    dex._find("Mon1").setSpeed("120")
+    assert list(dex.statColumn("speed")) == [120, 90, 60]
+
+
+def test_removed_pokemon_keep_their_stats(makeDex, answers):
+    dex = makeDex(RECORDS)
+    p = dex._find("Mon2")
+    answers("Mon2")
+    dex.removePokemon()
+    assert list(dex.statColumn("speed")) == [30, 60]
+    assert p.getSpeed() == "90"
+
+
+def test_blank_stats_read_back_blank():
+    p = A3.BasePokemon(**record("Mon1", "No. 0001", hp=""))
+    assert p.getHP() == ""
+    assert p.to_dict()["hp"] == 0
+
+
+def test_stats_have_to_fit_the_table():
+    assert A3.parseStat(str(A3.MAX_STAT)) == A3.MAX_STAT
+    with pytest.raises(ValueError):
+        A3.parseStat("3000000000")
+    with pytest.raises(A3.PokemonInputError):
+        A3.Pokedex._checkField("hp", "3000000000")
+    #six stats that fit can still add up to a total that doesnt
+    big = str(A3.MAX_STAT // 2)
+    with pytest.raises(A3.PokemonInputError):
+        A3.Pokedex._checkRecord(record("Mon1", "No. 0001", hp=big, attack=big, defense=big))
+
+
+def test_the_menu_refuses_a_huge_stat(makeDex, answers, capsys):
+    dex = makeDex([], journal=False)
+    answers("No. 0001", "Mon1", "Normal", "Test Pokemon", "1.0 m", "10.0 kg", "Run Away", "3000000000")
+    dex.addPokemon()
+    assert "HP can be at most" in capsys.readouterr().out
+    assert len(dex) == 0
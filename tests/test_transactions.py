@@ -0,0 +1,122 @@
+import json
+
+import pytest
+
+import A3
+from conftest import record
+
+
+@pytest.fixture
+def dex(makeDex):
+    return makeDex([record(f"Mon{i}", f"No. {i:04d}", speed=str(10 * i)) for i in range(1, 6)])
+
+
+def names(found):
+    return [p.getName() for p in found]
+
+
+def journalLines():
+    with open("pokemon.txt.journal", encoding="utf-8") as f:
+        return f.readlines()
+
+
+def test_bulk_import_adds_and_updates_by_number(dex):
+    added, updated = dex.bulkImport([record("Mon1", "No. 0001", speed="100"), record("Moltres", "No. 0146", speed="90")])
+    assert (added, updated) == (1, 1)
+    assert dex.get("Mon1").getSpeed() == "100"
+    assert dex.get("146").getName() == "Moltres"
+    #the whole batch went to the journal in one write
+    assert len(journalLines()) == 2
+    assert A3.Pokedex().get("Mon1").getSpeed() == "100"
+
+
+def test_bulk_import_reads_jsonl_and_csv(dex):
+    with open("new.jsonl", "w", encoding="utf-8") as f:
+        f.write(json.dumps(record("Moltres", "No. 0146")) + "\n\n")
+    with open("new.csv", "w", encoding="utf-8") as f:
+        f.write("name,number,types,species,height,weight,abilities,total,hp,attack,defense,spAttack,spDefense,speed\n"
+                "Mon2,No. 0002,Water/Flying,Test Pokemon,1.0 m,10.0 kg,\"Swift Swim, Rain Dish\",,60,50,50,50,50,70\n")
+    assert dex.bulkImport("new.jsonl") == (1, 0)
+    assert dex.bulkImport("new.csv") == (0, 1)
+    assert dex.get("Mon2").getTypes() == ["Water", "Flying"]
+    assert dex.get("Mon2").getAbilities() == ["Swift Swim", "Rain Dish"]
+    assert dex.get("Mon2").getTotal() == "330"
+
+
+def test_a_failed_bulk_import_changes_nothing(dex):
+    with pytest.raises(A3.PokemonInputError):
+        dex.bulkImport([record("Mon9", "No. 0009"), record("Broken", "not a number")])
+    assert len(dex) == 5
+    assert not dex.exists("Mon9")
+
+
+def test_an_exception_rolls_the_transaction_back(dex):
+    with pytest.raises(RuntimeError):
+        with dex.transaction():
+            dex.add(record("Momo", "No. 0050"))
+            with dex.transaction():
+                dex.remove("Mon1")
+            raise RuntimeError("boom")
+    assert list(dex.names()) == ["Mon1", "Mon2", "Mon3", "Mon4", "Mon5"]
+    #and the rolled back edits never reach the journal, so a restart agrees
+    assert list(A3.Pokedex().names()) == ["Mon1", "Mon2", "Mon3", "Mon4", "Mon5"]
+
+
+#builds the sorted indexes so the edits after it have something to keep up to date
+def buildSortedIndexes(dex):
+    dex.query(order="speed")
+    dex.autocomplete("Mo")
+
+
+def test_sorted_indexes_are_dropped_inside_a_transaction(dex):
+    buildSortedIndexes(dex)
+    with dex.transaction():
+        dex.add(record("Momo", "No. 0050", speed="5"))
+        assert dex._Pokedex__statIndexes == {}
+        assert dex._Pokedex__prefixes is None
+        dex.update("Mon3", speed="200")
+    assert names(dex.query(order="speed", limit=2)) == ["Momo", "Mon1"]
+    assert names(dex.query(speed=(100, None))) == ["Mon3"]
+    assert dex.autocomplete("Mom") == ["Momo"]
+
+
+def test_a_bulk_import_rebuilds_the_sorted_indexes(dex):
+    buildSortedIndexes(dex)
+    dex.bulkImport([record("Mon1", "No. 0001", speed="100"), record("Moltres", "No. 0146", speed="90")])
+    assert names(dex.query(order="speed", descending=True, limit=2)) == ["Mon1", "Moltres"]
+    assert dex.autocomplete("Mol") == ["Moltres"]
+
+
+def test_a_rollback_rebuilds_the_sorted_indexes(dex):
+    buildSortedIndexes(dex)
+    with pytest.raises(RuntimeError):
+        with dex.transaction():
+            dex.add(record("Momo", "No. 0050", speed="5"))
+            raise RuntimeError("boom")
+    assert names(dex.query(order="speed", limit=1)) == ["Mon1"]
+    assert dex.autocomplete("Mom") == []
+
+
+def test_a_bad_update_changes_nothing(dex):
+    before = A3.Pokedex._fields(dex.get("Mon1"))
+    with pytest.raises(A3.PokemonInputError):
+        dex.update("Mon1", hp="50", attack="3000000000")
+    big = str(A3.MAX_STAT // 2)
+    with pytest.raises(A3.PokemonInputError):
+        dex.update("Mon1", hp=big, attack=big, defense=big)
+    assert A3.Pokedex._fields(dex.get("Mon1")) == before
+
+
+def test_a_setter_failing_halfway_is_rolled_back(dex, monkeypatch):
+    before = A3.Pokedex._fields(dex.get("Mon1"))
+
+    def boom(self, value):
+        raise RuntimeError("disk on fire")
+    with monkeypatch.context() as patch, pytest.raises(RuntimeError):
+        patch.setattr(A3.BasePokemon, "setSpeed", boom)
+        dex.update("Mon1", name="Renamed", hp="99", speed="1")
+    assert A3.Pokedex._fields(dex.get("Mon1")) == before
+    assert not dex.exists("Renamed")
+    assert [p.getName() for p in dex.query(order="hp")][0] == "Mon1"
+    #and nothing went to the journal
+    assert A3.Pokedex._fields(A3.Pokedex(journal=True).get("Mon1")) == before
@@ -0,0 +1,35 @@
+import pytest
+
+import A2
+import A3
+from conftest import record
+
+RECORDS = [record("Mon1", "No. 0001", types=["Fire"]),
+           record("Mon2", "No. 0002", types=["Grass", "Poison"]),
+           record("Mon3", "No. 0003", types=["Fire", "Flying"])]
+
+
+def names(found):
+    return [p.getName() for p in found]
+
+
+@pytest.mark.parametrize("module", [A2, A3])
+def test_dual_types_are_found_under_both(makeDex, module):
+    dex = makeDex(RECORDS, module)
+    assert names(dex._ofType("fire")) == ["Mon1", "Mon3"]
+    assert names(dex._ofType(" FLYING ")) == ["Mon3"]
+    assert names(dex._ofType("Water")) == []
+    assert dex.typeCounts() == {"fire": 2, "grass": 1, "poison": 1, "flying": 1}
+
+
+def test_type_changes_and_removals_move_the_index(makeDex, answers):
+    dex = makeDex(RECORDS)
+    dex._find("Mon1").setTypes(["Water"])
+    answers("Mon2")
+    dex.removePokemon()
+    assert names(dex._ofType("fire")) == ["Mon3"]
+    assert names(dex._ofType("water")) == ["Mon1"]
+    assert names(dex._ofType("grass")) == []
+    #an added pokemon lands in pokedex order
+    dex._insert(A3.BasePokemon(**record("Mon4", "No. 0004", types=["Flying", "Fire"])))
+    assert names(dex._ofType("fire")) == ["Mon3", "Mon4"]
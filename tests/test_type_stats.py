@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+import A2
+import A3
+from conftest import record
+
+SPEEDS = [30, 60, 45, 80, 100, 20]
+#Mon3 has no HP
+RECORDS = [record(f"Mon{i}", f"No. {i:04d}", speed=str(speed), hp="" if i == 3 else str(10 * i),
+                  types=["Fire"] if i % 2 else ["Fire", "Grass"])
+           for i, speed in enumerate(SPEEDS, 1)]
+
+
+@pytest.mark.parametrize("module", [A2, A3])
+def test_type_stats_match_numpy(makeDex, module):
+    fire = makeDex(RECORDS, module, journal=False).typeStats("FIRE")
+    assert (fire["count"], fire["single"], fire["dual"]) == (6, 3, 3)
+    speed = fire["stats"]["speed"]
+    assert (speed["count"], speed["min"], speed["max"]) == (6, 20, 100)
+    assert speed["mean"] == pytest.approx(np.mean(SPEEDS))
+    for q in A3.PERCENTILES:
+        assert speed[f"p{q}"] == pytest.approx(np.percentile(SPEEDS, q))
+    #the blank HP is left out rather than counted as 0
+    assert fire["stats"]["hp"]["count"] == 5
+    assert fire["stats"]["hp"]["min"] == 10
+
+
+def test_both_versions_agree(makeDex):
+    a2 = makeDex(RECORDS, A2, journal=False).typeStats()
+    a3 = makeDex(RECORDS, A3, journal=False).typeStats()
+    assert a2.keys() == a3.keys() == {"fire", "grass"}
+    for t in a2:
+        assert {k: v for k, v in a2[t].items() if k != "stats"} == {k: v for k, v in a3[t].items() if k != "stats"}
+        for field in A3.STAT_FIELDS:
+            assert a2[t]["stats"][field] == pytest.approx(a3[t]["stats"][field])
+
+
+def test_stats_follow_edits(makeDex):
+    dex = makeDex(RECORDS, journal=False)
+    assert dex.typeStats("grass")["stats"]["speed"]["max"] == 80
+    dex.update("Mon4", speed="150")
+    dex.update("Mon6", types=["Water"])
+    grass = dex.typeStats("grass")
+    assert grass["count"] == 2
+    assert grass["stats"]["speed"]["max"] == 150
+    assert dex.typeStats("water")["single"] == 1
+    assert dex.typeStats("electric") is None
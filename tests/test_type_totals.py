@@ -0,0 +1,55 @@
+import statistics
+
+import pytest
+
+import A3
+from conftest import record
+
+
+@pytest.fixture(params=[False, True], ids=["eager", "lazy"])
+def dex(request, makeDex):
+    dex = makeDex([record("Mon1", "No. 0001", types=["Fire"], speed="30"),
+                   record("Mon2", "No. 0002", types=["Fire", "Flying"], speed="60"),
+                   record("Mon3", "No. 0003", types=["Grass", "Poison"], speed="45"),
+                   record("Mon4", "No. 0004", types=["Grass"], speed="80")], lazy=request.param)
+    #start the running totals before any edits
+    dex.typeTotals()
+    return dex
+
+
+def edit(dex):
+    dex.add(record("Mon5", "No. 0005", types=["Fire", "Grass"], speed="100"))
+    dex.update("Mon1", speed="90", attack="70")
+    dex.update("Mon3", types=["Fire"])
+    dex.remove("Mon4")
+    with pytest.raises(RuntimeError):
+        with dex.transaction():
+            dex.remove("Mon2")
+            raise RuntimeError
+
+
+def test_running_totals_match_a_recount_after_edits(dex):
+    edit(dex)
+    fire = dex.typeTotals("Fire")
+    assert dex.verifyTypeTotals() == []
+    speeds = [int(p.getSpeed()) for p in dex.query() if "Fire" in p.getTypes()]
+    assert (fire["count"], fire["single"], fire["dual"]) == (4, 2, 2)
+    assert fire["stats"]["speed"]["mean"] == pytest.approx(statistics.mean(speeds))
+    assert fire["stats"]["speed"]["std"] == pytest.approx(statistics.pstdev(speeds))
+    assert dex.typeTotals("Grass")["count"] == 1
+    assert dex.typeTotals("Flying")["count"] == 1
+
+
+def test_totals_after_a_restart_replays_the_journal(dex):
+    edit(dex)
+    again = A3.Pokedex()
+    again.typeTotals()
+    assert again.typeTotals() == dex.typeTotals()
+    assert again.verifyTypeTotals() == []
+
+
+def test_drift_is_reported_and_repaired(dex):
+    dex._Pokedex__totals.add(["Fire", "Grass"], [500, 100, 80, 80, 80, 80, 80])
+    assert dex.verifyTypeTotals() == ["fire", "grass", "fire/grass"]
+    assert dex.verifyTypeTotals() == []
+    assert dex.typeTotals("Fire")["count"] == 2